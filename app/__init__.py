@@ -1,5 +1,5 @@
 from pathlib import Path
-from flask import Flask, send_from_directory, jsonify
+from flask import Flask, jsonify
 from flask_talisman import Talisman
 
 from .config      import Config
@@ -13,15 +13,17 @@ from .extensions  import (
 from .blueprints  import register_blueprints
 from .middlewares import register_middlewares
 from .errors      import register_error_handlers
+from .json_provider import init_json_provider
+from .live import init_broker
+from .principal import load_principal
+from .static_manifest import build_manifest
+from .compression import init_compression
+from .query_stats import init_query_stats
+from .blobs import blob_commands
 # from .seeds       import seed_commands
-from app.models      import User
-from sqlalchemy import event
-from sqlalchemy.engine import Engine
-import time, logging
 from dotenv import load_dotenv 
 import os
-print("FLASK_ENV =", os.getenv("FLASK_ENV"))
-print("S3_BUCKET =", os.environ.get("S3_BUCKET"))
+import threading
 # --------------------------------------------------------------------------- #
 #  Application factory
 # --------------------------------------------------------------------------- #
@@ -40,14 +42,7 @@ def create_app(config_class=None) -> Flask:
         SQLALCHEMY_ECHO=False,            # turn ON if you want raw SQL too
         SLOW_QUERY_THRESHOLD=0.05,        # 50 ms
     )
-    @event.listens_for(Engine, "before_cursor_execute")
-    def before_cursor_execute(conn, cursor, stmt, params, context, executemany):
-        context._query_start_time = time.perf_counter()
-
-    @event.listens_for(Engine, "after_cursor_execute")
-    def after_cursor_execute(conn, cursor, stmt, params, context, executemany):
-        total = time.perf_counter() - context._query_start_time
-        logging.debug(f"[{total:.3f}s] {stmt.splitlines()[0][:120]} …")
+    # Statement timing, slow-query log, per-request counts: app.query_stats
 
     Talisman(
         app,
@@ -72,23 +67,30 @@ def create_app(config_class=None) -> Flask:
     migrate.init_app(app, db)
     cors.init_app(app, supports_credentials=True)
     login_manager.init_app(app)
+    init_json_provider(app)
+    init_broker(app)
+    init_compression(app)
+    init_query_stats(app)
 
     @login_manager.user_loader
     def load_user(user_id: str):
-        """Return the User instance given a unicode ID."""
-        return User.query.get(int(user_id))
+        """Return the cached Principal (slim User snapshot) given a unicode ID."""
+        return load_principal(int(user_id))
 
     # --------------------------------------------------------------------- #
     # Blueprints, CLI commands, middlewares, error handlers
     # --------------------------------------------------------------------- #
-    register_blueprints(app)
+    register_blueprints(app, lazy=app.config.get("LAZY_BLUEPRINTS", False))
     register_middlewares(app)
     register_error_handlers(app)
     # app.cli.add_command(seed_commands)
+    app.cli.add_command(blob_commands)
 
     # --------------------------------------------------------------------- #
     # Single-Page App fallback
     # --------------------------------------------------------------------- #
+    static_manifest = build_manifest(app.static_folder)
+
     @app.route("/", defaults={"path": ""})
     @app.route("/<path:path>")
     def spa_fallback(path):
@@ -96,17 +98,31 @@ def create_app(config_class=None) -> Flask:
         if path.startswith("api/") or path.startswith("auth/"):
             return jsonify({"error": "Not found"}), 404
 
-        static_dir = Path(app.static_folder)
-        requested = static_dir / path
+        # Real static files (main.js, logo.png, ...) from the startup
+        # manifest; anything else gets React's entry point
+        return static_manifest.serve(path)
 
-        # Serve real static files if requested (like main.js, logo.png, etc.)
-        if path and requested.exists():
-            return send_from_directory(static_dir, path)
+    return app
 
-        # Otherwise, serve React’s entry point
-        return send_from_directory(static_dir, "index.html"), 200
 
-    return app
+# --------------------------------------------------------------------------- #
+#  The process-wide instance
+# --------------------------------------------------------------------------- #
+_app = None
+_app_lock = threading.Lock()
 
 
-app = create_app()
+def __getattr__(name):
+    """
+    `from app import app` (gunicorn app:app, FLASK_APP=app, manage.py) builds
+    the app on first use and shares it, rather than at import time. Importing
+    the package for its models or helpers no longer creates an app.
+    """
+    global _app
+    if name != "app":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                _app = create_app()
+    return _app
@@ -0,0 +1,201 @@
+from datetime import datetime, timedelta, timezone
+
+from flask import abort, current_app
+from flask_login import current_user
+from sqlalchemy import and_, event, insert, or_, tuple_
+
+from app.extensions import db
+from app.models import Activity, ActivityType
+
+FEED_DEFAULT_LIMIT = 20
+FEED_MAX_LIMIT = 100
+
+
+# --------------------------------------------------------------------------- #
+#  Writing
+# --------------------------------------------------------------------------- #
+# Types whose bursts collapse into one row, mapped to the type the merged row
+# takes. A burst is the same actor hitting the same target (list) within
+# ACTIVITY_COALESCE_WINDOW seconds of the burst's first row.
+COALESCE_TYPES = {
+    ActivityType.TASK_COMPLETED: ActivityType.TASK_BULK_COMPLETED,
+    ActivityType.TASK_CREATED: ActivityType.TASK_CREATED,
+    ActivityType.TASK_REORDERED: ActivityType.TASK_REORDERED,
+    ActivityType.SHOP_ITEM_ADDED: ActivityType.SHOP_ITEM_ADDED,
+    ActivityType.SHOP_ITEM_UPDATED: ActivityType.SHOP_ITEM_UPDATED,
+    ActivityType.SHOP_ITEM_CHECKED: ActivityType.SHOP_ITEM_CHECKED,
+    ActivityType.SHOP_LIST_CLEARED: ActivityType.SHOP_LIST_CLEARED,
+}
+
+_PENDING_KEY = "pending_activity"
+
+
+def record_activity(type_: ActivityType, household_id: int | None, *, actor=None, item_count: int = 1, **fields):
+    """
+    Queue an Activity row for the current session. Queued rows are coalesced
+    and written in one batched INSERT right before the session commits, so
+    they land (or roll back) together with the mutation they describe.
+
+    `fields` are Activity columns: object_type/object_id/object_title,
+    target_type/target_id/target_title, event_start_at/event_tzid.
+    Personal (household-less) objects and anonymous requests are skipped.
+    """
+    actor = actor if actor is not None else current_user
+    if household_id is None or not getattr(actor, "is_authenticated", False):
+        return None
+
+    row = Activity(
+        household_id=household_id,
+        actor_id=actor.id,
+        actor_name=actor.display_name or actor.name,
+        type=type_,
+        item_count=item_count,
+        created_at=datetime.now(timezone.utc),
+        **fields,
+    )
+    db.session.info.setdefault(_PENDING_KEY, []).append(row)
+    return row
+
+
+def _burst_key(row: Activity):
+    aggregate = COALESCE_TYPES.get(row.type, row.type)
+    return (row.household_id, row.actor_id, aggregate, row.target_type, row.target_id)
+
+
+def _absorb(head: Activity, row: Activity):
+    """
+    Fold `row` into `head`, which keeps the newest object. The newest time
+    goes to updated_at: head.created_at is its (created_at, id) feed
+    position, and moving it would show the row again on a later page.
+    """
+    head.item_count = (head.item_count or 1) + (row.item_count or 1)
+    head.type = COALESCE_TYPES.get(head.type, head.type)
+    head.object_id = row.object_id
+    head.object_title = row.object_title
+    head.updated_at = row.created_at
+
+
+def flush_activity(session, pending: list[Activity]):
+    """
+    Coalesce the queued rows, merge bursts into recent rows already in the
+    table (one SELECT on the household feed index), then INSERT whatever is
+    left in a single executemany.
+    """
+    store_text = current_app.config.get("ACTIVITY_STORE_RENDERED_TEXT")
+    window = current_app.config.get("ACTIVITY_COALESCE_WINDOW", 0)
+
+    # 1) Merge bursts inside this transaction
+    heads: dict[tuple, Activity] = {}
+    rows: list[Activity] = []
+    for row in pending:
+        if row.type not in COALESCE_TYPES or row.target_id is None or not window:
+            rows.append(row)
+            continue
+        key = _burst_key(row)
+        if key in heads:
+            _absorb(heads[key], row)
+        else:
+            heads[key] = row
+            rows.append(row)
+
+    # 2) Merge into rows written by earlier requests in the same burst
+    touched = []
+    if heads:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=window)
+        lookups = [
+            and_(
+                Activity.household_id == household_id,
+                Activity.actor_id == actor_id,
+                Activity.type.in_({aggregate} | {t for t, agg in COALESCE_TYPES.items() if agg == aggregate}),
+                Activity.target_type == target_type,
+                Activity.target_id == target_id,
+            )
+            for household_id, actor_id, aggregate, target_type, target_id in heads
+        ]
+        recent = (
+            session.query(Activity)
+            .filter(Activity.created_at >= cutoff, or_(*lookups))
+            .order_by(Activity.created_at.desc(), Activity.id.desc())
+            .all()
+        )
+        merged = set()
+        for existing in recent:
+            row = heads.pop(_burst_key(existing), None)
+            if row is None:
+                continue  # an older row of a burst we already merged into
+            _absorb(existing, row)
+            merged.add(id(row))
+            touched.append(existing)
+        rows = [row for row in rows if id(row) not in merged]
+
+    # 3) Write: merged rows are flushed by the commit, new rows in one INSERT
+    for row in touched + rows:
+        if store_text:
+            row.rendered_text = row.render_text()
+    if rows:
+        columns = [c.key for c in Activity.__table__.columns if c.key != "id"]
+        session.execute(
+            insert(Activity),
+            [{col: getattr(row, col) for col in columns} for row in rows],
+        )
+
+
+@event.listens_for(db.session, "before_commit")
+def _flush_pending_activity(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        flush_activity(session, pending)
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _drop_pending_activity(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+
+# --------------------------------------------------------------------------- #
+#  Reading
+# --------------------------------------------------------------------------- #
+def encode_cursor(row: Activity) -> str:
+    created_at = row.created_at
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return f"{created_at.astimezone(timezone.utc).isoformat()},{row.id}"
+
+
+def decode_cursor(value: str) -> tuple[datetime, int]:
+    try:
+        created_s, id_s = value.rsplit(",", 1)
+        created_at = datetime.fromisoformat(created_s.replace("Z", "+00:00"))
+        row_id = int(id_s)
+    except ValueError:
+        abort(400, description="before must look like <created_at>,<id>")
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at, row_id
+
+
+def fetch_feed(household_id: int, before: str | None = None, limit: int = FEED_DEFAULT_LIMIT):
+    """
+    Return (rows, next_cursor) for one page of a household's feed, newest first.
+
+    Pages are cut with a keyset predicate on (created_at, id) rather than
+    OFFSET, so every page is a short range scan of
+    ix_activities_household_created_desc no matter how deep the history goes.
+    """
+    limit = max(1, min(limit, FEED_MAX_LIMIT))
+
+    q = Activity.query.filter(Activity.household_id == household_id)
+    if before:
+        created_at, row_id = decode_cursor(before)
+        q = q.filter(tuple_(Activity.created_at, Activity.id) < tuple_(created_at, row_id))
+
+    # Fetch one extra row to learn whether another page exists
+    rows = (
+        q.order_by(Activity.created_at.desc(), Activity.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1]) if has_more else None
+    return rows, next_cursor
@@ -1,8 +1,13 @@
 from flask import Blueprint, jsonify, request, abort
 from flask_login import login_required, current_user
 from datetime import datetime
-from app.models import Announcement
+from app.models import Announcement, ActivityType
 from app.extensions import db
+from app.serializers import encode_announcement
+from app.pagination import paginate, page_params, with_next_cursor
+from app.etags import etag_from, household_version
+from sqlalchemy import select
+from app.activity_feed import record_activity
 
 announcement_routes = Blueprint("announcements", __name__)
 
@@ -27,12 +32,17 @@ def _get_announcement_or_404(id: int):
     return a
 
 @announcement_routes.route("/", methods=["GET"])
+@etag_from(lambda: household_version(request.args.get("householdId", type=int)))
 def list_announcements():
     hid = request.args.get("householdId", type=int)
     if not hid:
         abort(400, description="householdId is required")
-    anns = Announcement.query.filter_by(household_id=hid).all()
-    return jsonify([a.to_dict() for a in anns]), 200
+    anns, next_cursor = paginate(
+        select(*encode_announcement.columns).where(Announcement.household_id == hid),
+        [Announcement.created_at, Announcement.id],
+        *page_params(),
+    )
+    return with_next_cursor((jsonify([encode_announcement(a) for a in anns]), 200), next_cursor)
 
 @announcement_routes.route("/", methods=["POST"])
 def create_announcement():
@@ -51,6 +61,12 @@ def create_announcement():
         expires_at=_parse_iso(data.get("expiresAt")),
     )
     db.session.add(announcement)
+    db.session.flush()
+
+    record_activity(
+        ActivityType.ANNOUNCEMENT_CREATED, announcement.household_id,
+        object_type="announcement", object_id=announcement.id, object_title=announcement.text,
+    )
     db.session.commit()
     return jsonify(announcement.to_dict()), 201
 
@@ -67,7 +83,13 @@ def patch_announcement(id):
     if "text" in data:
         a.text = data["text"]
     if "isPinned" in data:
+        was_pinned = a.is_pinned
         a.is_pinned = _to_bool(data["isPinned"])
+        if a.is_pinned and not was_pinned:
+            record_activity(
+                ActivityType.ANNOUNCEMENT_PINNED, a.household_id,
+                object_type="announcement", object_id=a.id, object_title=a.text,
+            )
     if "publishedAt" in data:
         a.published_at = _parse_iso(data["publishedAt"])
     if "expiresAt" in data:
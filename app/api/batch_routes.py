@@ -0,0 +1,20 @@
+from flask import Blueprint, jsonify, request
+
+from app.batch import parse_batch, run_batch
+
+batch_routes = Blueprint("batch", __name__)
+
+
+@batch_routes.route("", methods=["POST"])
+def batch():
+    """
+    Run several API requests in one round trip (see app.batch):
+    {"requests": [{"method", "path", "query"?, "body"?}], "atomic"?: bool}
+    Returns {"responses": [{"status", "headers", "body"}]} in request order.
+    """
+    try:
+        subs, atomic = parse_batch(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"responses": run_batch(subs, atomic)}), 200
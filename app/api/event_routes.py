@@ -2,12 +2,22 @@ from datetime import datetime
 from flask import Blueprint, request, jsonify, abort
 from sqlalchemy import and_
 from app.extensions import db
-from app.models import Household, Event
+from app.models import Household, Event, ActivityType
+from app.activity_feed import record_activity
+from app.serializers import encode_event
+from app.pagination import paginate, page_params, with_next_cursor
+from app.calendar_index import events_in_window
+from app.recurrence import parse_rrule, parse_exdates, format_exdates, series_end
+from sqlalchemy import select
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 event_routes = Blueprint('events', __name__)
 
+# window queries expand recurring series, so keep them to calendar-sized spans
+MAX_WINDOW = timedelta(days=400)
+MAX_YEARS_AHEAD = 100
+
 # Helpers
 def parse_iso8601(value: str) -> datetime:
     try:
@@ -27,11 +37,17 @@ def get_household_events(hid: int):
     end_s      = request.args.get('end')
     fetch_all  = request.args.get('all') == '1'
 
-    q = Event.query.filter(Event.household_id == hid)
+    criteria = [Event.household_id == hid]
 
     if fetch_all:
-        # all scheduled events
-        q = q.filter(Event.start_utc.isnot(None), Event.end_utc.isnot(None))
+        # all scheduled events, paged (?cursor=&limit=, next page cursor in X-Next-Cursor)
+        criteria += [Event.start_utc.isnot(None), Event.end_utc.isnot(None)]
+        events, next_cursor = paginate(
+            select(*encode_event.columns).where(*criteria),
+            [Event.start_utc, Event.id],
+            *page_params(),
+        )
+        return with_next_cursor((jsonify([encode_event(e) for e in events]), 200), next_cursor)
 
     else:
         if not start_s or not end_s:
@@ -40,14 +56,14 @@ def get_household_events(hid: int):
         end   = parse_iso8601(end_s)
         if start >= end:
             abort(400, description='start must be before end')
+        if end - start > MAX_WINDOW:
+            abort(400, description=f'start and end can be at most {MAX_WINDOW.days} days apart')
+        if end.year > datetime.now().year + MAX_YEARS_AHEAD:
+            abort(400, description=f'windows cannot end more than {MAX_YEARS_AHEAD} years from now')
 
-        q = q.filter(
-            Event.start_utc < end,   # starts before window end
-            Event.end_utc > start,   # ends after window start (strict!)
-        )
-
-    events = q.order_by(Event.start_utc.asc()).all()
-    return jsonify([e.to_dict() for e in events]), 200
+    # overlap: starts before window end, ends after window start (strict!)
+    # recurring series come back expanded into their occurrences
+    return jsonify(events_in_window(hid, start, end)), 200
 
 
 @event_routes.post('/households/<int:hid>/events')
@@ -60,6 +76,8 @@ def create_event_for_household(hid: int):
     end_s   = data.get('endUtc')
     date_s  = data.get('date')      # "YYYY-MM-DD"
     tzid    = data.get('tzid') or 'UTC'
+    rrule_s = data.get('rrule')     # e.g. "FREQ=WEEKLY;BYDAY=MO,TH"
+    exdates = data.get('exdates') or []
 
     if not title:
         abort(400, description='Title is required')
@@ -92,6 +110,23 @@ def create_event_for_household(hid: int):
         end   = local_end.astimezone(ZoneInfo("UTC"))
         has_time = False
 
+    rrule = series_end_utc = exdates_s = None
+    if rrule_s:
+        if start is None:
+            abort(400, description='Recurring events need startUtc/endUtc or date')
+        try:
+            ZoneInfo(tzid)
+        except Exception:
+            abort(400, description='Invalid tzid')
+        try:
+            rrule = str(parse_rrule(rrule_s))
+        except ValueError as e:
+            abort(400, description=str(e))
+        if not isinstance(exdates, list):
+            abort(400, description='exdates must be a list of ISO datetimes')
+        exdates_s = format_exdates(parse_iso8601(x) for x in exdates)
+        series_end_utc = series_end(start, end, tzid, rrule)
+
     ev = Event(
         household_id=hid,
         title=title,
@@ -99,8 +134,18 @@ def create_event_for_household(hid: int):
         end_utc=end,
         tzid=tzid,
         has_time=has_time,   # <-- keep only if you added the column
+        rrule=rrule,
+        exdates=exdates_s,
+        series_end_utc=series_end_utc,
     )
     db.session.add(ev)
+    db.session.flush()
+
+    record_activity(
+        ActivityType.EVENT_SCHEDULED, hid,
+        object_type="event", object_id=ev.id, object_title=ev.title,
+        event_start_at=ev.start_utc, event_tzid=ev.tzid,
+    )
     db.session.commit()
     return jsonify(ev.to_dict()), 201
 
@@ -110,6 +155,26 @@ def delete_event(hid: int, event_id: int):
 
     ev = Event.query.filter_by(id=event_id, household_id=hid).first_or_404()
 
+    # ?occurrence=<recurrenceId> cancels one occurrence of a series, not the series
+    occurrence_s = request.args.get('occurrence')
+    if occurrence_s:
+        if not ev.rrule:
+            abort(400, description='occurrence only applies to recurring events')
+        occurrence = parse_iso8601(occurrence_s)
+        ev.exdates = format_exdates(parse_exdates(ev.exdates) | {occurrence})
+        record_activity(
+            ActivityType.EVENT_CANCELLED, hid,
+            object_type="event", object_id=ev.id, object_title=ev.title,
+            event_start_at=occurrence, event_tzid=ev.tzid,
+        )
+        db.session.commit()
+        return ("", 204)
+
+    record_activity(
+        ActivityType.EVENT_CANCELLED, hid,
+        object_type="event", object_id=ev.id, object_title=ev.title,
+        event_start_at=ev.start_utc, event_tzid=ev.tzid,
+    )
     db.session.delete(ev)
     db.session.commit()
 
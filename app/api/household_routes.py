@@ -1,28 +1,54 @@
-from flask import Blueprint, request, jsonify
+from datetime import datetime, timedelta, timezone
+from flask import Blueprint, Response, current_app, request, jsonify
 from flask_login import login_required, current_user
+from sqlalchemy import select
 from app.extensions import db
-from app.models import Household, TodoList, TodoListMember
+from app.models import (
+    Household, TodoList, TodoListMember, ShoppingList, Announcement, Mood, ActivityType, render_many,
+)
+from app.serializers import (
+    fetch_rows, household_payload, todo_lists_payload, shopping_lists_payload, shopping_lists_normalized,
+    encode_household, encode_todo_list, encode_shopping_list,
+    encode_announcement, encode_mood,
+)
+from app.api.event_routes import parse_iso8601
+from app.query_stats import count_statements
+from app.pagination import paginate, page_params, with_next_cursor, MAX_PAGE_SIZE
+from app.calendar_index import events_in_window
+from app.etags import etag_from, household_version
+from app.change_log import changes_since, CHANGES_PAGE_SIZE
+from app.live import household_channel, stream
+from app.activity_feed import fetch_feed, record_activity, FEED_DEFAULT_LIMIT
+
+# The snapshot is built from a fixed set of batched queries; anything beyond
+# this means a lazy load crept back in and the request is refused.
+SNAPSHOT_STATEMENT_BUDGET = 12
 
 
 household_routes = Blueprint('households', __name__)
 
 @household_routes.route("/<int:id>")
 def get_household(id):
-    household = Household.query.get(id)
+    rows = fetch_rows(encode_household, Household.id == id)
+    if not rows:
+        return jsonify({"error": "Household not found"}), 404
 
-    return jsonify(household.to_dict())
+    return jsonify(household_payload(rows[0]))
 
 @household_routes.route("/<int:household_id>/todo_lists", methods=["GET"])
 @login_required
+@etag_from(household_version)
 def get_household_todo_lists(household_id):
-    household = Household.query.get(household_id)
-
-    if not household:
+    if not db.session.query(Household.id).filter_by(id=household_id).first():
         return jsonify({"error": "Household not found"}), 404
 
-    lists = household.todo_lists
+    lists, next_cursor = paginate(
+        select(*encode_todo_list.columns).where(TodoList.household_id == household_id),
+        [TodoList.id],
+        *page_params(),
+    )
 
-    return jsonify([t.to_dict() for t in lists]), 200
+    return with_next_cursor((jsonify(todo_lists_payload(lists)), 200), next_cursor)
 
 @household_routes.route("/<int:household_id>/todo_lists", methods=["POST"])
 def create_household_todo_list(household_id):
@@ -62,25 +88,173 @@ def create_household_todo_list(household_id):
         links = [TodoListMember(todo_list_id=tl.id, user_id=uid) for uid in set(member_ids)]
         db.session.add_all(links)
 
+    record_activity(
+        ActivityType.LIST_CREATED, household_id,
+        object_type="list", object_id=tl.id, object_title=tl.title,
+    )
     db.session.commit()
     return jsonify(tl.to_dict(include_todos=False, include_members=True)), 201
 
 @household_routes.route("/<int:id>/shopping")
+@etag_from(lambda id: household_version(id))
 def get_household_shopping_lists(id):
-    household = Household.query.get(id)
-    
-    return jsonify([sl.to_dict() for sl in household.shopping_lists]), 200
+    """
+    All shopping lists of a household. With ?shape=normalized, lists,
+    categories and items come back as flat id-keyed maps instead of nested.
+    """
+    lists = fetch_rows(encode_shopping_list, ShoppingList.household_id == id, order_by=ShoppingList.id)
+
+    if request.args.get("shape") == "normalized":
+        return jsonify(shopping_lists_normalized(lists)), 200
+    return jsonify(shopping_lists_payload(lists)), 200
 
 @household_routes.route("/<int:household_id>/shopping/<int:shopping_list_id>")
+@etag_from(lambda household_id, shopping_list_id: household_version(household_id))
 def get_household_shopping_list(household_id, shopping_list_id):
-    household = Household.query.get(household_id)
-
-    if not household:
+    if not db.session.query(Household.id).filter_by(id=household_id).first():
         return jsonify({"error": "Household not found"}), 404
 
-    shopping_list = next((sl for sl in household.shopping_lists if sl.id == shopping_list_id), None)
+    lists = fetch_rows(
+        encode_shopping_list,
+        ShoppingList.id == shopping_list_id,
+        ShoppingList.household_id == household_id,
+    )
     
-    if not shopping_list:
+    if not lists:
         return jsonify({"error": "Shopping list not found in this household"}), 404
 
-    return jsonify(shopping_list.to_dict()), 200
\ No newline at end of file
+    if request.args.get("shape") == "normalized":
+        return jsonify(shopping_lists_normalized(lists)), 200
+    return jsonify(shopping_lists_payload(lists)[0]), 200
+
+@household_routes.route("/<int:household_id>/snapshot", methods=["GET"])
+@login_required
+def get_household_snapshot(household_id):
+    """
+    Everything the dashboard needs in one response: the household and its
+    members, todo lists, shopping lists, events in a window (default: the next
+    7 days, or both of ?start=&end=), announcements and the current user's mood.
+    """
+    if current_user.household_id != household_id:
+        return jsonify({"error": "Forbidden"}), 403
+
+    start_s = request.args.get("start")
+    end_s = request.args.get("end")
+    if bool(start_s) != bool(end_s):
+        return jsonify({"error": "start and end must be given together"}), 400
+    if start_s:
+        start = parse_iso8601(start_s)
+        end = parse_iso8601(end_s)
+    else:
+        start = datetime.now(timezone.utc)
+        end = start + timedelta(days=7)
+    if start >= end:
+        return jsonify({"error": "start must be before end"}), 400
+
+    with count_statements("household snapshot", limit=SNAPSHOT_STATEMENT_BUDGET):
+        # 2 statements: household, members
+        households = fetch_rows(encode_household, Household.id == household_id)
+        if not households:
+            return jsonify({"error": "Household not found"}), 404
+        household = household_payload(households[0])
+
+        # 4 statements: lists, todos, household members, explicit member links
+        todo_lists = todo_lists_payload(
+            fetch_rows(encode_todo_list, TodoList.household_id == household_id, order_by=TodoList.id)
+        )
+
+        # 3 statements: lists, categories, items
+        shopping_lists = shopping_lists_payload(
+            fetch_rows(encode_shopping_list, ShoppingList.household_id == household_id, order_by=ShoppingList.id)
+        )
+
+        # 1 statement each
+        events = events_in_window(household_id, start, end)
+        announcements = fetch_rows(encode_announcement, Announcement.household_id == household_id)
+        moods = fetch_rows(encode_mood, Mood.user_id == current_user.id)
+
+        payload = {
+            "household": household,
+            "todoLists": todo_lists,
+            "shoppingLists": shopping_lists,
+            "events": events,
+            "announcements": [encode_announcement(a) for a in announcements],
+            "myMood": encode_mood(moods[0]) if moods else None,
+        }
+
+    return jsonify(payload), 200
+
+
+@household_routes.route("/<int:household_id>/changes", methods=["GET"])
+@login_required
+def get_household_changes(household_id):
+    """
+    Delta sync: the lists, todos, shopping categories/items, events and
+    announcements created, updated or deleted since ?since=<cursor>, with
+    tombstones under "deleted". Keep calling with the returned cursor while
+    hasMore is true. Without ?since= only the current cursor is returned.
+    """
+    if current_user.household_id != household_id:
+        return jsonify({"error": "Forbidden"}), 403
+
+    since = request.args.get("since")
+    if since is not None:
+        if not since.isdigit():
+            return jsonify({"error": "since must be a cursor returned by this endpoint"}), 400
+        since = int(since)
+    limit = min(request.args.get("limit", CHANGES_PAGE_SIZE, type=int), MAX_PAGE_SIZE)
+    if limit < 1:
+        return jsonify({"error": "limit must be a positive integer"}), 400
+
+    payload = changes_since(household_id, since, limit)
+    if payload is None:
+        return jsonify({"error": "Household not found"}), 404
+    if since is not None and since > int(payload["cursor"]):
+        # cursor from another database (restore, reset): start over
+        return jsonify({"error": "Cursor is ahead of this household; do a full reload"}), 410
+    return jsonify(payload), 200
+
+
+@household_routes.route("/<int:household_id>/stream", methods=["GET"])
+@login_required
+def stream_household_changes(household_id):
+    """
+    Server-Sent Events: a `hello` with the current change cursor, then a
+    compact `change` notice after every commit that touches the household's
+    todos, shopping, events, announcements or moods. On reconnect (or a
+    `resync` event), catch up with /changes?since=<last seq> first.
+    """
+    if current_user.household_id != household_id:
+        return jsonify({"error": "Forbidden"}), 403
+
+    # Subscribe before reading the cursor so nothing falls in between
+    subscription = current_app.extensions["broker"].subscribe(household_channel(household_id))
+    cursor = household_version(household_id)
+    if cursor is None:
+        subscription.close()
+        return jsonify({"error": "Household not found"}), 404
+
+    return Response(
+        stream(subscription, cursor),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@household_routes.route("/<int:household_id>/activity", methods=["GET"])
+@login_required
+def get_household_activity(household_id):
+    """
+    One page of the household activity feed, newest first.
+    Pass the returned `nextCursor` back as ?before= to get the next page.
+    """
+    if current_user.household_id != household_id:
+        return jsonify({"error": "Forbidden"}), 403
+
+    limit = request.args.get("limit", FEED_DEFAULT_LIMIT, type=int)
+    rows, next_cursor = fetch_feed(household_id, request.args.get("before"), limit)
+
+    return jsonify({
+        "items": render_many(rows),
+        "nextCursor": next_cursor,
+    }), 200
@@ -0,0 +1,29 @@
+from flask import Blueprint, abort, current_app, jsonify
+
+from app.compression import compression_stats
+from app.query_stats import endpoint_query_stats
+
+metrics_routes = Blueprint("metrics", __name__)
+
+
+@metrics_routes.before_request
+def metrics_enabled():
+    # Off unless METRICS_ENABLED; these are per-process operational numbers
+    if not current_app.config.get("METRICS_ENABLED"):
+        abort(404)
+
+
+@metrics_routes.route("/compression", methods=["GET"])
+def get_compression_stats():
+    """
+    Bytes before and after compression per endpoint, since this worker started
+    """
+    return jsonify(compression_stats()), 200
+
+
+@metrics_routes.route("/queries", methods=["GET"])
+def get_query_stats():
+    """
+    SQL statements and DB time per endpoint, since this worker started
+    """
+    return jsonify(endpoint_query_stats()), 200
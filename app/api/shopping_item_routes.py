@@ -1,9 +1,18 @@
 from flask import Blueprint, request, jsonify
-from app.models import ShoppingItem
+from app.models import ShoppingItem, ActivityType
 from app.extensions import db
+from app.activity_feed import record_activity
 
 shopping_item_routes = Blueprint("shopping_items", __name__)
 
+def _record_item_activity(type_, item):
+    shopping_list = item.shopping_list
+    record_activity(
+        type_, shopping_list.household_id,
+        object_type="item", object_id=item.id, object_title=item.name,
+        target_type="list", target_id=shopping_list.id, target_title=shopping_list.title,
+    )
+
 @shopping_item_routes.route("/<int:id>")
 def get_shopping_item(id):
     item = ShoppingItem.query.get(id)
@@ -46,6 +55,8 @@ def toggle_shopping_item(id):
         return jsonify({"error": "Shopping item not found"}), 404
 
     item.purchased = not item.purchased
+    if item.purchased:
+        _record_item_activity(ActivityType.SHOP_ITEM_CHECKED, item)
     db.session.commit()
 
     return jsonify(item.to_dict()), 200
@@ -76,7 +87,7 @@ def update_shopping_item_category(id):
 
     if category_id is None:
         item.category = None
-    else
+    else:
         from app.models import ShoppingCategory
         category = ShoppingCategory.query.filter_by(id=category_id, list_id=item.list_id).first()
         if not category:
@@ -101,6 +112,7 @@ def update_shopping_item_quantity(id):
         return jsonify({"error": "Quantity must be a positive integer"}), 400
 
     item.quantity = quantity
+    _record_item_activity(ActivityType.SHOP_ITEM_UPDATED, item)
     db.session.commit()
     return jsonify(item.to_dict()), 200 
 
@@ -118,6 +130,7 @@ def update_shopping_item_name(id):
         return jsonify({"error": "Name must be a non-empty string"}), 400
 
     item.name = name.strip()
+    _record_item_activity(ActivityType.SHOP_ITEM_UPDATED, item)
     db.session.commit()
     return jsonify(item.to_dict()), 200 
 
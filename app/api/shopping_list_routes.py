@@ -1,13 +1,26 @@
 from flask import Blueprint, jsonify, request
 from app.extensions import db 
-from app.models import ShoppingList, User, ShoppingItem
+from app.models import ShoppingList, User, ShoppingItem, ActivityType
+from app.activity_feed import record_activity
+from app.bulk import bulk_shopping_items
+from app.serializers import (
+    fetch_rows, encode_shopping_list, encode_shopping_item,
+    shopping_items_payload, shopping_lists_payload, shopping_lists_normalized,
+)
+from app.pagination import paginate, page_params, with_next_cursor
+from sqlalchemy import select
 
 shopping_list_routes = Blueprint("shopping_lists", __name__)
 
 @shopping_list_routes.route("/<int:id>")
 def get_shopping_list(id):
-    list = ShoppingList.query.get(id)
-    return list.to_dict()
+    lists = fetch_rows(encode_shopping_list, ShoppingList.id == id)
+    if not lists:
+        return jsonify({"error": "Shopping list not found"}), 404
+
+    if request.args.get("shape") == "normalized":
+        return jsonify(shopping_lists_normalized(lists)), 200
+    return jsonify(shopping_lists_payload(lists)[0]), 200
 
 @shopping_list_routes.route("/", methods=["POST"])
 def create_shopping_list():
@@ -83,6 +96,13 @@ def add_item_to_shopping_list(id):
     )
 
     db.session.add(item)
+    db.session.flush()
+
+    record_activity(
+        ActivityType.SHOP_ITEM_ADDED, shopping_list.household_id,
+        object_type="item", object_id=item.id, object_title=item.name,
+        target_type="list", target_id=shopping_list.id, target_title=shopping_list.title,
+    )
     db.session.commit()
 
     return jsonify(item.to_dict()), 201
@@ -90,13 +110,41 @@ def add_item_to_shopping_list(id):
 
 @shopping_list_routes.route("/<int:id>/items", methods=["GET"])
 def get_shopping_list_items(id):
-    shopping_list = ShoppingList.query.get(id)
+    if not db.session.query(ShoppingList.id).filter_by(id=id).first():
+        return jsonify({"error": "Shopping list not found"}), 404
+
+    items, next_cursor = paginate(
+        select(*encode_shopping_item.columns).where(ShoppingItem.list_id == id),
+        [ShoppingItem.id],
+        *page_params(),
+    )
+    return with_next_cursor((jsonify(shopping_items_payload(items)), 200), next_cursor)
+
+
+@shopping_list_routes.route("/<int:id>/items/bulk", methods=["POST"])
+def bulk_update_shopping_items(id):
+    """
+    Patch many items of a list at once, optionally clearing purchased items:
+    {"patches": [{"id": 5, "purchased": true}, {"id": 6, "quantity": 3}],
+     "clearPurchased": true}
+    Returns {"results": {"<id>": "ok" | "notFound"}, "cleared": [ids]}.
+    """
+    data = request.get_json(silent=True) or {}
+    # Just the columns the bulk write needs; skips loading every item
+    shopping_list = db.session.execute(
+        select(ShoppingList.id, ShoppingList.household_id, ShoppingList.title).where(ShoppingList.id == id)
+    ).first()
 
     if not shopping_list:
         return jsonify({"error": "Shopping list not found"}), 404
 
-    items = shopping_list.items or []
-    return jsonify([i.to_dict() for i in items]), 200
+    try:
+        payload = bulk_shopping_items(shopping_list, data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    db.session.commit()
+    return jsonify(payload), 200
 
 
 @shopping_list_routes.route("/<int:id>", methods=["PUT"])
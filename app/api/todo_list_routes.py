@@ -3,16 +3,54 @@ from flask import Blueprint, jsonify, request
 from app.models import TodoList, Todo, User, Household
 from app.extensions import db
 from flask_login import current_user, login_required
+from app.models import ActivityType
+from app.activity_feed import record_activity
+from app.serializers import fetch_rows, encode_todo_list, encode_todo, todo_lists_payload
+from app.pagination import paginate, page_params, with_next_cursor
+from app.etags import etag_from, todo_list_version
+from app.ordering import SORT_GAP, append_key, move_todo
+from app.change_log import record_changes
+from app.bulk import bulk_todos
+from sqlalchemy import bindparam, delete, select, update
 
 todo_list_routes = Blueprint("todo_lists", __name__)
 
 @todo_list_routes.route("/<int:id>", methods=["GET"])
+@etag_from(lambda id: todo_list_version(id))
 def get_todo_list(id):
     """
-    Get a specific todo list by id 
+    Get a specific todo list by id, with one page of its todos in sort order
+    (?cursor=&limit=, next page cursor in X-Next-Cursor)
     """
-    todo_list = TodoList.query.get_or_404(id)
-    return jsonify(todo_list.to_dict()), 200
+    lists = fetch_rows(encode_todo_list, TodoList.id == id)
+    if not lists:
+        return jsonify({"error": "Not found"}), 404
+
+    payload = todo_lists_payload(lists, include_todos=False)[0]
+    todos, next_cursor = _todos_page(id)
+    payload["todos"] = [encode_todo(t) for t in todos]
+    return with_next_cursor((jsonify(payload), 200), next_cursor)
+
+
+@todo_list_routes.route("/<int:id>/todos", methods=["GET"])
+@etag_from(lambda id: todo_list_version(id))
+def get_todos(id):
+    """
+    The todos of a list in sort order, one page at a time
+    """
+    if not db.session.query(TodoList.id).filter_by(id=id).first():
+        return jsonify({"error": "Not found"}), 404
+
+    todos, next_cursor = _todos_page(id)
+    return with_next_cursor((jsonify([encode_todo(t) for t in todos]), 200), next_cursor)
+
+
+def _todos_page(list_id):
+    return paginate(
+        select(*encode_todo.columns).where(Todo.list_id == list_id),
+        [Todo.sort_index, Todo.id],
+        *page_params(),
+    )
 
 @todo_list_routes.route("/<int:id>", methods=["GET"])
 @login_required
@@ -59,7 +97,12 @@ def create_todo_list():
     
     household = Household.query.get(data.get("household_id"))
     household.todo_lists.append(todo_list)
+    db.session.flush()
 
+    record_activity(
+        ActivityType.LIST_CREATED, todo_list.household_id,
+        object_type="list", object_id=todo_list.id, object_title=todo_list.title,
+    )
     db.session.commit()
 
     return jsonify(todo_list.to_dict()), 201
@@ -71,13 +114,7 @@ def add_todo(id):
     Add a todo to a specific todo list, appended to the end (by sort_index).
     """
     data = request.get_json() or {}
-    TodoList.query.get_or_404(id)  # ensures list exists
-
-    max_idx = (
-        db.session.query(db.func.coalesce(db.func.max(Todo.sort_index), -1))
-        .filter(Todo.list_id == id)
-        .scalar()
-    )
+    todo_list = TodoList.query.get_or_404(id)  # ensures list exists
 
     todo = Todo(
         title=data["title"],
@@ -87,10 +124,17 @@ def add_todo(id):
         due_date=data.get("due_date"),         # parse to date/datetime if needed
         assigned_to_id=data.get("assigned_to_id"),
         list_id=id,
-        sort_index=max_idx + 1,
+        sort_index=append_key(id),  # computed inside the INSERT
     )
 
     db.session.add(todo)
+    db.session.flush()
+
+    record_activity(
+        ActivityType.TASK_CREATED, todo_list.household_id,
+        object_type="task", object_id=todo.id, object_title=todo.title,
+        target_type="list", target_id=todo_list.id, target_title=todo_list.title,
+    )
     db.session.commit()
     return jsonify(todo.to_dict()), 201
 
@@ -100,6 +144,11 @@ def complete_todo(id, todo_id):
     todo = Todo.query.get(todo_id)
 
     setattr(todo, "status", "completed")
+    record_activity(
+        ActivityType.TASK_COMPLETED, todo.todo_list.household_id,
+        object_type="task", object_id=todo.id, object_title=todo.title,
+        target_type="list", target_id=todo.list_id, target_title=todo.todo_list.title,
+    )
     db.session.commit()
 
     return jsonify({"message": f""})
@@ -123,7 +172,18 @@ def clear_list(list_id):
     """
     Remove all todos from a list
     """
-    Todo.query.filter_by(list_id=list_id).delete()
+    todo_list = TodoList.query.get_or_404(list_id)
+
+    todo_ids = list(db.session.scalars(select(Todo.id).where(Todo.list_id == list_id)))
+    if todo_ids:
+        # Core DELETE skips the change-log hook, so record the change here
+        db.session.execute(delete(Todo.__table__).where(Todo.__table__.c.list_id == list_id))
+        household_id = todo_list.household_id
+        record_changes(
+            db.session,
+            [(household_id, Todo, tid, True) for tid in todo_ids] if household_id else (),
+            todo_list_ids={list_id},
+        )
     db.session.commit()
     return jsonify({"message": f"All todos deleted from list {list_id}"}), 200
 
@@ -148,31 +208,104 @@ def edit_todo_list(id):
 
     data = request.get_json()
     title = data["title"]
+    old_title = todo_list.title
     todo_list.title = title
 
+    if title != old_title:
+        record_activity(
+            ActivityType.LIST_RENAMED, todo_list.household_id,
+            object_type="list", object_id=todo_list.id, object_title=title,
+            target_type="list", target_id=todo_list.id, target_title=old_title,
+        )
     db.session.commit()
     return jsonify(todo_list.to_dict()), 200
 
 @todo_list_routes.route("/<int:list_id>/reorder", methods=['PATCH'])
 def reorder_todos(list_id):
+    """
+    Renumber a list from a full ordering (orderedIds). To move a single
+    todo, use PATCH /<list_id>/todos/<id>/move, which writes one row.
+    """
     data = request.get_json() or {} 
     ordered_ids = data.get("orderedIds")
 
     if not isinstance(ordered_ids, list) or not ordered_ids:
         return jsonify({ "error": "orderedIds (non-empty array) required"}), 400
-    
-    todos = Todo.query.filter(Todo.list_id == list_id).all()
-    current_ids = {todo.id for todo in todos}
-    requested_ids = set(ordered_ids)
-
-
-    for idx, tid in enumerate(ordered_ids):
-        (
-            db.session.query(Todo)
-                .filter(Todo.id == tid, Todo.list_id == list_id)
-                .update({Todo.sort_index: idx}, synchronize_session=False)
+    if not all(isinstance(tid, int) and not isinstance(tid, bool) for tid in ordered_ids):
+        return jsonify({ "error": "orderedIds must be todo ids"}), 400
+
+    todo_list = TodoList.query.get_or_404(list_id)
+
+    # Only this list's todos are renumbered (and logged); other ids are ignored
+    matched = set(db.session.scalars(
+        select(Todo.id).where(Todo.list_id == list_id, Todo.id.in_(ordered_ids))
+    ))
+    rows = [
+        {"todo_id": tid, "key": idx * SORT_GAP}
+        for idx, tid in enumerate(ordered_ids) if tid in matched
+    ]
+    if rows:
+        # One executemany
+        todos = Todo.__table__
+        db.session.execute(
+            update(todos)
+            .where(todos.c.id == bindparam("todo_id"), todos.c.list_id == list_id)
+            .values(sort_index=bindparam("key")),
+            rows,
         )
-    
+        record_changes(
+            db.session,
+            [(todo_list.household_id, Todo, row["todo_id"], False) for row in rows],
+            todo_list_ids={list_id},
+        )
+
+    record_activity(
+        ActivityType.TASK_REORDERED, todo_list.household_id,
+        target_type="list", target_id=todo_list.id, target_title=todo_list.title,
+    )
     db.session.commit()
     return("", 204)
 
+
+@todo_list_routes.route("/<int:list_id>/todos/<int:id>/move", methods=['PATCH'])
+def move_todo_between(list_id, id):
+    """
+    Move one todo between two others: {"afterId": A, "beforeId": B}.
+    Either may be omitted/null for the top or bottom of the list.
+    Only the moved todo is written.
+    """
+    data = request.get_json() or {}
+    todo = Todo.query.filter_by(id=id, list_id=list_id).first_or_404()
+    todo_list = todo.todo_list
+
+    try:
+        move_todo(todo, data.get("afterId"), data.get("beforeId"), todo_list.household_id)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    record_activity(
+        ActivityType.TASK_REORDERED, todo_list.household_id,
+        target_type="list", target_id=todo_list.id, target_title=todo_list.title,
+    )
+    db.session.commit()
+    return jsonify(todo.to_dict()), 200
+
+
+@todo_list_routes.route("/<int:list_id>/todos/bulk", methods=["POST"])
+def bulk_edit_todos(list_id):
+    """
+    Apply one action to many todos of a list:
+    {"action": "complete" | "reopen" | "assign" | "setDueDate" | "move" | "delete",
+     "ids": [...], "assignedToId": n | null, "dueDate": "YYYY-MM-DD" | null, "toListId": n}
+    Returns {"results": {"<id>": "ok" | "notFound"}}.
+    """
+    data = request.get_json(silent=True) or {}
+    todo_list = TodoList.query.get_or_404(list_id)
+
+    try:
+        payload = bulk_todos(todo_list, data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    db.session.commit()
+    return jsonify(payload), 200
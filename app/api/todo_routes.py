@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
-from app.models import Todo
+from app.models import Todo, User, ActivityType
 from app.extensions import db
+from app.activity_feed import record_activity
 from datetime import datetime, date
 
 todo_routes = Blueprint("todos", __name__)
@@ -15,6 +16,18 @@ def parse_due_date(val: str) -> datetime:
         val = val.replace('Z', '+00:00')
     return datetime.fromisoformat(val)
 
+def _record_task_activity(type_, todo, **fields):
+    todo_list = todo.todo_list
+    fields = {
+        "target_type": "list", "target_id": todo_list.id, "target_title": todo_list.title,
+        **fields,
+    }
+    record_activity(
+        type_, todo_list.household_id,
+        object_type="task", object_id=todo.id, object_title=todo.title,
+        **fields,
+    )
+
 
 @todo_routes.route("/<int:id>/completed", methods=["PUT"])
 def complete_todo(id):
@@ -33,6 +46,10 @@ def complete_todo(id):
     else:
         return jsonify({"error": "Provide boolean 'completed' or valid 'status'"}), 400
 
+    if todo.status == "completed":
+        _record_task_activity(ActivityType.TASK_COMPLETED, todo)
+    else:
+        _record_task_activity(ActivityType.TASK_REOPENED, todo)
     db.session.commit()
     return jsonify(todo.to_dict()), 200
 
@@ -48,17 +65,35 @@ def edit_todo(id):
     if "notes" in data:
         setattr(todo, "notes", data["notes"])
 
-    if "assignedToId" in data:
+    if "assignedToId" in data and data["assignedToId"] != todo.assigned_to_id:
         setattr(todo, "assigned_to_id", data["assignedToId"])
+        assignee = User.query.get(todo.assigned_to_id) if todo.assigned_to_id else None
+        if assignee:
+            _record_task_activity(
+                ActivityType.TASK_ASSIGNED, todo,
+                target_type="user", target_id=assignee.id,
+                target_title=assignee.display_name or assignee.name,
+            )
+        else:
+            _record_task_activity(ActivityType.TASK_UNASSIGNED, todo)
 
     if "dueDate" in data:
         s = data["dueDate"]
+        old_due = todo.due_date
         if not s:
             todo.due_date = None
         else:
             # expect "YYYY-MM-DD"
             todo.due_date = date.fromisoformat(s)
 
+        if todo.due_date != old_due:
+            if todo.due_date is None:
+                _record_task_activity(ActivityType.TASK_DUE_DATE_CLEARED, todo)
+            elif old_due is None:
+                _record_task_activity(ActivityType.TASK_DUE_DATE_SET, todo)
+            else:
+                _record_task_activity(ActivityType.TASK_DUE_DATE_CHANGED, todo)
+
     db.session.commit()
     return jsonify(todo.to_dict()), 200
 
@@ -1,11 +1,19 @@
 from flask import Blueprint, current_app, jsonify, request
-from app.models import User, Checkin
+from app.models import User, Checkin, ActivityType
 from flask_login import current_user, login_required
 from app.extensions import db
+from app.activity_feed import record_activity
+from app.serializers import encode_user
+from app.pagination import paginate, page_params, with_next_cursor
+from app.images import IMAGE_COLUMNS, set_image, schedule_variants
+from app.blobs import BLOB_PREFIX, SHA256_HEX, blob_key, find_blob, hold_blob, register_blob
+from sqlalchemy import select
 from app.s3_helpers import (
-    upload_file_to_s3, allowed_file, get_unique_filename)
+    upload_file_to_s3, allowed_file, content_hash, presign_upload, stat_object, public_url,
+    IMAGE_CONTENT_TYPES, MAX_IMAGE_BYTES, PRESIGN_EXPIRES_SECONDS)
 from datetime import datetime, date, timedelta
 from zoneinfo import ZoneInfo 
+import re
 
 user_routes = Blueprint('users', __name__)
 
@@ -19,10 +27,10 @@ def _d(s: str | None):
 @user_routes.route("/")
 def get_all_users():
     """
-    Fetch all users
+    Fetch all users, one page at a time (?cursor=&limit=, next page cursor in X-Next-Cursor)
     """
-    users = User.query.all()
-    return {"Users": [user.to_dict() for user in users]}, 200
+    rows, next_cursor = paginate(select(*encode_user.columns), [User.id], *page_params())
+    return with_next_cursor(({"Users": [encode_user(r) for r in rows]}, 200), next_cursor)
 
 @user_routes.route("/<int:id>") # ex: /users/1
 def get_user(id):
@@ -108,6 +116,7 @@ def check_in_today(user_id):
     exists = Checkin.query.filter_by(user_id=user_id, local_date=tld).first()
     if not exists:
         db.session.add(Checkin(user_id=user_id, local_date=tld))
+        record_activity(ActivityType.CHECKIN, current_user.household_id)
         db.session.commit()
     return jsonify({"checkedInToday": True, "localDate": tld.isoformat()})
 
@@ -116,6 +125,11 @@ def check_in_today(user_id):
 @user_routes.route("/<int:id>/img/<type>", methods=["POST"])
 @login_required
 def upload_image(id, type):
+    """
+    Upload an image through this server (multipart "image" field).
+    Kept for older clients; new ones upload directly to S3 via
+    /img/<type>/presign and PUT /img/<type>.
+    """
     if "image" not in request.files:
         return {"errors": "image required"}, 400
 
@@ -124,26 +138,123 @@ def upload_image(id, type):
     if not allowed_file(image.filename):
         return {"errors": "file type not permitted"}, 400
 
-    image.filename = get_unique_filename(image.filename)
-
-    upload = upload_file_to_s3(image)
+    # content-addressed: a file we already store is not uploaded again
+    digest, size = content_hash(image.stream)
+    key = blob_key(digest, image.filename.rsplit(".", 1)[1].lower())
+    if not hold_blob(key):
+        image.filename = key
+        upload = upload_file_to_s3(image)
 
-    if "url" not in upload:
-        return upload, 400
+        if "url" not in upload:
+            return upload, 400
+        register_blob(key, image.mimetype or "application/octet-stream", size)
 
-    url = upload["url"]
+    url = public_url(key)
     # flask_login allows us to get the current user from the request
     user = User.query.get(id)
 
-    if type == "profile":
-        setattr(user, "profile_img", url)
-    elif type == "banner":
-        setattr(user, "banner_img", url)
-
+    build = type in IMAGE_COLUMNS and set_image(user, type, url)
     db.session.commit()
+    if build:
+        schedule_variants(id, type, key)
     return {"url": url}
 
 
+# only keys handed out by presign_image_upload
+_IMAGE_KEY = re.compile(rf"{BLOB_PREFIX}[0-9a-f]{{64}}\.({'|'.join(IMAGE_CONTENT_TYPES.values())})")
+
+
+def _check_image_target(id, type):
+    if type not in IMAGE_COLUMNS:
+        return jsonify({"error": "Image type must be profile or banner"}), 404
+    if id != current_user.id:
+        return jsonify({"error": "Forbidden"}), 403
+    return None
+
+
+@user_routes.route("/<int:id>/img/<type>/presign", methods=["POST"])
+@login_required
+def presign_image_upload(id, type):
+    """
+    Step 1 of an image upload: S3 POST parameters for uploading the file
+    directly from the client. Body: {"contentType", "sha256", "size"?}.
+    The client then posts `upload.fields` and the file to `upload.url`,
+    and confirms with PUT /users/<id>/img/<type> {"key"}. When the file
+    is already stored ("exists": true) there is nothing to upload: go
+    straight to the confirm.
+    """
+    error = _check_image_target(id, type)
+    if error:
+        return error
+    data = request.get_json(silent=True) or {}
+    content_type = data.get("contentType")
+    sha256 = data.get("sha256")
+    size = data.get("size")
+
+    if content_type not in IMAGE_CONTENT_TYPES:
+        return jsonify({"error": f"contentType must be one of {', '.join(IMAGE_CONTENT_TYPES)}"}), 400
+    if not isinstance(sha256, str) or not SHA256_HEX.fullmatch(sha256):
+        return jsonify({"error": "sha256 must be the file's SHA-256 in lowercase hex"}), 400
+    if size is not None and (not isinstance(size, int) or isinstance(size, bool) or size < 1):
+        return jsonify({"error": "size must be a positive integer"}), 400
+    if size is not None and size > MAX_IMAGE_BYTES:
+        return jsonify({"error": f"Images are limited to {MAX_IMAGE_BYTES} bytes"}), 413
+
+    key = blob_key(sha256, IMAGE_CONTENT_TYPES[content_type])
+    if hold_blob(key):
+        # kept from gc for another grace period, until the confirm references it
+        db.session.commit()
+        return jsonify({"key": key, "url": public_url(key), "exists": True}), 200
+
+    upload = presign_upload(key, content_type, MAX_IMAGE_BYTES, sha256=sha256)
+    if "errors" in upload:
+        return jsonify({"error": upload["errors"]}), 502
+
+    return jsonify({
+        "key": key,
+        "upload": upload,
+        "url": public_url(key),
+        "exists": False,
+        "maxSize": MAX_IMAGE_BYTES,
+        "expiresIn": PRESIGN_EXPIRES_SECONDS,
+    }), 200
+
+
+@user_routes.route("/<int:id>/img/<type>", methods=["PUT"])
+@login_required
+def confirm_image_upload(id, type):
+    """
+    Step 2 of an image upload: record the object the client uploaded (or
+    that was already stored) as the user's profile/banner image.
+    Body: {"key"} from the presign step.
+    """
+    error = _check_image_target(id, type)
+    if error:
+        return error
+    key = (request.get_json(silent=True) or {}).get("key")
+    if not isinstance(key, str) or not _IMAGE_KEY.fullmatch(key):
+        return jsonify({"error": "key must come from the presign step"}), 400
+
+    if find_blob(key) is None:
+        # first upload of this content: S3 enforced type, size and checksum,
+        # this only checks it arrived
+        obj = stat_object(key)
+        if "errors" in obj:
+            return jsonify({"error": "Upload not found"}), 404
+        if obj["contentType"] not in IMAGE_CONTENT_TYPES or obj["size"] > MAX_IMAGE_BYTES:
+            return jsonify({"error": "Upload is not an accepted image"}), 400
+        register_blob(key, obj["contentType"], obj["size"])
+
+    url = public_url(key)
+    # through the ORM, so the flush hooks (cached principal, change log) see it
+    user = db.session.get(User, id)
+    build = set_image(user, type, url)
+    db.session.commit()
+    if build:
+        schedule_variants(id, type, key)
+    return jsonify({"url": url}), 200
+
+
 @user_routes.route("/<int:id>/mood")
 def get_user_mood(id):
     user = User.query.get(id)
@@ -0,0 +1,218 @@
+"""
+Request batching: many API calls in one HTTP round trip.
+
+POST /api/batch takes
+
+    {"requests": [{"method": "POST", "path": "/api/todo_lists", "body": {...}},
+                  {"method": "POST", "path": "/api/todo_lists/{{0.id}}/todos",
+                   "body": {"title": "Milk"}}],
+     "atomic": true}
+
+and answers {"responses": [{"status": 201, "headers": {...}, "body": {...}}]}
+in request order.
+
+Sub-requests are dispatched in-process against the app's URL map, inside
+the batch's app context: before_request hooks and the view run as usual,
+but the per-response work (Talisman and CORS headers, the CSRF cookie,
+session saving) happens once, on the batch response. Sub-requests share
+the caller's cookies and auth headers; cookies they set are not returned.
+
+`{{<index>.<key>...}}` in a path or a string body value is replaced with a
+value from an earlier response body, so a sub-request can use an id
+created earlier in the batch. A value that is only a placeholder keeps the
+referenced value's JSON type.
+
+With "atomic": true every sub-request runs in one transaction: the views'
+commits only flush, the first failure (status >= 400) rolls everything
+back, and later sub-requests are answered 424 without running. Otherwise
+each sub-request commits or rolls back on its own, as it would alone.
+"""
+import re
+import sys
+from contextlib import contextmanager
+
+from flask import current_app, jsonify, request
+from werkzeug.exceptions import HTTPException
+from werkzeug.test import EnvironBuilder
+
+from app.extensions import db
+
+MAX_BATCH_REQUESTS = 20
+BATCH_PATH = "/api/batch"
+METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+
+# Forwarded from the batch request to every sub-request
+_FORWARDED_HEADERS = ("Cookie", "Authorization", "Accept-Language", "User-Agent")
+# Meaningless inside a JSON envelope
+_DROPPED_HEADERS = {"content-length", "content-type", "set-cookie"}
+
+_PLACEHOLDER = re.compile(r"\{\{\s*(\d+)((?:\.[A-Za-z0-9_]+)+)\s*\}\}")
+
+
+class BatchError(ValueError):
+    """A sub-request that cannot be run; becomes a 400 for that entry."""
+
+
+# --------------------------------------------------------------------------- #
+#  Parsing
+# --------------------------------------------------------------------------- #
+def parse_batch(data) -> tuple[list[dict], bool]:
+    """(sub-requests, atomic); raises ValueError for a malformed batch."""
+    if not isinstance(data, dict):
+        raise ValueError("Body must be an object with a requests array")
+    subs = data.get("requests")
+    if not isinstance(subs, list) or not subs:
+        raise ValueError("requests (non-empty array) required")
+    if len(subs) > MAX_BATCH_REQUESTS:
+        raise ValueError(f"At most {MAX_BATCH_REQUESTS} requests per batch")
+    atomic = data.get("atomic", False)
+    if not isinstance(atomic, bool):
+        raise ValueError("atomic must be a boolean")
+
+    for i, sub in enumerate(subs):
+        if not isinstance(sub, dict):
+            raise ValueError(f"requests[{i}] must be an object")
+        method = str(sub.get("method", "GET")).upper()
+        path = sub.get("path")
+        if method not in METHODS:
+            raise ValueError(f"requests[{i}].method must be one of {', '.join(METHODS)}")
+        if not isinstance(path, str) or not path.startswith("/api/"):
+            raise ValueError(f"requests[{i}].path must start with /api/")
+        if path.split("?", 1)[0].rstrip("/") == BATCH_PATH:
+            raise ValueError("Batches cannot be nested")
+        sub["method"] = method
+    return subs, atomic
+
+
+def _lookup(responses, index: int, keys: list[str]):
+    if index >= len(responses):
+        raise BatchError(f"{{{{{index}...}}}} refers to a later request")
+    value = responses[index]["body"]
+    for key in keys:
+        if isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        elif isinstance(value, dict) and key in value:
+            value = value[key]
+        else:
+            raise BatchError(f"Response {index} has no {'.'.join(keys)}")
+    return value
+
+
+def _resolve(value, responses):
+    """Substitute {{i.key}} placeholders in strings nested anywhere in `value`."""
+    if isinstance(value, str):
+        whole = _PLACEHOLDER.fullmatch(value)
+        if whole:
+            return _lookup(responses, int(whole[1]), whole[2][1:].split("."))
+        return _PLACEHOLDER.sub(
+            lambda m: str(_lookup(responses, int(m[1]), m[2][1:].split("."))), value
+        )
+    if isinstance(value, list):
+        return [_resolve(v, responses) for v in value]
+    if isinstance(value, dict):
+        return {k: _resolve(v, responses) for k, v in value.items()}
+    return value
+
+
+# --------------------------------------------------------------------------- #
+#  Dispatch
+# --------------------------------------------------------------------------- #
+def _dispatch(app):
+    """Run the matched view like full_dispatch_request, minus after_request."""
+    try:
+        rv = app.preprocess_request()
+        if rv is None:
+            rv = app.dispatch_request()
+    except HTTPException as e:
+        rv = app.handle_http_exception(e)
+        if isinstance(rv, HTTPException):
+            rv = rv.get_response()  # no handler, e.g. flask-login's 401
+    except Exception as e:
+        try:
+            rv = app.handle_user_exception(e)
+        except Exception:
+            app.log_exception(sys.exc_info())
+            rv = jsonify({"error": "Internal server error"}), 500
+    return app.make_response(rv)
+
+
+def _envelope(response) -> dict:
+    if response.is_streamed:
+        response.close()
+        return {"status": 400, "headers": {}, "body": {"error": "Streaming responses cannot be batched"}}
+    if response.is_json:
+        body = response.get_json(silent=True)
+    else:
+        body = response.get_data(as_text=True) or None
+    headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+    return {"status": response.status_code, "headers": headers, "body": body}
+
+
+def _run(app, sub, responses) -> dict:
+    try:
+        path = _resolve(sub["path"], responses)
+        body = _resolve(sub["body"], responses) if "body" in sub else None
+        query = _resolve(sub.get("query"), responses)
+    except BatchError as e:
+        return {"status": 400, "headers": {}, "body": {"error": str(e)}}
+
+    builder = EnvironBuilder(
+        path=path,
+        base_url=request.root_url,
+        method=sub["method"],
+        query_string=query,
+        headers={h: request.headers[h] for h in _FORWARDED_HEADERS if h in request.headers},
+        environ_base={"REMOTE_ADDR": request.remote_addr},
+        **({"json": body} if body is not None else {}),
+    )
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+
+    # Reuses the batch's app context, so db.session and g (current_user) are shared
+    with app.request_context(environ):
+        response = _dispatch(app)
+        try:
+            return _envelope(response)
+        finally:
+            response.close()
+
+
+@contextmanager
+def _deferred_commits(session):
+    """Make the views' commits flush only, so the batch commits (or not) once."""
+    session.commit = session.flush
+    try:
+        yield
+    finally:
+        del session.commit
+
+
+def run_batch(subs: list[dict], atomic: bool) -> list[dict]:
+    app = current_app._get_current_object()
+    responses = []
+    if not atomic:
+        for sub in subs:
+            responses.append(_run(app, sub, responses))
+            # What teardown would do after a lone request: drop anything uncommitted
+            db.session.rollback()
+        return responses
+
+    session = db.session()
+    failed = None
+    with _deferred_commits(session):
+        for i, sub in enumerate(subs):
+            response = _run(app, sub, responses)
+            responses.append(response)
+            if response["status"] >= 400:
+                failed = i
+                break
+    if failed is None:
+        db.session.commit()
+        return responses
+
+    db.session.rollback()
+    skipped = {"error": f"Not run: request {failed} failed and the batch was rolled back"}
+    responses += [{"status": 424, "headers": {}, "body": skipped} for _ in subs[failed + 1:]]
+    return responses
@@ -0,0 +1,142 @@
+"""
+Content-addressed uploads.
+
+Uploaded files are stored under their SHA-256, blobs/<sha256>.<ext>, so an
+avatar uploaded twice (or by two people) is a single S3 object. The hash is
+looked up before anything is written; for a known blob the upload becomes a
+metadata-only change, with no transfer and no storage write.
+
+    presigned uploads   the client sends the hash it computed. A known blob
+                        skips the upload; otherwise the presigned POST pins
+                        the checksum, so S3 refuses any other content
+    server uploads      content_hash() streams the file once, then the same
+                        lookup applies
+
+Each Blob row counts the columns that reference it, and swap_reference()
+moves one reference when a user's image changes. An unreferenced blob is
+kept for BLOB_GC_GRACE_SECONDS, because an upload in flight may be about to
+reference it again; finding a blob for an upload (hold_blob) restarts that
+grace period. After that, `flask blobs gc` deletes it together with
+its derived images (<key without extension>/...).
+"""
+import re
+from datetime import datetime, timedelta, timezone
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import case, delete, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models import Blob
+from app.s3_helpers import S3_LOCATION, delete_objects, list_keys
+
+BLOB_PREFIX = "blobs/"
+BLOB_GC_GRACE_SECONDS = 24 * 60 * 60
+SHA256_HEX = re.compile(r"[0-9a-f]{64}")
+
+
+def _now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def blob_key(sha256: str, ext: str) -> str:
+    return f"{BLOB_PREFIX}{sha256}.{ext}"
+
+
+def find_blob(key: str) -> Blob | None:
+    return db.session.scalar(select(Blob).where(Blob.key == key))
+
+
+def hold_blob(key: str) -> bool:
+    """
+    Whether `key` is a stored blob. An unreferenced one starts a new grace
+    period, so gc keeps it for the upload that is about to reference it.
+    """
+    return db.session.execute(
+        update(Blob).where(Blob.key == key)
+        .values(released_at=case((Blob.ref_count <= 0, _now()), else_=Blob.released_at))
+    ).rowcount > 0
+
+
+def register_blob(key: str, content_type: str, size: int) -> Blob:
+    """The Blob row for `key`, created (unreferenced) on its first upload."""
+    blob = find_blob(key)
+    if blob is not None:
+        return blob
+    try:
+        with db.session.begin_nested():
+            blob = Blob(key=key, content_type=content_type, size=size, ref_count=0, released_at=_now())
+            db.session.add(blob)
+    except IntegrityError:  # registered concurrently
+        blob = find_blob(key)
+    return blob
+
+
+def _key_of(url: str | None) -> str | None:
+    if url and url.startswith(S3_LOCATION + BLOB_PREFIX):
+        return url[len(S3_LOCATION):]
+    return None
+
+
+def swap_reference(old_url: str | None, new_url: str | None):
+    """
+    Move one reference from the blob behind `old_url` to the blob behind
+    `new_url`. URLs outside the blob store (older uploads, the default
+    avatar) are ignored.
+    """
+    if old_url == new_url:
+        return
+    new_key, old_key = _key_of(new_url), _key_of(old_url)
+    if new_key:
+        db.session.execute(
+            update(Blob).where(Blob.key == new_key)
+            .values(ref_count=Blob.ref_count + 1, released_at=None)
+        )
+    if old_key:
+        db.session.execute(
+            update(Blob).where(Blob.key == old_key)
+            .values(
+                ref_count=Blob.ref_count - 1,
+                released_at=case((Blob.ref_count <= 1, _now()), else_=Blob.released_at),
+            )
+        )
+
+
+# --------------------------------------------------------------------------- #
+#  Garbage collection
+# --------------------------------------------------------------------------- #
+def collect_garbage(grace_seconds: int = BLOB_GC_GRACE_SECONDS) -> int:
+    """Delete blobs unreferenced for `grace_seconds`, with their derived images. Returns how many."""
+    cutoff = _now() - timedelta(seconds=grace_seconds)
+    candidates = db.session.execute(
+        select(Blob.id, Blob.key).where(Blob.ref_count <= 0, Blob.released_at < cutoff)
+    ).all()
+
+    removed = 0
+    for blob_id, key in candidates:
+        # the row goes first (re-checking it is still unreferenced and not
+        # held since), so no committed row ever points at a deleted object
+        gone = db.session.execute(
+            delete(Blob).where(Blob.id == blob_id, Blob.ref_count <= 0, Blob.released_at < cutoff)
+        ).rowcount
+        db.session.commit()
+        if not gone:
+            continue
+        result = delete_objects([key, *list_keys(key.rsplit(".", 1)[0] + "/")])
+        if "errors" in result:
+            current_app.logger.warning("Blob %s: row deleted, objects left behind: %s", key, result["errors"])
+        removed += 1
+    return removed
+
+
+blob_commands = AppGroup("blobs", help="Content-addressed upload storage.")
+
+
+@blob_commands.command("gc")
+@click.option("--grace", default=BLOB_GC_GRACE_SECONDS, show_default=True,
+              help="Seconds a blob must have been unreferenced.")
+def gc_command(grace):
+    """Delete unreferenced blobs and their derived images."""
+    click.echo(f"Deleted {collect_garbage(grace)} unreferenced blob(s)")
@@ -1,3 +1,4 @@
+import threading
 from importlib import import_module
 
 _BLUEPRINT_PATHS = (
@@ -12,11 +13,42 @@ _BLUEPRINT_PATHS = (
     "app.api.shopping_list_routes:shopping_list_routes",
     "app.api.shopping_item_routes:shopping_item_routes",
     "app.api.shopping_category_routes:shopping_category_routes",   
-    
+    "app.api.batch_routes:batch_routes",
+    "app.api.metrics_routes:metrics_routes",
 )
 
-def register_blueprints(app):
+def load_blueprints(app):
+    """Import and register every API blueprint (once)."""
+    if app.extensions.get("blueprints_loaded"):
+        return
     for dotted in _BLUEPRINT_PATHS:
         module_path, bp_name = dotted.split(":")
         bp = getattr(import_module(module_path), bp_name)
         app.register_blueprint(bp, url_prefix=f"/api/{bp.name}")
+    app.extensions["blueprints_loaded"] = True
+
+
+class _LoadBlueprintsOnFirstRequest:
+    """
+    WSGI wrapper that registers the blueprints right before the first
+    request is dispatched, so processes that never serve one (CLI commands,
+    migrations, scripts) skip importing the route modules.
+    """
+
+    def __init__(self, app, wsgi_app):
+        self.app = app
+        self.wsgi_app = wsgi_app
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        if not self.app.extensions.get("blueprints_loaded"):
+            with self._lock:
+                load_blueprints(self.app)
+        return self.wsgi_app(environ, start_response)
+
+
+def register_blueprints(app, lazy: bool = False):
+    if lazy:
+        app.wsgi_app = _LoadBlueprintsOnFirstRequest(app, app.wsgi_app)
+    else:
+        load_blueprints(app)
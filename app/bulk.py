@@ -0,0 +1,324 @@
+"""
+Bulk mutations: one action applied to many rows at once.
+
+Each action is a single set-based UPDATE or DELETE over the ids that
+actually belong to the list, inside the request's transaction, followed by
+one record_changes() call (Core statements bypass the change-log hook) and
+one activity row carrying the item count. Results come back per id:
+
+    {"results": {"5": "ok", "9": "notFound"}}
+
+Shopping items take a list of per-item patches instead, applied as one
+executemany UPDATE per set of patched fields.
+
+Actions raise ValueError with a client-facing message for bad input; the
+caller commits.
+"""
+from datetime import date
+
+from sqlalchemy import bindparam, delete, func, select, update
+
+from app.activity_feed import record_activity
+from app.change_log import record_changes
+from app.extensions import db
+from app.models import ActivityType, ShoppingCategory, ShoppingItem, ShoppingList, Todo, TodoList, User
+from app.ordering import SORT_GAP
+
+MAX_BULK_IDS = 1000
+
+_todos = Todo.__table__
+_items = ShoppingItem.__table__
+
+
+def parse_ids(value) -> list[int]:
+    """The request's `ids`, de-duplicated in order."""
+    if not isinstance(value, list) or not value:
+        raise ValueError("ids (non-empty array) required")
+    if len(value) > MAX_BULK_IDS:
+        raise ValueError(f"At most {MAX_BULK_IDS} ids per request")
+    if not all(isinstance(v, int) and not isinstance(v, bool) for v in value):
+        raise ValueError("ids must be integers")
+    return list(dict.fromkeys(value))
+
+
+def results(ids, matched) -> dict:
+    return {"results": {str(i): "ok" if i in matched else "notFound" for i in ids}}
+
+
+# --------------------------------------------------------------------------- #
+#  Todos
+# --------------------------------------------------------------------------- #
+TODO_ACTIONS = ("complete", "reopen", "assign", "setDueDate", "move", "delete")
+
+
+def _matched_todos(list_id, ids) -> list:
+    """(id, title) of the requested todos that are in the list, in list order."""
+    return db.session.execute(
+        select(_todos.c.id, _todos.c.title)
+        .where(_todos.c.list_id == list_id, _todos.c.id.in_(ids))
+        .order_by(_todos.c.sort_index, _todos.c.id)
+    ).all()
+
+
+def _task_activity(single, many, todo_list, rows, **fields):
+    """One feed row for the whole action: `single` for one todo, `many` with a count."""
+    last = rows[-1]
+    fields = {"target_type": "list", "target_id": todo_list.id, "target_title": todo_list.title, **fields}
+    record_activity(
+        single if len(rows) == 1 else many, todo_list.household_id,
+        item_count=len(rows),
+        object_type="task", object_id=last.id, object_title=last.title,
+        **fields,
+    )
+
+
+def bulk_todos(todo_list: TodoList, data: dict) -> dict:
+    """Apply `data["action"]` to the todos `data["ids"]` of `todo_list`."""
+    action = data.get("action")
+    if action not in TODO_ACTIONS:
+        raise ValueError(f"action must be one of {', '.join(TODO_ACTIONS)}")
+    ids = parse_ids(data.get("ids"))
+
+    values, target = {}, None
+    if action in ("complete", "reopen"):
+        values["status"] = "completed" if action == "complete" else "in_progress"
+    elif action == "assign":
+        if "assignedToId" not in data:
+            raise ValueError("assignedToId required (null to unassign)")
+        assignee_id = data["assignedToId"]
+        if assignee_id is not None:
+            target = db.session.execute(
+                select(User.id, User.name, User.display_name).where(User.id == assignee_id)
+            ).first()
+            if target is None:
+                raise ValueError("assignedToId must be an existing user")
+        values["assigned_to_id"] = assignee_id
+    elif action == "setDueDate":
+        if "dueDate" not in data:
+            raise ValueError("dueDate required (null to clear)")
+        try:
+            values["due_date"] = date.fromisoformat(data["dueDate"]) if data["dueDate"] else None
+        except (TypeError, ValueError):
+            raise ValueError("dueDate must be YYYY-MM-DD")
+    elif action == "move":
+        target = db.session.execute(
+            select(TodoList.id, TodoList.household_id, TodoList.user_id).where(TodoList.id == data.get("toListId"))
+        ).first()
+        if target is None:
+            raise ValueError("toListId must be an existing list")
+        if target.id == todo_list.id:
+            raise ValueError("toListId must be a different list")
+        same_owner = target.household_id == todo_list.household_id and (
+            todo_list.household_id is not None or target.user_id == todo_list.user_id
+        )
+        if not same_owner:
+            raise ValueError("Todos can only move to a list of the same household")
+
+    rows = _matched_todos(todo_list.id, ids)
+    matched = [r.id for r in rows]
+    if not matched:
+        return results(ids, ())
+
+    where = (_todos.c.list_id == todo_list.id, _todos.c.id.in_(matched))
+    if action == "delete":
+        db.session.execute(delete(_todos).where(*where))
+    elif action == "move":
+        # Appended to the target in their current order: one UPDATE ... FROM
+        dest = _todos.alias()
+        base = (
+            select(func.coalesce(func.max(dest.c.sort_index), 0))
+            .where(dest.c.list_id == target.id)
+            .scalar_subquery()
+        )
+        ranked = (
+            select(
+                _todos.c.id,
+                (base + func.row_number().over(order_by=(_todos.c.sort_index, _todos.c.id)) * SORT_GAP).label("key"),
+            )
+            .where(*where)
+            .subquery()
+        )
+        db.session.execute(
+            update(_todos).where(_todos.c.id == ranked.c.id).values(list_id=target.id, sort_index=ranked.c.key)
+        )
+    else:
+        db.session.execute(update(_todos).where(*where).values(**values))
+
+    household_id = todo_list.household_id
+    record_changes(
+        db.session,
+        [(household_id, Todo, i, action == "delete") for i in matched] if household_id else (),
+        todo_list_ids={todo_list.id} | ({target.id} if action == "move" else set()),
+    )
+    for obj in list(db.session.identity_map.values()):
+        if isinstance(obj, Todo) and obj.id in matched:
+            if action == "delete":
+                db.session.expunge(obj)
+            else:
+                db.session.expire(obj)
+
+    if action == "complete":
+        _task_activity(ActivityType.TASK_COMPLETED, ActivityType.TASK_BULK_COMPLETED, todo_list, rows)
+    elif action == "reopen":
+        _task_activity(ActivityType.TASK_REOPENED, ActivityType.TASK_REOPENED, todo_list, rows)
+    elif action == "assign" and target is not None:
+        _task_activity(
+            ActivityType.TASK_ASSIGNED, ActivityType.TASK_ASSIGNED, todo_list, rows,
+            target_type="user", target_id=target.id, target_title=target.display_name or target.name,
+        )
+    elif action == "assign":
+        _task_activity(ActivityType.TASK_UNASSIGNED, ActivityType.TASK_UNASSIGNED, todo_list, rows)
+    elif action == "setDueDate":
+        type_ = ActivityType.TASK_DUE_DATE_SET if values["due_date"] else ActivityType.TASK_DUE_DATE_CLEARED
+        _task_activity(type_, type_, todo_list, rows)
+    return results(ids, set(matched))
+
+
+# --------------------------------------------------------------------------- #
+#  Shopping items
+# --------------------------------------------------------------------------- #
+ITEM_FIELDS = {"purchased": "purchased", "quantity": "quantity", "categoryId": "category_id", "name": "name"}
+
+
+def _item_values(patch: dict) -> dict:
+    """Column values for one item patch; raises ValueError for bad fields."""
+    unknown = patch.keys() - ITEM_FIELDS.keys() - {"id"}
+    if unknown:
+        raise ValueError(f"Unsupported item fields: {', '.join(sorted(unknown))}")
+    values = {}
+    if "purchased" in patch:
+        if not isinstance(patch["purchased"], bool):
+            raise ValueError("purchased must be a boolean")
+        values["purchased"] = patch["purchased"]
+    if "quantity" in patch:
+        quantity = patch["quantity"]
+        if not isinstance(quantity, int) or isinstance(quantity, bool) or quantity < 1:
+            raise ValueError("Quantity must be a positive integer")
+        values["quantity"] = quantity
+    if "name" in patch:
+        name = patch["name"]
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("Name must be a non-empty string")
+        values["name"] = name.strip()
+    if "categoryId" in patch:
+        category_id = patch["categoryId"]
+        if category_id is not None and (not isinstance(category_id, int) or isinstance(category_id, bool)):
+            raise ValueError("categoryId must be an integer or null")
+        values["category_id"] = category_id
+    return values
+
+
+def _parse_patches(value) -> dict:
+    """{item id: column values}; later patches of the same item win field by field."""
+    if not isinstance(value, list):
+        raise ValueError("patches must be an array")
+    if len(value) > MAX_BULK_IDS:
+        raise ValueError(f"At most {MAX_BULK_IDS} patches per request")
+    patches = {}
+    for patch in value:
+        if not isinstance(patch, dict):
+            raise ValueError("Each patch must be an object")
+        item_id = patch.get("id")
+        if not isinstance(item_id, int) or isinstance(item_id, bool):
+            raise ValueError("Each patch needs an integer id")
+        patches.setdefault(item_id, {}).update(_item_values(patch))
+    return patches
+
+
+def _item_activity(type_, shopping_list, items):
+    """One feed row for `items`, (id, name) pairs."""
+    last_id, last_name = items[-1]
+    record_activity(
+        type_, shopping_list.household_id,
+        item_count=len(items),
+        object_type="item", object_id=last_id, object_title=last_name,
+        target_type="list", target_id=shopping_list.id, target_title=shopping_list.title,
+    )
+
+
+def _clear_purchased(shopping_list) -> list:
+    """Delete the list's purchased items in one statement; (id, name) of each."""
+    stmt = delete(_items).where(_items.c.list_id == shopping_list.id, _items.c.purchased.is_(True))
+    if db.session.get_bind().dialect.delete_returning:
+        return db.session.execute(stmt.returning(_items.c.id, _items.c.name)).all()
+    rows = db.session.execute(
+        select(_items.c.id, _items.c.name).where(_items.c.list_id == shopping_list.id, _items.c.purchased.is_(True))
+    ).all()
+    if rows:
+        db.session.execute(delete(_items).where(_items.c.id.in_([r.id for r in rows])))
+    return rows
+
+
+def bulk_shopping_items(shopping_list: ShoppingList, data: dict) -> dict:
+    """
+    Apply `data["patches"]` ([{"id", "purchased"?, "quantity"?, "categoryId"?,
+    "name"?}]) to items of `shopping_list`, then, with `clearPurchased`,
+    delete every purchased item of the list.
+    """
+    patches = _parse_patches(data.get("patches", []))
+    clear = data.get("clearPurchased", False)
+    if not isinstance(clear, bool):
+        raise ValueError("clearPurchased must be a boolean")
+    if not patches and not clear:
+        raise ValueError("patches (non-empty array) or clearPurchased required")
+
+    category_ids = {v["category_id"] for v in patches.values() if v.get("category_id") is not None}
+    if category_ids:
+        found = set(db.session.execute(
+            select(ShoppingCategory.id)
+            .where(ShoppingCategory.list_id == shopping_list.id, ShoppingCategory.id.in_(category_ids))
+        ).scalars())
+        if category_ids - found:
+            raise ValueError("Category not found in this shopping list")
+
+    rows = db.session.execute(
+        select(_items.c.id, _items.c.name, _items.c.purchased)
+        .where(_items.c.list_id == shopping_list.id, _items.c.id.in_(list(patches)))
+        .order_by(_items.c.id)
+    ).all() if patches else []
+    matched = {r.id: r for r in rows}
+
+    # One executemany per combination of patched fields
+    shapes = {}
+    for item_id, values in patches.items():
+        if item_id in matched and values:
+            shapes.setdefault(tuple(sorted(values)), []).append({"item_id": item_id, **values})
+    for columns, params in shapes.items():
+        db.session.execute(
+            update(_items)
+            .where(_items.c.id == bindparam("item_id"), _items.c.list_id == shopping_list.id)
+            .values({c: bindparam(c) for c in columns}),
+            params,
+        )
+
+    cleared = _clear_purchased(shopping_list) if clear else []
+    cleared_ids = {r.id for r in cleared}
+
+    household_id = shopping_list.household_id
+    changed = [i for i in matched if i not in cleared_ids]
+    if household_id and (changed or cleared):
+        record_changes(
+            db.session,
+            [(household_id, ShoppingItem, i, False) for i in changed]
+            + [(household_id, ShoppingItem, i, True) for i in cleared_ids],
+        )
+    for obj in list(db.session.identity_map.values()):
+        if isinstance(obj, ShoppingItem) and (obj.id in matched or obj.id in cleared_ids):
+            if obj.id in cleared_ids:
+                db.session.expunge(obj)
+            else:
+                db.session.expire(obj)
+
+    names = [(r.id, patches[r.id].get("name", r.name)) for r in rows]
+    checked = [n for n, r in zip(names, rows) if patches[r.id].get("purchased") and not r.purchased]
+    updated = [n for n, r in zip(names, rows) if {"quantity", "name"} & patches[r.id].keys()]
+    if checked:
+        _item_activity(ActivityType.SHOP_ITEM_CHECKED, shopping_list, checked)
+    if updated:
+        _item_activity(ActivityType.SHOP_ITEM_UPDATED, shopping_list, updated)
+    if cleared:
+        _item_activity(ActivityType.SHOP_LIST_CLEARED, shopping_list, [tuple(r) for r in cleared])
+
+    payload = results(list(patches), matched.keys())
+    payload["cleared"] = sorted(cleared_ids)
+    return payload
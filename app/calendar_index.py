@@ -0,0 +1,63 @@
+from sqlalchemy import or_, select, union_all
+
+from app.extensions import db
+from app.models import Event
+from app.models.event import SPAN_BUCKETS, RECURRING_SPAN_BUCKET
+from app.recurrence import as_utc, occurrences
+from app.serializers import encode_event, encode_occurrence
+
+
+def window_select(columns, household_id: int, start, end):
+    """
+    Select `columns` of the household's events overlapping [start, end),
+    ordered by start.
+
+    One branch per span bucket, each a bounded range on
+    ix_events_household_id_span_bucket_start_utc, so the rows read depend
+    on how busy the window is, not on how much history the household has.
+    Only the last (unbounded) bucket reaches back to the oldest event, and
+    it only holds multi-year or unscheduled events.
+
+    Recurring series come back as one row each (first occurrence), and only
+    if the series has started and not yet ended by the window; expanding
+    them is up to the caller (see events_in_window).
+    """
+    branches = []
+    for bucket, span in enumerate(SPAN_BUCKETS):
+        criteria = [
+            Event.household_id == household_id,
+            Event.span_bucket == bucket,
+            Event.start_utc < end,
+            Event.end_utc > start,
+        ]
+        if span is not None:
+            # No event in this bucket lasts longer than `span`
+            criteria.append(Event.start_utc > start - span)
+        branches.append(select(*columns).where(*criteria))
+
+    branches.append(select(*columns).where(
+        Event.household_id == household_id,
+        Event.span_bucket == RECURRING_SPAN_BUCKET,
+        Event.start_utc < end,
+        or_(Event.series_end_utc.is_(None), Event.series_end_utc > start),
+    ))
+
+    window = union_all(*branches).subquery()
+    return select(window).order_by(window.c.start_utc, window.c.id)
+
+
+def events_in_window(household_id: int, start, end) -> list[dict]:
+    """
+    Encoded events overlapping [start, end), ordered by start, with each
+    recurring series expanded to its occurrences inside the window.
+    """
+    rows = db.session.execute(window_select(encode_event.columns, household_id, start, end)).all()
+    keyed = []
+    for row in rows:
+        if row.rrule is None:
+            keyed.append((as_utc(row.start_utc), row.id, encode_event(row)))
+            continue
+        for occ_start, occ_end in occurrences(row, start, end):
+            keyed.append((occ_start, row.id, encode_occurrence(row, occ_start, occ_end)))
+    keyed.sort(key=lambda k: k[:2])
+    return [payload for _, _, payload in keyed]
@@ -0,0 +1,323 @@
+"""
+Per-household change tracking: version counters and the delta-sync log.
+
+    households.version   bumped by every flush that touches something shown
+                         under a household: lists, todos, shopping
+                         lists/categories/items, events, announcements,
+                         members, todo list member links
+    todo_lists.version   bumped by changes to the list itself, its todos or
+                         its member links (covers personal lists, which have
+                         no household); updated_at is left alone
+    household_changes    one row per synced object a flush touched, stamped
+                         with the household's new version as `seq`
+
+The counters back the ETags in app.etags. The log backs
+GET /api/households/<id>/changes?since=<seq>. Bumping households.version
+is an UPDATE, so concurrent writers to one household queue on that row
+and seqs commit in order. A client holding seq N therefore never misses
+a change that commits later with a lower number.
+
+Everything happens in an after_flush hook, inside the transaction of the
+change. Core bulk writes bypass the ORM, so they call record_changes()
+themselves. The hook also leaves a compact notice per household in
+session.info for app.live to publish after commit.
+"""
+from collections import defaultdict
+from itertools import chain
+
+from sqlalchemy import event, func, insert, inspect, literal, select, union_all, update
+
+from app.extensions import db
+from app.models import (
+    Announcement, Event, Household, HouseholdChange, Mood, ShoppingCategory, ShoppingItem,
+    ShoppingList, Todo, TodoList, TodoListMember, User,
+)
+from app.serializers import (
+    fetch_rows, todo_lists_payload, shopping_items_payload, encode_todo_list, encode_todo,
+    encode_shopping_list, encode_shopping_category, encode_shopping_item, encode_event,
+    encode_announcement,
+)
+
+CHANGES_PAGE_SIZE = 500
+PENDING_NOTICES = "pending_notices"
+
+# Synced entities, by the key they come back under from /changes
+SYNCED = {
+    TodoList: "todoLists",
+    Todo: "todos",
+    ShoppingList: "shoppingLists",
+    ShoppingCategory: "shoppingCategories",
+    ShoppingItem: "shoppingItems",
+    Event: "events",
+    Announcement: "announcements",
+}
+# ... and the ones that reach their household through a list
+_PARENT_LIST = {Todo: TodoList, ShoppingCategory: ShoppingList, ShoppingItem: ShoppingList}
+
+_households = Household.__table__
+_todo_lists = TodoList.__table__
+
+
+def _split(obj, attr) -> tuple[set, set]:
+    """(current, previous) non-null values of `attr` as of this flush."""
+    history = inspect(obj).attrs[attr].history
+    current = {v for v in chain(history.added, history.unchanged) if v is not None}
+    previous = {v for v in history.deleted if v is not None} - current
+    return current, previous
+
+
+def _list_households(session, keys, known) -> dict:
+    """(list model, list id) -> household_id; one SELECT for the ids not in `known`."""
+    owners = dict(known)
+    missing = defaultdict(set)
+    for model, list_id in keys - owners.keys():
+        missing[model].add(list_id)
+    if missing:
+        stmt = union_all(*(
+            select(literal(model.__tablename__), model.id, model.household_id).where(model.id.in_(ids))
+            for model, ids in missing.items()
+        ))
+        by_table = {model.__tablename__: model for model in missing}
+        for table, list_id, household_id in session.execute(stmt):
+            owners[(by_table[table], list_id)] = household_id
+    return owners
+
+
+def record_changes(session, changes=(), household_ids=(), todo_list_ids=()):
+    """
+    Bump counters and log synced changes.
+
+    changes        (household_id, model, object id, deleted) tuples
+    household_ids  households whose version must move even without a log row
+    todo_list_ids  todo lists whose own version must move
+
+    Returns {household_id: new version}.
+    """
+    todo_list_ids = set(todo_list_ids)
+    if todo_list_ids:
+        session.execute(
+            update(_todo_lists)
+            .where(_todo_lists.c.id.in_(todo_list_ids))
+            # keep updated_at: a version bump is not an edit of the list itself
+            .values(version=_todo_lists.c.version + 1, updated_at=_todo_lists.c.updated_at)
+        )
+
+    household_ids = set(household_ids) | {hid for hid, *_ in changes}
+    if not household_ids:
+        return {}
+    bump = (
+        update(_households)
+        .where(_households.c.id.in_(household_ids))
+        .values(version=_households.c.version + 1)
+    )
+    if session.get_bind().dialect.update_returning:
+        versions = dict(session.execute(bump.returning(_households.c.id, _households.c.version)).all())
+    else:
+        session.execute(bump)
+        versions = dict(session.execute(
+            select(_households.c.id, _households.c.version).where(_households.c.id.in_(household_ids))
+        ).all())
+
+    rows = {}
+    for household_id, model, object_id, deleted in changes:
+        if household_id in versions:
+            # last word wins if an object shows up twice in one flush
+            rows[(household_id, model, object_id)] = {
+                "household_id": household_id,
+                "seq": versions[household_id],
+                "entity": model.__tablename__,
+                "entity_id": object_id,
+                "deleted": deleted,
+            }
+    if rows:
+        session.execute(insert(HouseholdChange), list(rows.values()))
+    _queue_notices(session, changes, versions)
+    return versions
+
+
+def _queue_notices(session, changes, versions, mood_households=()):
+    """
+    Compact per-household summaries of this flush for app.live, which
+    publishes them once the transaction commits:
+    {"seq": 42, "changed": {"todos": [5]}, "deleted": {"todos": [3]}}
+    """
+    notices = {}
+    for household_id, model, object_id, deleted in changes:
+        if household_id in versions:
+            notice = notices.setdefault(household_id, {"seq": versions[household_id]})
+            ids = notice.setdefault("deleted" if deleted else "changed", {}).setdefault(SYNCED[model], [])
+            if object_id not in ids:
+                ids.append(object_id)
+    for household_id, user_id in mood_households:
+        # no seq unless this flush also moved the household's version
+        notice = notices.setdefault(household_id, {"seq": versions[household_id]} if household_id in versions else {})
+        notice.setdefault("changed", {}).setdefault("moods", []).append(user_id)
+    if notices:
+        session.info.setdefault(PENDING_NOTICES, []).extend(notices.items())
+
+
+@event.listens_for(db.session, "after_flush")
+def _record_flush(session, flush_context):
+    deleted = set(session.deleted)
+    touched = chain(session.new, (obj for obj in session.dirty if session.is_modified(obj)), deleted)
+
+    household_ids, todo_list_ids, mood_user_ids, member_list_ids = set(), set(), set(), set()
+    direct = []          # (obj, current households, previous households)
+    via_list = []        # (obj, parent model, current list ids, previous list ids)
+    known_lists = {}     # (list model, id) -> household, from lists in this flush
+    for obj in touched:
+        model = type(obj)
+        if model is Household:
+            household_ids.add(obj.id)
+        elif model is User:
+            household_ids |= set().union(*_split(obj, "household_id"))
+        elif model is TodoListMember:
+            member_list_ids |= set().union(*_split(obj, "todo_list_id"))
+        elif model is Mood:
+            mood_user_ids.add(obj.user_id)
+        elif model in _PARENT_LIST:
+            current, previous = _split(obj, "list_id")
+            via_list.append((obj, _PARENT_LIST[model], current, previous))
+            if model is Todo:
+                todo_list_ids |= current | previous
+        elif model in SYNCED:
+            current, previous = _split(obj, "household_id")
+            direct.append((obj, current, previous))
+            if model is TodoList:
+                todo_list_ids.add(obj.id)
+            if model in (TodoList, ShoppingList):
+                # known even if the list is deleted by this flush
+                known_lists[(model, obj.id)] = next(iter(current or previous), None)
+
+    todo_list_ids |= member_list_ids
+    list_keys = {(parent, list_id) for _, parent, current, previous in via_list for list_id in current | previous}
+    list_keys |= {(TodoList, list_id) for list_id in member_list_ids}
+    owners = _list_households(session, list_keys, known_lists) if list_keys else {}
+
+    changes = []
+    for obj, current, previous in direct:
+        gone = obj in deleted
+        changes += [(hid, type(obj), obj.id, gone) for hid in current]
+        changes += [(hid, type(obj), obj.id, True) for hid in previous]  # moved out
+    for obj, parent, current, previous in via_list:
+        gone = obj in deleted
+        now = {owners.get((parent, list_id)) for list_id in current} - {None}
+        before = {owners.get((parent, list_id)) for list_id in previous} - {None} - now
+        changes += [(hid, type(obj), obj.id, gone) for hid in now]
+        changes += [(hid, type(obj), obj.id, True) for hid in before]
+        household_ids |= now | before
+    # Member links change a list's memberIds, so sync the list itself
+    for list_id in member_list_ids:
+        household_id = owners.get((TodoList, list_id))
+        if household_id is not None and (TodoList, list_id) not in known_lists:
+            changes.append((household_id, TodoList, list_id, False))
+    versions = record_changes(session, changes, household_ids, todo_list_ids)
+
+    # Moods are not synced or versioned, only announced to the household
+    mood_households = session.execute(
+        select(User.household_id, User.id).where(User.id.in_(mood_user_ids), User.household_id.isnot(None))
+    ).all() if mood_user_ids else []
+    _queue_notices(session, (), versions, mood_households)
+
+
+# --------------------------------------------------------------------------- #
+#  Reading
+# --------------------------------------------------------------------------- #
+_ENCODERS = {
+    TodoList: encode_todo_list,
+    Todo: encode_todo,
+    ShoppingList: encode_shopping_list,
+    ShoppingCategory: encode_shopping_category,
+    ShoppingItem: encode_shopping_item,
+    Event: encode_event,
+    Announcement: encode_announcement,
+}
+_BY_TABLE = {model.__tablename__: model for model in SYNCED}
+
+
+def _in_household(model, household_id):
+    """Criterion: the object is shown under this household (directly or through its list)."""
+    parent = _PARENT_LIST.get(model)
+    if parent is None:
+        return model.household_id == household_id
+    return model.list_id.in_(select(parent.id).where(parent.household_id == household_id))
+
+
+def _current_payloads(model, ids, household_id) -> list[dict]:
+    """
+    Current state of the given objects, in the same shapes the list
+    endpoints use. Only objects in the household come back; the caller
+    reports the rest as deleted.
+    """
+    encoder = _ENCODERS[model]
+    rows = fetch_rows(encoder, model.id.in_(ids), _in_household(model, household_id), order_by=model.id)
+    if model is TodoList:
+        return todo_lists_payload(rows, include_todos=False)
+    if model is ShoppingItem:
+        return shopping_items_payload(rows)
+    return [encoder(r) for r in rows]
+
+
+def changes_since(household_id: int, since: int | None, limit: int = CHANGES_PAGE_SIZE) -> dict | None:
+    """
+    Everything synced that changed in a household after seq `since`, as
+    {"cursor", "hasMore", <entity key>: [payloads], "deleted": {<entity key>: [ids]}}.
+    Each object appears once, in its current state or as a tombstone.
+
+    One log read on (household_id, seq) plus one read per entity type that
+    changed, so the cost follows the size of the change. Pages end on a
+    whole flush; `cursor` is the seq to pass as `since` next time. With
+    since=None only the current cursor comes back: fetch it before a full
+    load and changes made during the load are replayed on the next sync.
+    Returns None if the household does not exist.
+    """
+    version = db.session.execute(
+        select(Household.version).where(Household.id == household_id)
+    ).scalar()
+    if version is None:
+        return None
+    payload = {"cursor": str(version), "hasMore": False, "deleted": {}}
+    if since is None or since >= version:
+        return payload
+
+    window = [
+        HouseholdChange.household_id == household_id,
+        HouseholdChange.seq > since,
+        HouseholdChange.seq <= version,
+    ]
+    # seq of the limit-th entry; everything up to and including its flush
+    upper = (
+        select(HouseholdChange.seq).where(*window)
+        .order_by(HouseholdChange.seq).offset(limit - 1).limit(1)
+        .scalar_subquery()
+    )
+    log = db.session.execute(
+        select(HouseholdChange.seq, HouseholdChange.entity, HouseholdChange.entity_id, HouseholdChange.deleted)
+        .where(*window, HouseholdChange.seq <= func.coalesce(upper, version))
+        .order_by(HouseholdChange.seq, HouseholdChange.id)
+    ).all()
+
+    latest = {}
+    for _, entity, entity_id, deleted in log:
+        latest[(entity, entity_id)] = deleted  # later entries win
+
+    upserts, tombstones = defaultdict(set), defaultdict(set)
+    for (entity, entity_id), deleted in latest.items():
+        model = _BY_TABLE.get(entity)
+        if model is not None:
+            (tombstones if deleted else upserts)[model].add(entity_id)
+
+    for model, ids in upserts.items():
+        found = _current_payloads(model, ids, household_id)
+        payload[SYNCED[model]] = found
+        # gone since (e.g. deleted by a Core statement) or not in this
+        # household (moved out): report it deleted
+        tombstones[model] |= ids - {p["id"] for p in found}
+    for model, ids in tombstones.items():
+        if ids:
+            payload["deleted"][SYNCED[model]] = sorted(ids)
+
+    last_seq = log[-1].seq if log else version
+    if len(log) >= limit and last_seq < version:
+        payload.update(cursor=str(last_seq), hasMore=True)
+    return payload
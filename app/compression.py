@@ -0,0 +1,208 @@
+"""
+Response compression negotiated from Accept-Encoding.
+
+An after_request hook compresses compressible responses (JSON, text, JS,
+SVG, ...) of at least COMPRESS_MIN_SIZE bytes with the best encoding both
+sides support: zstd and brotli when their optional packages are installed,
+gzip always. Ties in the client's q-values go to the cheapest encoder for
+dynamic payloads, in ENCODINGS order.
+
+Skipped: responses that already have a Content-Encoding (the precompressed
+SPA assets), file passthroughs, HEAD, 204/206/304, and Cache-Control:
+no-transform. Streamed bodies (SSE) are compressed chunk by chunk with a
+sync flush after each, so every event still reaches the client as soon as
+it is written.
+
+A compressed body is a different representation, so a strong ETag is
+weakened (W/"..."). app.etags matches If-None-Match weakly, so 304s keep
+working.
+
+Per-endpoint byte counts are kept in-process; see compression_stats().
+"""
+import re
+import threading
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional: no br without it
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: no zstd without it
+    zstandard = None
+
+COMPRESS_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+COMPRESSIBLE = re.compile(
+    r"^(text/|application/(javascript|json|xml|manifest\+json|wasm)|image/svg\+xml)"
+)
+_SKIP_STATUS = {204, 206, 304}
+
+
+# --------------------------------------------------------------------------- #
+#  Encoders
+# --------------------------------------------------------------------------- #
+class _GzipStream:
+    def __init__(self):
+        self._z = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._z.compress(data) + self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._z.flush()
+
+
+class _BrotliStream:
+    def __init__(self):
+        self._c = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._c.process(data) + self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+class _ZstdStream:
+    def __init__(self):
+        self._c = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._c.compress(data) + self._c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+
+def _gzip(data: bytes) -> bytes:
+    z = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return z.compress(data) + z.flush()
+
+
+# encoding -> (one-shot compress, streaming encoder), in server preference order
+ENCODINGS = {}
+if zstandard is not None:
+    ENCODINGS["zstd"] = (lambda data: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data), _ZstdStream)
+if brotli is not None:
+    ENCODINGS["br"] = (lambda data: brotli.compress(data, quality=BROTLI_QUALITY), _BrotliStream)
+ENCODINGS["gzip"] = (_gzip, _GzipStream)
+
+
+def negotiate(accept_encodings) -> str | None:
+    """The supported encoding the client rates highest (ties: ENCODINGS order)."""
+    best, best_q = None, 0
+    for encoding in ENCODINGS:
+        q = accept_encodings[encoding]
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+# --------------------------------------------------------------------------- #
+#  Metrics
+# --------------------------------------------------------------------------- #
+_stats: dict[str, list[int]] = {}    # endpoint -> [responses, bytes in, bytes out]
+_stats_lock = threading.Lock()
+
+
+def _record(endpoint, bytes_in, bytes_out):
+    with _stats_lock:
+        entry = _stats.setdefault(endpoint or "<unknown>", [0, 0, 0])
+        entry[0] += 1
+        entry[1] += bytes_in
+        entry[2] += bytes_out
+
+
+def compression_stats() -> dict:
+    """{endpoint: {"responses", "bytesIn", "bytesOut", "bytesSaved"}} for this process."""
+    with _stats_lock:
+        return {
+            endpoint: {
+                "responses": n, "bytesIn": bytes_in, "bytesOut": bytes_out,
+                "bytesSaved": bytes_in - bytes_out,
+            }
+            for endpoint, (n, bytes_in, bytes_out) in sorted(_stats.items())
+        }
+
+
+# --------------------------------------------------------------------------- #
+#  Hook
+# --------------------------------------------------------------------------- #
+def _compress_stream(response, encoding, endpoint):
+    original = response.response
+    chunks = response.iter_encoded()  # bound to the original body before it is replaced
+    encoder = ENCODINGS[encoding][1]()
+    counts = [0, 0]
+
+    def body():
+        try:
+            for data in chunks:
+                if data:
+                    out = encoder.chunk(data)
+                    counts[0] += len(data)
+                    counts[1] += len(out)
+                    yield out
+            out = encoder.finish()
+            counts[1] += len(out)
+            yield out
+        finally:
+            close = getattr(original, "close", None)
+            if close is not None:
+                close()
+            _record(endpoint, *counts)
+
+    response.response = body()
+    response.headers.pop("Content-Length", None)
+
+
+def compress_response(response, min_size: int = COMPRESS_MIN_SIZE):
+    if (
+        request.method == "HEAD"
+        or response.status_code < 200
+        or response.status_code in _SKIP_STATUS
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or not COMPRESSIBLE.match(response.mimetype or "")
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if response.cache_control.no_transform:
+        return response
+    encoding = negotiate(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        _compress_stream(response, encoding, request.endpoint)
+    else:
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+        compressed = ENCODINGS[encoding][0](data)
+        if len(compressed) >= len(data):
+            return response
+        response.set_data(compressed)
+        _record(request.endpoint, len(data), len(compressed))
+
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    min_size = app.config.get("COMPRESS_MIN_SIZE", COMPRESS_MIN_SIZE)
+
+    @app.after_request
+    def _compress(response):
+        return compress_response(response, min_size)
@@ -11,6 +11,33 @@ class Config:
     SQLALCHEMY_ECHO = True
     FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:3000")
     BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:5000")
+    # Bake the feed sentence into each activity row when it is written
+    ACTIVITY_STORE_RENDERED_TEXT = True
+    # Same actor + same list within this many seconds -> one coalesced feed row (0 disables)
+    ACTIVITY_COALESCE_WINDOW = 10 * 60
+    # Pub/sub for /api/households/<id>/stream; unset = in-process (single worker)
+    BROKER_URL = os.environ.get("BROKER_URL")
+    # Import the route modules on the first request instead of at startup
+    # (faster CLI commands and migrations; `flask routes` then lists only the
+    # SPA routes, so run it with LAZY_BLUEPRINTS=0)
+    LAZY_BLUEPRINTS = os.environ.get("LAZY_BLUEPRINTS", "1") == "1"
+    # Responses smaller than this go out uncompressed
+    COMPRESS_MIN_SIZE = 1024
+    # Threads building resized profile/banner images (0: inline, in the request)
+    IMAGE_WORKERS = int(os.environ.get("IMAGE_WORKERS", "2"))
+    # Per-request SQL statement budgets by endpoint ("<blueprint>.<view>": n),
+    # QUERY_BUDGET_DEFAULT for the rest (None: unlimited). Over budget, "log"
+    # warns after the request; "fail" refuses the statement that goes over.
+    # The household snapshot guards its own block (SNAPSHOT_STATEMENT_BUDGET)
+    QUERY_BUDGETS = {}
+    QUERY_BUDGET_DEFAULT = None
+    QUERY_BUDGET_ACTION = os.environ.get("QUERY_BUDGET_ACTION", "log")
+    # The same statement this many times in one request is logged as a likely N+1
+    N_PLUS_ONE_THRESHOLD = 5
+    # Server-Timing header with each response's statement count and DB time
+    SERVER_TIMING = os.environ.get("SERVER_TIMING", "1") == "1"
+    # Serve in-process metrics under /api/metrics
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED") == "1"
     OAUTH2_PROVIDERS = {
         "google": {
             "client_id":     os.environ.get("GOOGLE_CLIENT_ID"),
@@ -0,0 +1,77 @@
+"""
+Conditional GET for the polled read endpoints.
+
+The ETag of a response is derived from the change counters kept by
+app.change_log (households.version, todo_lists.version). A view wrapped in
+@etag_from(version_of) answers If-None-Match with a 304 after one
+single-row SELECT of the counter(s), before any payload query or
+serialization runs.
+"""
+import hashlib
+from functools import wraps
+
+from flask import Response, make_response, request
+from sqlalchemy import select
+
+import app.change_log  # noqa: F401  (registers the counter hooks)
+from app.extensions import db
+from app.models import Household, TodoList
+
+# Bump when a response shape changes, so clients drop cached bodies
+REPRESENTATION_VERSION = 1
+
+# --------------------------------------------------------------------------- #
+#  Versions
+# --------------------------------------------------------------------------- #
+def household_version(household_id):
+    return db.session.execute(
+        select(Household.version).where(Household.id == household_id)
+    ).scalar()
+
+
+def todo_list_version(list_id):
+    # memberIds of all-members lists follow the household, so include it
+    row = db.session.execute(
+        select(TodoList.version, Household.version)
+        .outerjoin(Household, TodoList.household_id == Household.id)
+        .where(TodoList.id == list_id)
+    ).first()
+    return tuple(row) if row else None
+
+
+# --------------------------------------------------------------------------- #
+#  Views
+# --------------------------------------------------------------------------- #
+def make_etag(version) -> str:
+    raw = f"{REPRESENTATION_VERSION}|{request.endpoint}|{version}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:20]
+
+
+def etag_from(version_of):
+    """
+    Decorate a GET view so it is served conditionally. `version_of` gets the
+    view's arguments and returns the counter value(s) the response depends
+    on, or None to let the view run (and 404). The ETag also varies with the
+    endpoint; the query string is part of the URL the client cached under.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version = version_of(**kwargs)
+            if version is None:
+                return view(*args, **kwargs)
+
+            etag = make_etag(version)
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            # Weak: the same version may go out gzip'd or not (app.compression)
+            response.set_etag(etag, weak=True)
+            # Let browsers keep the body but revalidate on every poll
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        return wrapper
+    return decorator
@@ -17,7 +17,7 @@ naming_convention = {
 metadata      = MetaData(naming_convention=naming_convention)
 db            = SQLAlchemy(metadata=metadata)
 migrate       = Migrate()
-cors          = CORS(resources={r"/api/*": {"origins": ["http://127.0.0.1:5173", "http://localhost:5173"]}}, supports_credentials=True)
+cors          = CORS(resources={r"/api/*": {"origins": ["http://127.0.0.1:5173", "http://localhost:5173"]}}, supports_credentials=True, expose_headers=["X-Next-Cursor", "ETag"])
 login_manager = LoginManager()
 
 def configure_logging(app):
@@ -0,0 +1,189 @@
+"""
+Resized WebP/AVIF variants of profile and banner images, built off the
+request path.
+
+Originals are stored as uploaded, often multi-megabyte phone photos, and
+avatars show up in every member list. Once an upload is recorded on the
+User, schedule_variants() hands its S3 key to a small thread pool. The job:
+
+    1. downloads the original,
+    2. applies the EXIF orientation and re-encodes from the pixels alone,
+       dropping EXIF/GPS, ICC profiles and comments,
+    3. renders VARIANT_SIZES (square crops for profiles, bounded widths for
+       banners, never upscaled) in every format Pillow can write out of
+       VARIANT_FORMATS,
+    4. uploads them next to the original (<key without extension>/<size>.<format>,
+       immutable: the key names its content),
+    5. stores {"<size>": {"<format>": url}} in profile_img_variants /
+       banner_img_variants.
+
+Uploads are content-addressed (app.blobs), so a duplicate upload reuses the
+variants already built for its blob and schedules nothing (set_image).
+
+The column is only written if the image is still the user's current one, so
+a slow job cannot attach its variants to a newer upload. A failed job is
+logged, and clients keep using the original.
+
+Pillow is optional: without it nothing is scheduled.
+"""
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from sqlalchemy import select
+
+from app.blobs import swap_reference
+from app.extensions import db
+from app.models import User
+from app.s3_helpers import download_bytes, upload_bytes, public_url
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional: originals only without it
+    Image = None
+
+# <type> in /users/<id>/img/<type> -> the User column holding its URL
+IMAGE_COLUMNS = {"profile": "profile_img", "banner": "banner_img"}
+VARIANT_COLUMNS = {"profile": "profile_img_variants", "banner": "banner_img_variants"}
+
+# profile: square edge in px; banner: width in px
+VARIANT_SIZES = {"profile": (64, 128, 256), "banner": (640, 1280)}
+# format -> Pillow save options, in client preference order
+VARIANT_FORMATS = {
+    "avif": {"quality": 60},
+    "webp": {"quality": 80, "method": 4},
+}
+# Refuse to decode anything bigger (decompression bombs fit in a small PNG)
+MAX_SOURCE_PIXELS = 40_000_000
+VARIANT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+# --------------------------------------------------------------------------- #
+#  Rendering
+# --------------------------------------------------------------------------- #
+def _formats() -> list[str]:
+    """VARIANT_FORMATS this Pillow build can write (AVIF needs Pillow 11.2+ or pillow-avif-plugin)."""
+    Image.init()
+    return [fmt for fmt in VARIANT_FORMATS if fmt.upper() in Image.SAVE]
+
+
+def render_variants(data: bytes, kind: str) -> dict[int, dict[str, bytes]]:
+    """{size: {format: encoded bytes}} for an uploaded image."""
+    with Image.open(io.BytesIO(data)) as src:
+        if src.width * src.height > MAX_SOURCE_PIXELS:
+            raise ValueError(f"image is {src.width}x{src.height}, too large to process")
+        largest = max(VARIANT_SIZES[kind])
+        src.draft("RGB", (largest, largest))  # JPEG: decode at a reduced scale
+        img = ImageOps.exif_transpose(src)
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info else "RGB")
+        img.info.clear()  # nothing of the original's metadata is written back
+
+    short_edge = min(img.size) if kind == "profile" else img.width
+    sizes = [s for s in VARIANT_SIZES[kind] if s <= short_edge] or [min(VARIANT_SIZES[kind])]
+    formats = _formats()
+
+    out = {}
+    for size in sizes:
+        if kind == "profile":
+            resized = ImageOps.fit(img, (size, size), Image.Resampling.LANCZOS)
+        elif img.width > size:
+            resized = img.resize((size, max(1, round(img.height * size / img.width))), Image.Resampling.LANCZOS)
+        else:
+            resized = img
+        out[size] = {}
+        for fmt in formats:
+            buf = io.BytesIO()
+            resized.save(buf, fmt.upper(), **VARIANT_FORMATS[fmt])
+            out[size][fmt] = buf.getvalue()
+    return out
+
+
+# --------------------------------------------------------------------------- #
+#  Recording
+# --------------------------------------------------------------------------- #
+def set_image(user: User, kind: str, url: str) -> bool:
+    """
+    Point the user's profile/banner image at `url`, moving its blob
+    reference. Variants already built for the same image (same blob, any
+    user) are reused. True when variants still need schedule_variants()
+    after the commit.
+    """
+    column = getattr(User, IMAGE_COLUMNS[kind])
+    variants_column = getattr(User, VARIANT_COLUMNS[kind])
+    if getattr(user, column.key) == url:
+        return getattr(user, variants_column.key) is None
+
+    variants = db.session.scalar(
+        select(variants_column).where(column == url, variants_column.is_not(None)).limit(1)
+    )
+    swap_reference(getattr(user, column.key), url)
+    setattr(user, column.key, url)
+    setattr(user, variants_column.key, variants)
+    return variants is None
+
+
+# --------------------------------------------------------------------------- #
+#  Jobs
+# --------------------------------------------------------------------------- #
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _executor(workers: int) -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-variants")
+        return _pool
+
+
+def build_variants(user_id: int, kind: str, key: str) -> dict | None:
+    """Render, upload and record the variants of `key`; the recorded map, or None if not recorded."""
+    original = download_bytes(key)
+    if "errors" in original:
+        raise RuntimeError(original["errors"])
+
+    stem = key.rsplit(".", 1)[0]
+    variants = {}
+    for size, encoded in render_variants(original["data"], kind).items():
+        for fmt, data in encoded.items():
+            upload = upload_bytes(
+                f"{stem}/{size}.{fmt}", data, f"image/{fmt}", cache_control=VARIANT_CACHE_CONTROL
+            )
+            if "errors" in upload:
+                raise RuntimeError(upload["errors"])
+            variants.setdefault(str(size), {})[fmt] = upload["url"]
+
+    user = db.session.get(User, user_id)
+    if user is None or getattr(user, IMAGE_COLUMNS[kind]) != public_url(key):
+        return None  # replaced (or deleted) while we worked
+    setattr(user, VARIANT_COLUMNS[kind], variants)
+    db.session.commit()
+    return variants
+
+
+def _run(app, user_id, kind, key):
+    with app.app_context():
+        try:
+            build_variants(user_id, kind, key)
+        except Exception:
+            db.session.rollback()
+            app.logger.exception("Image variants failed for user %s %s image %s", user_id, kind, key)
+
+
+def schedule_variants(user_id: int, kind: str, key: str) -> bool:
+    """
+    Queue variant generation for the image just recorded on the user. Call
+    after the commit. False if Pillow is not installed.
+    IMAGE_WORKERS = 0 runs the job inline (development).
+    """
+    if Image is None:
+        return False
+    app = current_app._get_current_object()
+    workers = app.config.get("IMAGE_WORKERS", 2)
+    if workers <= 0:
+        _run(app, user_id, kind, key)
+    else:
+        _executor(workers).submit(_run, app, user_id, kind, key)
+    return True
@@ -0,0 +1,63 @@
+import re
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to Flask's stdlib provider
+    orjson = None
+
+
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+def _escape(match) -> str:
+    code = ord(match.group())
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    code -= 0x10000  # astral: a UTF-16 surrogate pair, as json.dumps writes it
+    return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+
+
+def _ensure_ascii(body: bytes) -> bytes:
+    """
+    orjson always writes UTF-8; escape it as json.dumps(ensure_ascii=True)
+    does. Non-ASCII bytes only ever occur inside JSON strings.
+    """
+    if body.isascii():
+        return body
+    return _NON_ASCII.sub(_escape, body.decode()).encode()
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Output matches DefaultJSONProvider byte for byte: sorted keys, compact
+    outside debug, 2-space indent in debug, dates as HTTP dates, non-ASCII
+    text as \\u escapes.
+    """
+
+    _base_option = (orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def _option(self, indent: bool) -> int:
+        return self._base_option | (orjson.OPT_INDENT_2 if indent else 0)
+
+    def dumps(self, obj, **kwargs) -> str:
+        return _ensure_ascii(
+            orjson.dumps(obj, default=self.default, option=self._option(bool(kwargs.get("indent"))))
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = _ensure_ascii(orjson.dumps(obj, default=self.default, option=self._option(indent))) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json_provider(app):
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
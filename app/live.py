@@ -0,0 +1,211 @@
+"""
+Live household updates over Server-Sent Events.
+
+app.change_log leaves a compact notice per household in the session for
+every flush; once the transaction commits, the notices are published to a
+broker on channel "household:<id>", and every open
+/api/households/<id>/stream connection relays them:
+
+    id: 42
+    event: change
+    data: {"seq":42,"changed":{"todos":[5]},"deleted":{"shoppingItems":[3]}}
+
+`seq` is the household's change cursor, so a client that reconnects (or
+sees a gap) catches up with /api/households/<id>/changes?since=<last seq>.
+Notices only say *what* changed; clients fetch what they care about.
+
+The broker is pluggable. LocalBroker fans out inside one process (tests,
+single-worker deployments). With BROKER_URL=redis://... every worker
+publishes to and listens on Redis pub/sub, so a change committed on one
+worker reaches streams held by the others.
+"""
+import json
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+
+from app.change_log import PENDING_NOTICES
+from app.extensions import db
+
+try:
+    import redis
+except ImportError:  # optional: only needed for BROKER_URL=redis://...
+    redis = None
+
+HEARTBEAT_SECONDS = 15
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+# --------------------------------------------------------------------------- #
+#  Brokers
+# --------------------------------------------------------------------------- #
+class Subscription(ABC):
+    @abstractmethod
+    def get(self, timeout: float) -> str | None:
+        """Next message, or None if nothing arrived within `timeout` seconds."""
+
+    @abstractmethod
+    def close(self):
+        """Stop receiving messages."""
+
+
+class Broker(ABC):
+    @abstractmethod
+    def publish(self, channel: str, message: str):
+        """Send `message` to every current subscriber of `channel`."""
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> Subscription:
+        """A new Subscription to `channel`."""
+
+
+class LocalSubscription(Subscription):
+    def __init__(self, broker, channel):
+        self._broker = broker
+        self._channel = channel
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._broker._unsubscribe(self._channel, self)
+
+
+class LocalBroker(Broker):
+    """In-process fan-out. A subscriber that falls behind is told to resync."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[LocalSubscription]] = {}
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for sub in subscribers:
+            try:
+                sub.queue.put_nowait(message)
+            except queue.Full:
+                sub.overflowed = True
+
+    def subscribe(self, channel):
+        sub = LocalSubscription(self, channel)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(sub)
+        return sub
+
+    def _unsubscribe(self, channel, sub):
+        with self._lock:
+            subs = self._subscribers.get(channel)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[channel]
+
+
+class RedisSubscription(Subscription):
+    overflowed = False
+
+    def __init__(self, client, channel):
+        self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(channel)
+
+    def get(self, timeout):
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            message = self._pubsub.get_message(timeout=remaining)
+            if message is not None:
+                data = message["data"]
+                return data.decode() if isinstance(data, bytes) else data
+        return None
+
+    def close(self):
+        self._pubsub.close()
+
+
+class RedisBroker(Broker):
+    """Redis pub/sub, shared by every worker pointed at the same server."""
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise RuntimeError("BROKER_URL is set but the redis package is not installed")
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, channel, message):
+        self._client.publish(channel, message)
+
+    def subscribe(self, channel):
+        return RedisSubscription(self._client, channel)
+
+
+def init_broker(app):
+    url = app.config.get("BROKER_URL")
+    app.extensions["broker"] = RedisBroker(url) if url else LocalBroker()
+
+
+def household_channel(household_id: int) -> str:
+    return f"household:{household_id}"
+
+
+# --------------------------------------------------------------------------- #
+#  Publishing
+# --------------------------------------------------------------------------- #
+@event.listens_for(db.session, "after_commit")
+def _publish_notices(session):
+    notices = session.info.pop(PENDING_NOTICES, None)
+    if not notices or not has_app_context():
+        return
+    broker = current_app.extensions.get("broker")
+    if broker is None:
+        return
+    for household_id, notice in notices:
+        try:
+            broker.publish(household_channel(household_id), json.dumps(notice, separators=(",", ":")))
+        except Exception:
+            # The change is committed either way; clients catch up via /changes
+            current_app.logger.exception("Publishing change notice for household %s failed", household_id)
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _drop_notices(session, previous_transaction):
+    session.info.pop(PENDING_NOTICES, None)
+
+
+# --------------------------------------------------------------------------- #
+#  Streaming
+# --------------------------------------------------------------------------- #
+def _sse(data: str, event_name: str, event_id=None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event_name}\ndata: {data}\n\n"
+
+
+def stream(subscription: Subscription, cursor: int):
+    """
+    SSE body for one client. Starts with a `hello` carrying the current
+    cursor, then relays notices, with a comment line every
+    HEARTBEAT_SECONDS so proxies keep the connection open. Touches no
+    app or database state, so it can outlive the request context.
+    """
+    try:
+        yield _sse(json.dumps({"cursor": str(cursor)}), "hello", cursor)
+        while True:
+            message = subscription.get(HEARTBEAT_SECONDS)
+            if subscription.overflowed:
+                # dropped notices: the client must catch up via /changes
+                yield _sse("{}", "resync")
+                return
+            if message is None:
+                yield ": ping\n\n"
+                continue
+            seq = json.loads(message).get("seq")
+            yield _sse(message, "change", seq)
+    finally:
+        subscription.close()
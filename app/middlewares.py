@@ -1,16 +1,40 @@
-from flask import request, redirect
+from flask import current_app, request, redirect, session
 from flask_wtf.csrf import generate_csrf
 import os
 
+CSRF_COOKIE = "csrf_token"
+
+
+def _needs_csrf_cookie(response) -> bool:
+    """
+    Issue a token for HTML entry documents, or when the client has none:
+    no cookie (never set, or expired) or no raw token in the session.
+    Everything else (304s, static assets, JSON reads) keeps the token it
+    already holds and skips the signing.
+    """
+    if response.status_code == 304:
+        return False
+    if response.mimetype == "text/html":
+        return True
+    if not request.path.startswith("/api/"):
+        return False  # static assets
+    field = current_app.config.get("WTF_CSRF_FIELD_NAME", "csrf_token")
+    return CSRF_COOKIE not in request.cookies or field not in session
+
+
 def register_middlewares(app):
     @app.after_request
     def inject_csrf_cookie(response):
+        if not _needs_csrf_cookie(response):
+            return response
         secure = os.getenv("FLASK_ENV") == "production"
         response.set_cookie(
-            "csrf_token",
+            CSRF_COOKIE,
             generate_csrf(),
+            # expire with the signed token, so a stale cookie gets replaced
+            max_age=current_app.config.get("WTF_CSRF_TIME_LIMIT", 3600),
             secure=secure,
             samesite="Strict" if secure else None,
             httponly=True,
         )
-        return response
\ No newline at end of file
+        return response
@@ -10,4 +10,7 @@ from .todo_list_member import TodoListMember
 from .announcement import Announcement
 from .event import Event
 from .checkin import Checkin
-from .mood import Mood
\ No newline at end of file
+from .mood import Mood
+from .activity import Activity, ActivityType, render_many
+from .household_change import HouseholdChange
+from .blob import Blob
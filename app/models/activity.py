@@ -1,3 +1,5 @@
+from enum import Enum
+from sqlalchemy import Enum as SAEnum, Index, func
 from app.extensions import db 
 
 class ActivityType(str, Enum):
@@ -58,6 +60,78 @@ class ActivityType(str, Enum):
     REMINDER_CREATED = "REMINDER_CREATED" # Sara set a reminder: "Water plants"
     CHORE_ASSIGNED = "CHORE_ASSIGNED" # Sara assigned "Trash" to Sara
 
+# Feed sentence per type. Placeholders: {actor}, {object}, {target}, {when}.
+ACTIVITY_TEMPLATES = {
+    ActivityType.TASK_CREATED: '{actor} added a task to "{target}": "{object}"',
+    ActivityType.TASK_COMPLETED: '{actor} completed task: "{object}"',
+    ActivityType.TASK_REOPENED: '{actor} reopened task: "{object}"',
+    ActivityType.TASK_ASSIGNED: '{actor} assigned "{object}" to {target}',
+    ActivityType.TASK_UNASSIGNED: '{actor} unassigned "{object}"',
+    ActivityType.TASK_DUE_DATE_SET: '{actor} set due date for "{object}"',
+    ActivityType.TASK_DUE_DATE_CHANGED: '{actor} moved due date for "{object}"',
+    ActivityType.TASK_DUE_DATE_CLEARED: '{actor} cleared due date for "{object}"',
+    ActivityType.TASK_REORDERED: '{actor} reordered tasks in "{target}"',
+    ActivityType.TASK_BULK_COMPLETED: '{actor} completed tasks in "{target}"',
+    ActivityType.LIST_CREATED: '{actor} created list: "{object}"',
+    ActivityType.LIST_RENAMED: '{actor} renamed list "{target}" to "{object}"',
+    ActivityType.LIST_ARCHIVED: '{actor} archived list: "{object}"',
+    ActivityType.LIST_UNARCHIVED: '{actor} unarchived list: "{object}"',
+    ActivityType.SUBTASK_ADDED: '{actor} added a subtask to "{target}": "{object}"',
+    ActivityType.SUBTASK_COMPLETED: '{actor} completed subtask: "{object}"',
+    ActivityType.EVENT_SCHEDULED: '{actor} scheduled an event for {when}: "{object}"',
+    ActivityType.EVENT_UPDATED: '{actor} updated event "{object}"',
+    ActivityType.EVENT_RESCHEDULED: '{actor} moved "{object}" to {when}',
+    ActivityType.EVENT_CANCELLED: '{actor} canceled "{object}"',
+    ActivityType.ANNOUNCEMENT_CREATED: '{actor} created an announcement',
+    ActivityType.ANNOUNCEMENT_PINNED: '{actor} pinned an announcement',
+    ActivityType.CHECKIN: '{actor} checked in',
+    ActivityType.CHECKIN_MISSED: "{actor} missed yesterday's check-in",
+    ActivityType.HABIT_CREATED: '{actor} created new habit: "{object}"',
+    ActivityType.HABIT_MARKED: '{actor} marked habit "{object}"',
+    ActivityType.HABIT_STREAK_STARTED: '{actor} started a streak on "{object}"',
+    ActivityType.HABIT_STREAK_BROKEN: '{actor} broke their "{object}" streak',
+    ActivityType.GOAL_CREATED: '{actor} created goal: "{object}"',
+    ActivityType.GOAL_PROGRESS_UPDATED: '{actor} updated progress on "{object}"',
+    ActivityType.GOAL_COMPLETED: '{actor} completed goal "{object}"',
+    ActivityType.SHOP_ITEM_ADDED: '{actor} added item to {target}: "{object}"',
+    ActivityType.SHOP_ITEM_UPDATED: '{actor} updated "{object}"',
+    ActivityType.SHOP_ITEM_CHECKED: '{actor} checked off "{object}"',
+    ActivityType.SHOP_LIST_CLEARED: '{actor} cleared purchased items',
+    ActivityType.PROJECT_CREATED: '{actor} created project: "{object}"',
+    ActivityType.BILL_ADDED: '{actor} added bill "{object}"',
+    ActivityType.BILL_PAID: '{actor} marked "{object}" as paid',
+    ActivityType.BUDGET_CATEGORY_UPDATED: '{actor} updated the {object} budget',
+    ActivityType.MEMBER_JOINED: '{actor} joined the household',
+    ActivityType.MEMBER_LEFT: '{actor} left the household',
+    ActivityType.REMINDER_CREATED: '{actor} set a reminder: "{object}"',
+    ActivityType.CHORE_ASSIGNED: '{actor} assigned "{object}" to {target}',
+}
+
+# Used instead when a burst was coalesced into one row (item_count > 1). Adds {count}.
+ACTIVITY_BULK_TEMPLATES = {
+    ActivityType.TASK_CREATED: '{actor} added {count} tasks to "{target}"',
+    ActivityType.TASK_BULK_COMPLETED: '{actor} completed {count} tasks in "{target}"',
+    ActivityType.TASK_REOPENED: '{actor} reopened {count} tasks in "{target}"',
+    ActivityType.TASK_ASSIGNED: '{actor} assigned {count} tasks to {target}',
+    ActivityType.TASK_UNASSIGNED: '{actor} unassigned {count} tasks in "{target}"',
+    ActivityType.TASK_DUE_DATE_SET: '{actor} set due date for {count} tasks in "{target}"',
+    ActivityType.TASK_DUE_DATE_CLEARED: '{actor} cleared due date for {count} tasks in "{target}"',
+    ActivityType.SHOP_ITEM_ADDED: '{actor} added {count} items to {target}',
+    ActivityType.SHOP_ITEM_UPDATED: '{actor} updated {count} items in {target}',
+    ActivityType.SHOP_ITEM_CHECKED: '{actor} checked off {count} items in {target}',
+    ActivityType.SHOP_LIST_CLEARED: '{actor} cleared {count} purchased items from {target}',
+}
+
+# Bound str.format per type, built once so rendering a row is one dict lookup
+_RENDERERS = {type_: template.format for type_, template in ACTIVITY_TEMPLATES.items()}
+_BULK_RENDERERS = {type_: template.format for type_, template in ACTIVITY_BULK_TEMPLATES.items()}
+
+
+def render_many(rows) -> list[dict]:
+    """Render a page of feed rows in one pass."""
+    return [row.to_rendered() for row in rows]
+
+
 class Activity(db.Model):
     __tablename__ = "activity"
 
@@ -81,19 +155,44 @@ class Activity(db.Model):
     event_tzid = db.Column(db.String(64))
 
     created_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    # Latest mutation folded into a coalesced row; created_at keeps the row's feed position
+    updated_at = db.Column(db.DateTime(timezone=True))
+
+    # How many mutations this row stands for once a burst has been coalesced
+    item_count = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    # Feed sentence rendered at write time (see ACTIVITY_STORE_RENDERED_TEXT)
+    rendered_text = db.Column(db.String(512))
     
     __table_args__ = (
         # Fast household feed lookup, newest first
         Index("ix_activities_household_created_desc", "household_id", "created_at", "id"),
     )
 
+    def render_text(self) -> str:
+        """The feed sentence for this row, e.g. 'John completed task: "Vacuum"'."""
+        count = self.item_count or 1
+        fmt = (count > 1 and _BULK_RENDERERS.get(self.type)) or _RENDERERS.get(self.type)
+        if fmt is None:
+            return f"{self.actor_name}: {self.type.value}"
+        return fmt(
+            actor=self.actor_name,
+            count=count,
+            object=self.object_title,
+            target=self.target_title,
+            when=self.event_start_at.strftime("%a, %b %d") if self.event_start_at else "",
+        )
+
     def to_rendered(self):
-        base = {
+        return {
             "id": self.id,
             "householdId": self.household_id,
             "actor": { "id": self.actor_id, "name": self.actor_name },
             "type": self.type.value,
+            "count": self.item_count or 1,
             "createdAt": self.created_at.isoformat(),
+            "updatedAt": (self.updated_at or self.created_at).isoformat(),
             "object": {
                 "type": self.object_type,
                 "id": self.object_id,
@@ -107,12 +206,10 @@ class Activity(db.Model):
             "event": {
                 "startAt": self.event_start_at.isoformat() if self.event_start_at else None,
                 "tzid": self.event_tzid
-            }
+            },
+            # Rows written with the text baked in skip templating entirely
+            "text": self.rendered_text or self.render_text(),
         }
 
-        # Simple server-size templates (remember to tweak)
-        if self.type == ActivityType.TASK_CREATED:
-            text = f'{self.actor_name} added a task to "{self.target_title}": "{self.object_title}"'
-        elif self.type == ActivityType.TASK_COMPLETED:
-            text = f'{self.actor_name} completed task: "{self.object_title}"'
-        elif self.type == ActivityType.
\ No newline at end of file
+    def __repr__(self):
+        return f"<Activity {self.id} {self.type.value}>"
@@ -17,6 +17,11 @@ class Announcement(db.Model):
     published_at = db.Column(db.DateTime(timezone=True), nullable=True) 
     expires_at = db.Column(db.DateTime(timezone=True), nullable=True)
 
+    __table_args__ = (
+        # Keyset pagination of a household's announcements
+        db.Index("ix_announcements_household_id_created_at", "household_id", "created_at", "id"),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -0,0 +1,22 @@
+from app.extensions import db
+
+
+class Blob(db.Model):
+    """
+    An uploaded file, stored once in S3 under its content hash
+    (blobs/<sha256>.<ext>) however many times it is uploaded. `ref_count`
+    counts the columns pointing at it (users.profile_img, users.banner_img);
+    `released_at` is when it last dropped to zero, for `flask blobs gc`.
+    """
+    __tablename__ = "blobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(255), nullable=False, unique=True)
+    content_type = db.Column(db.String(100), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    released_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<Blob {self.key} x{self.ref_count}>"
@@ -1,5 +1,40 @@
 from app.extensions import db 
-from datetime import datetime, timezone 
+from datetime import datetime, timedelta, timezone 
+from app.recurrence import parse_exdates
+
+# Events are bucketed by how long they last. Within a bucket no event is
+# longer than its span, so "overlaps [start, end)" becomes the bounded range
+# start - span < start_utc < end on (household_id, span_bucket, start_utc).
+# The last bucket (None) holds everything longer, plus unscheduled events.
+# Recurring series live in a bucket of their own, RECURRING_SPAN_BUCKET,
+# looked up by their first start and series_end_utc instead.
+SPAN_BUCKETS = (
+    timedelta(hours=1),
+    timedelta(days=1),
+    timedelta(days=7),
+    timedelta(days=35),
+    timedelta(days=366),
+    None,
+)
+UNBOUNDED_SPAN_BUCKET = len(SPAN_BUCKETS) - 1
+RECURRING_SPAN_BUCKET = len(SPAN_BUCKETS)
+
+
+def span_bucket_for(start, end, rrule=None) -> int:
+    if rrule:
+        return RECURRING_SPAN_BUCKET
+    if start is None or end is None:
+        return UNBOUNDED_SPAN_BUCKET
+    duration = end - start
+    for bucket, span in enumerate(SPAN_BUCKETS[:-1]):
+        if duration <= span:
+            return bucket
+    return UNBOUNDED_SPAN_BUCKET
+
+
+def default_span_bucket(context):
+    params = context.get_current_parameters()
+    return span_bucket_for(params.get('start_utc'), params.get('end_utc'), params.get('rrule'))
 
 class Event(db.Model):
     __tablename__ = "events"
@@ -16,8 +51,25 @@ class Event(db.Model):
         nullable=False,
     )
     tzid = db.Column(db.String(64), nullable=False)  # e.g. "America/Los_Angeles"
+    # Recurrence (see app.recurrence): start_utc/end_utc are the first occurrence
+    rrule = db.Column(db.String(255), nullable=True)   # e.g. "FREQ=WEEKLY;BYDAY=MO,TH"
+    exdates = db.Column(db.Text, nullable=True)        # skipped occurrence starts, EXDATE format
+    series_end_utc = db.Column(db.DateTime(timezone=True), nullable=True)  # None = open-ended
+    span_bucket = db.Column(
+        db.SmallInteger,
+        nullable=False,
+        default=default_span_bucket,
+        server_default=str(UNBOUNDED_SPAN_BUCKET),
+    )
     household = db.relationship('Household', backref=db.backref('events', lazy='dynamic'))
 
+    __table_args__ = (
+        # Household calendar reads and keyset pagination, ordered by start
+        db.Index("ix_events_household_id_start_utc", "household_id", "start_utc", "id"),
+        # Calendar window lookups, see SPAN_BUCKETS
+        db.Index("ix_events_household_id_span_bucket_start_utc", "household_id", "span_bucket", "start_utc"),
+    )
+
     def to_dict(self):
         def to_utc_z(dt):
             if dt is None:
@@ -35,6 +87,8 @@ class Event(db.Model):
             "tzid": self.tzid,
             "hasTime": bool(self.has_time),           # <-- include it
             "createdAt": to_utc_z(self.created_at),
+            "rrule": self.rrule,
+            "exdates": None if self.exdates is None else [to_utc_z(d) for d in sorted(parse_exdates(self.exdates))],
         }
 
     def __repr__(self):
@@ -8,6 +8,8 @@ class Household(db.Model):
     creator_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     invite_code = db.Column(db.String, unique=True, nullable=True)
     created_at = db.Column(db.DateTime, server_default=db.func.now())
+    # Bumped by every change to the household's content (see app.etags)
+    version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     # Relationships
     members = db.relationship(
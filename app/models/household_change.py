@@ -0,0 +1,25 @@
+from app.extensions import db
+
+
+class HouseholdChange(db.Model):
+    """
+    One row per synced object touched by a flush: the delta-sync log read by
+    /api/households/<id>/changes. `seq` is the household's version after the
+    flush that wrote it, so it only grows and commits in order per household.
+    """
+    __tablename__ = "household_changes"
+
+    id = db.Column(db.Integer, primary_key=True)
+    household_id = db.Column(db.Integer, db.ForeignKey("households.id", ondelete="CASCADE"), nullable=False)
+    seq = db.Column(db.Integer, nullable=False)
+    entity = db.Column(db.String(32), nullable=False)  # table name, e.g. "todos"
+    entity_id = db.Column(db.Integer, nullable=False)
+    deleted = db.Column(db.Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        db.Index("ix_household_changes_household_id_seq", "household_id", "seq"),
+    )
+
+    def __repr__(self):
+        op = "delete" if self.deleted else "upsert"
+        return f"<HouseholdChange {self.household_id}@{self.seq} {op} {self.entity} {self.entity_id}>"
@@ -20,6 +20,11 @@ class Todo(db.Model):
     todo_list=db.relationship("TodoList", back_populates="todos")
     assigned_to=db.relationship("User", back_populates="todos")
 
+    __table_args__ = (
+        # A list's todos in display order (also covers lookups by list_id)
+        db.Index("ix_todos_list_id_sort_index", "list_id", "sort_index", "id"),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -15,6 +15,8 @@ class TodoList(db.Model):
 
     created_at = db.Column(db.DateTime, server_default=db.func.now())
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
+    # Bumped by every change to the list or its todos (see app.etags)
+    version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     # relationships
     todos = db.relationship(
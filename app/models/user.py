@@ -19,6 +19,9 @@ class User(db.Model, UserMixin):
     tagline = db.Column(db.String(100), nullable=True)
     profile_img = db.Column(db.String(256), default="https://i.imgur.com/DRsIsR4.png")
     banner_img = db.Column(db.String(256), nullable=True)
+    # Resized copies of the images above, {"<size>": {"<format>": url}} (see app.images)
+    profile_img_variants = db.Column(db.JSON(none_as_null=True), nullable=True)
+    banner_img_variants = db.Column(db.JSON(none_as_null=True), nullable=True)
     points = db.Column(db.Integer, default=0)
     daily_checkin = db.Column(db.Boolean, default=False, nullable=False)
     last_checkin = db.Column(db.DateTime, nullable=True)
@@ -74,6 +77,8 @@ class User(db.Model, UserMixin):
             "tagline": self.tagline,
             "profileImg": self.profile_img,
             "bannerImg": self.banner_img,
+            "profileImgVariants": self.profile_img_variants,
+            "bannerImgVariants": self.banner_img_variants,
             "points": self.points,
             "dailyCheckin": self.daily_checkin,
             "lastCheckin": self.last_checkin,
@@ -85,6 +90,7 @@ class User(db.Model, UserMixin):
             "userId": self.id,
             "name": self.name,
             "profileImg": self.profile_img,
+            "profileImgVariants": self.profile_img_variants,
             "mood": (str(self.user_mood.mood) if self.user_mood else None),
         }
 
@@ -0,0 +1,116 @@
+"""
+Gap-based sort keys for todos.
+
+A list's todos are ordered by (sort_index, id). New keys are spaced SORT_GAP
+apart, so moving a todo between two neighbours only needs a key strictly
+between theirs: one UPDATE of the moved row, however long the list is.
+Appends compute max + SORT_GAP inside the INSERT itself.
+
+Repeated moves into the same spot halve the gap each time. When two
+neighbours end up on adjacent integers, the list is renumbered with one
+set-based UPDATE (about log2(SORT_GAP) = 10 moves into one spot before that
+can happen), and the move goes ahead on the fresh keys.
+"""
+from sqlalchemy import func, select, tuple_, update
+
+from app.change_log import record_changes
+from app.extensions import db
+from app.models import Todo
+
+SORT_GAP = 1024
+
+_todos = Todo.__table__
+
+
+def append_key(list_id: int):
+    """SQL expression for a key after the list's last todo, evaluated inside the INSERT."""
+    return (
+        select(func.coalesce(func.max(_todos.c.sort_index), -SORT_GAP) + SORT_GAP)
+        .where(_todos.c.list_id == list_id)
+        .scalar_subquery()
+    )
+
+
+def key_between(lo: int | None, hi: int | None) -> int | None:
+    """A key strictly between lo and hi (None = open end), or None if there is no room."""
+    if lo is None and hi is None:
+        return 0
+    if lo is None:
+        return hi - SORT_GAP
+    if hi is None:
+        return lo + SORT_GAP
+    if hi - lo >= 2:
+        return (lo + hi) // 2
+    return None
+
+
+def renumber(session, list_id: int, household_id: int | None = None):
+    """Respace a list's keys SORT_GAP apart, keeping their order."""
+    ranked = (
+        select(
+            _todos.c.id,
+            (func.row_number().over(order_by=(_todos.c.sort_index, _todos.c.id)) * SORT_GAP).label("key"),
+        )
+        .where(_todos.c.list_id == list_id)
+        .subquery()
+    )
+    session.execute(update(_todos).where(_todos.c.id == ranked.c.id).values(sort_index=ranked.c.key))
+
+    # Every key moved, so every todo shows up in the delta-sync log
+    ids = session.execute(select(_todos.c.id).where(_todos.c.list_id == list_id)).scalars().all()
+    record_changes(
+        session,
+        [(household_id, Todo, todo_id, False) for todo_id in ids] if household_id else (),
+        todo_list_ids={list_id},
+    )
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Todo) and obj.list_id == list_id:
+            session.expire(obj, ["sort_index"])
+
+
+def _bounds(todo, after_id, before_id):
+    """Keys of the todos the moved one must land between; None = open end."""
+    list_id = todo.list_id
+    named = {after_id, before_id} - {None}
+    keys = dict(db.session.execute(
+        select(Todo.id, Todo.sort_index).where(Todo.list_id == list_id, Todo.id.in_(named))
+    ).all()) if named else {}
+    if named - keys.keys():
+        raise ValueError("afterId/beforeId must be todos in this list")
+    if todo.id in named:
+        raise ValueError("A todo cannot be moved next to itself")
+
+    lo, hi = keys.get(after_id), keys.get(before_id)
+    others = (Todo.list_id == list_id, Todo.id != todo.id)
+    if after_id is not None and before_id is None:
+        # between `after` and whatever follows it
+        hi = db.session.execute(
+            select(Todo.sort_index)
+            .where(*others, tuple_(Todo.sort_index, Todo.id) > tuple_(lo, after_id))
+            .order_by(Todo.sort_index, Todo.id).limit(1)
+        ).scalar()
+    elif before_id is not None and after_id is None:
+        lo = db.session.execute(
+            select(Todo.sort_index)
+            .where(*others, tuple_(Todo.sort_index, Todo.id) < tuple_(hi, before_id))
+            .order_by(Todo.sort_index.desc(), Todo.id.desc()).limit(1)
+        ).scalar()
+    elif lo is not None and (lo, after_id) > (hi, before_id):
+        raise ValueError("afterId must come before beforeId")
+    return lo, hi
+
+
+def move_todo(todo, after_id: int | None, before_id: int | None, household_id: int | None = None):
+    """
+    Give `todo` a key between todo `after_id` and todo `before_id` (either
+    may be None: top / bottom of the list). Raises ValueError for neighbours
+    that are not in the list. The caller commits.
+    """
+    if after_id is None and before_id is None:
+        raise ValueError("afterId or beforeId is required")
+    key = key_between(*_bounds(todo, after_id, before_id))
+    if key is None:
+        renumber(db.session, todo.list_id, household_id)
+        key = key_between(*_bounds(todo, after_id, before_id))
+    todo.sort_index = key
+    return todo
@@ -0,0 +1,123 @@
+"""
+Keyset (cursor) pagination for collection endpoints.
+
+Collections are ordered by a sort key plus the primary key as tie-breaker,
+and a page starts strictly after the last row of the previous one:
+
+    WHERE (sort_key, id) > (:last_sort_key, :last_id)
+    ORDER BY sort_key, id
+    LIMIT :limit
+
+With an index on (<filter columns>, sort_key, id) every page is a short range
+scan, however large the table. The cursor handed to clients is opaque
+(base64 JSON of the last row's key values) and is returned in the
+X-Next-Cursor response header, so response bodies keep their shapes.
+
+Without ?limit= a page holds DEFAULT_PAGE_SIZE rows, so no response grows
+with the table; clients that want everything follow X-Next-Cursor.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from flask import abort, request
+from sqlalchemy import tuple_
+
+from app.extensions import db
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _dump(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _load(value):
+    # only what _dump writes: ints, strings and {"dt": ...} / {"d": ...}
+    if isinstance(value, dict) and len(value) == 1:
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    if isinstance(value, (int, str)) and not isinstance(value, bool):
+        return value
+    raise ValueError("unexpected cursor value")
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps([_dump(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _python_type(column):
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def decode_cursor(token: str, keys) -> list:
+    """The key values of a cursor for `keys`; 400 unless each matches its column's type."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list):
+            raise ValueError("cursor is not a list")
+        values = [_load(v) for v in values]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        abort(400, description="Invalid cursor")
+    if len(values) != len(keys):
+        abort(400, description="Invalid cursor")
+    for value, key in zip(values, keys):
+        expected = _python_type(key)
+        # exact type: a datetime is a date and a bool is an int, neither is a valid key here
+        if expected is not None and type(value) is not expected:
+            abort(400, description="Invalid cursor")
+    return values
+
+
+def page_params() -> tuple[str | None, int]:
+    """(cursor, limit) from ?cursor=&limit=, with limit clamped to MAX_PAGE_SIZE."""
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+    if limit < 1:
+        abort(400, description="limit must be a positive integer")
+    return request.args.get("cursor") or None, min(limit, MAX_PAGE_SIZE)
+
+
+def paginate(stmt, keys, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    """
+    Run one page of `stmt` (a Core select) ordered by `keys`, the sort
+    column(s) ending with the primary key. Returns (rows, next_cursor);
+    next_cursor is None on the last page.
+
+    Every key column must be among the selected columns.
+    """
+    keys = list(keys)
+    if cursor:
+        values = decode_cursor(cursor, keys)
+        if len(keys) == 1:
+            stmt = stmt.where(keys[0] > values[0])
+        else:
+            stmt = stmt.where(tuple_(*keys) > tuple_(*values))
+
+    # One extra row tells us whether there is a next page
+    rows = db.session.execute(stmt.order_by(*keys).limit(limit + 1)).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, k.key) for k in keys])
+
+
+def with_next_cursor(response, next_cursor: str | None):
+    """Attach the next-page cursor to a (body, status) pair or Response."""
+    body, status = response if isinstance(response, tuple) else (response, 200)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    return body, status, headers
@@ -0,0 +1,116 @@
+"""
+The authenticated principal behind `current_user`, cached per process.
+
+Loading the full User on every request costs a SELECT of the user plus the
+selectin load of `lists_participating`. Most routes only need the id, the
+household and a display name. The user loader therefore returns a
+Principal: a slim, session-independent snapshot of those columns, kept in
+an LRU with a TTL so a warm request runs no query at all.
+
+Anything else (`current_user.to_dict()`, relationships) is read from the
+full User, loaded on first use through the session's identity map.
+
+Commits that change or delete a user evict it from this process's cache.
+Other workers pick the change up when their entry expires, after at most
+PRINCIPAL_TTL_SECONDS.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from flask_login import UserMixin
+from sqlalchemy import event, select
+
+from app.extensions import db
+from app.models import User
+
+PRINCIPAL_CACHE_SIZE = 4096
+PRINCIPAL_TTL_SECONDS = 60
+
+_STALE_USERS = "stale_user_ids"
+
+
+class Principal(UserMixin):
+    def __init__(self, id, household_id, name, display_name, profile_img):
+        self.id = id
+        self.household_id = household_id
+        self.name = name
+        self.display_name = display_name
+        self.profile_img = profile_img
+
+    @property
+    def user(self) -> User | None:
+        """The full User, from this request's session."""
+        return db.session.get(User, self.id)
+
+    def __getattr__(self, name):
+        # Only reached for attributes the snapshot lacks
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+    def __repr__(self):
+        return f"<Principal {self.id}: {self.name}>"
+
+
+# --------------------------------------------------------------------------- #
+#  Cache
+# --------------------------------------------------------------------------- #
+_principals: OrderedDict = OrderedDict()   # user id -> (expires at, Principal)
+_principals_lock = threading.Lock()
+
+
+def load_principal(user_id: int) -> Principal | None:
+    now = time.monotonic()
+    with _principals_lock:
+        entry = _principals.get(user_id)
+        if entry is not None and entry[0] > now:
+            _principals.move_to_end(user_id)
+            return entry[1]
+
+    row = db.session.execute(
+        select(User.id, User.household_id, User.name, User.display_name, User.profile_img)
+        .where(User.id == user_id)
+    ).first()
+    if row is None:
+        evict(user_id)
+        return None
+
+    principal = Principal(*row)
+    with _principals_lock:
+        _principals[user_id] = (now + PRINCIPAL_TTL_SECONDS, principal)
+        _principals.move_to_end(user_id)
+        if len(_principals) > PRINCIPAL_CACHE_SIZE:
+            _principals.popitem(last=False)
+    return principal
+
+
+def evict(*user_ids):
+    with _principals_lock:
+        for user_id in user_ids:
+            _principals.pop(user_id, None)
+
+
+# --------------------------------------------------------------------------- #
+#  Invalidation
+# --------------------------------------------------------------------------- #
+@event.listens_for(db.session, "after_flush")
+def _note_user_changes(session, flush_context):
+    stale = {
+        obj.id for obj in (*session.dirty, *session.deleted)
+        if isinstance(obj, User) and obj.id is not None
+    }
+    if stale:
+        session.info.setdefault(_STALE_USERS, set()).update(stale)
+
+
+@event.listens_for(db.session, "after_commit")
+def _evict_committed(session):
+    stale = session.info.pop(_STALE_USERS, None)
+    if stale:
+        evict(*stale)
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _drop_stale(session, previous_transaction):
+    session.info.pop(_STALE_USERS, None)
@@ -0,0 +1,214 @@
+"""
+SQL statement accounting.
+
+Every statement is timed; statements slower than SLOW_QUERY_THRESHOLD are
+logged at WARNING, the rest at DEBUG.
+
+count_statements() counts (and optionally caps) the statements of a block.
+init_query_stats() does the same for every request:
+
+    Server-Timing   db;dur=<ms>;desc="<n> queries", plus db-repeats when a
+                    statement repeated (SERVER_TIMING)
+    N+1 detector    the same statement shape (whitespace and IN-lists
+                    normalised) N_PLUS_ONE_THRESHOLD or more times in one
+                    request is logged with its count, e.g. the lazy load of
+                    ShoppingItem.category once per item
+    budgets         QUERY_BUDGETS {endpoint: max statements}, or
+                    QUERY_BUDGET_DEFAULT. QUERY_BUDGET_ACTION "log" warns
+                    after the request; "fail" refuses the statement that
+                    goes over (StatementBudgetExceeded -> 500)
+
+Per-endpoint totals for this process: see endpoint_query_stats().
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import current_app, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+N_PLUS_ONE_THRESHOLD = 5
+
+_ENVIRON_KEY = "app.query_stats"
+
+
+class StatementBudgetExceeded(RuntimeError):
+    """Raised when a block runs more SQL statements than it is allowed to."""
+
+
+def _first_line(stmt: str) -> str:
+    return stmt.strip().splitlines()[0][:120]
+
+
+class StatementCounter:
+    def __init__(self, name: str, limit: int | None = None):
+        self.name = name
+        self.limit = limit
+        self.count = 0
+        self.time = 0.0
+
+    def hit(self, stmt: str):
+        self.count += 1
+        if self.limit is not None and self.count > self.limit:
+            raise StatementBudgetExceeded(
+                f"{self.name} exceeded its budget of {self.limit} statements: {_first_line(stmt)}"
+            )
+
+    def timed(self, stmt: str, elapsed: float):
+        self.time += elapsed
+
+
+# IN (?, ?, ?) / IN (%(p_1_1)s, ...) / IN (__[POSTCOMPILE_ids]) -> IN (?)
+_IN_LIST = re.compile(r"\bIN \([^()]*\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(stmt: str) -> str:
+    """The statement's shape: bound parameters are already placeholders, so only IN-list lengths and spacing vary."""
+    return _SPACE.sub(" ", _IN_LIST.sub("IN (?)", stmt)).strip()
+
+
+class RequestQueries(StatementCounter):
+    """A StatementCounter for one request that also groups its statements by fingerprint."""
+
+    def __init__(self, name: str, limit: int | None = None):
+        super().__init__(name, limit)
+        self.started = time.perf_counter()
+        self.shapes = Counter()
+
+    def hit(self, stmt: str):
+        self.shapes[fingerprint(stmt)] += 1
+        super().hit(stmt)
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> list[tuple[str, int]]:
+        """(fingerprint, times) of the statements run `threshold` or more times, most first."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+# Counters are tracked per thread so concurrent requests never see each other's SQL.
+_local = threading.local()
+
+
+def _active_counters() -> list:
+    counters = getattr(_local, "counters", None)
+    if counters is None:
+        counters = _local.counters = []
+    return counters
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, stmt, params, context, executemany):
+    context._query_start_time = time.perf_counter()
+    for counter in _active_counters():
+        counter.hit(stmt)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _time_statement(conn, cursor, stmt, params, context, executemany):
+    elapsed = time.perf_counter() - context._query_start_time
+    for counter in _active_counters():
+        counter.timed(stmt, elapsed)
+    threshold = current_app.config.get("SLOW_QUERY_THRESHOLD") if has_app_context() else None
+    if threshold is not None and elapsed >= threshold:
+        logging.warning(f"Slow query [{elapsed:.3f}s] {_first_line(stmt)} …")
+    else:
+        logging.debug(f"[{elapsed:.3f}s] {_first_line(stmt)} …")
+
+
+@contextmanager
+def count_statements(name: str, limit: int | None = None):
+    """
+    Count the SQL statements executed inside the block.
+    With a `limit`, the statement that would go over it is refused with
+    StatementBudgetExceeded instead of being sent to the database.
+    """
+    counter = StatementCounter(name, limit)
+    counters = _active_counters()
+    counters.append(counter)
+    try:
+        yield counter
+    finally:
+        counters.remove(counter)
+
+
+# --------------------------------------------------------------------------- #
+#  Per-request
+# --------------------------------------------------------------------------- #
+_stats: dict[str, list] = {}    # endpoint -> [requests, statements, db seconds, max statements, N+1 requests]
+_stats_lock = threading.Lock()
+
+
+def _record(endpoint, queries: RequestQueries, repeated: bool):
+    with _stats_lock:
+        entry = _stats.setdefault(endpoint or "<unknown>", [0, 0, 0.0, 0, 0])
+        entry[0] += 1
+        entry[1] += queries.count
+        entry[2] += queries.time
+        entry[3] = max(entry[3], queries.count)
+        entry[4] += repeated
+
+
+def endpoint_query_stats() -> dict:
+    """{endpoint: {"requests", "statements", "maxStatements", "avgStatements", "dbMs", "nPlusOneRequests"}} for this process."""
+    with _stats_lock:
+        return {
+            endpoint: {
+                "requests": n, "statements": statements, "maxStatements": most,
+                "avgStatements": round(statements / n, 1), "dbMs": round(seconds * 1000, 1),
+                "nPlusOneRequests": flagged,
+            }
+            for endpoint, (n, statements, seconds, most, flagged) in sorted(_stats.items())
+        }
+
+
+def _budget(config, endpoint) -> int | None:
+    return config.get("QUERY_BUDGETS", {}).get(endpoint, config.get("QUERY_BUDGET_DEFAULT"))
+
+
+def init_query_stats(app):
+    config = app.config
+
+    @app.before_request
+    def _start_request_queries():
+        name = f"{request.method} {request.endpoint}"
+        budget = _budget(config, request.endpoint)
+        queries = RequestQueries(name, budget if config.get("QUERY_BUDGET_ACTION") == "fail" else None)
+        request.environ[_ENVIRON_KEY] = queries
+        _active_counters().append(queries)
+
+    @app.after_request
+    def _report_request_queries(response):
+        queries = request.environ.get(_ENVIRON_KEY)
+        if queries is None:
+            return response
+
+        repeated = queries.repeated(config.get("N_PLUS_ONE_THRESHOLD", N_PLUS_ONE_THRESHOLD))
+        for shape, n in repeated:
+            app.logger.warning("Possible N+1 in %s: %dx %s", queries.name, n, shape[:160])
+        budget = _budget(config, request.endpoint)
+        if budget is not None and queries.count > budget:
+            app.logger.warning(
+                "%s ran %d statements, over its budget of %d", queries.name, queries.count, budget
+            )
+        _record(request.endpoint, queries, bool(repeated))
+
+        if config.get("SERVER_TIMING", True):
+            timings = [
+                f'db;dur={queries.time * 1000:.1f};desc="{queries.count} queries"',
+                f"app;dur={(time.perf_counter() - queries.started) * 1000:.1f}",
+            ]
+            if repeated:
+                timings.append(f'db-repeats;desc="{repeated[0][1]}x same statement"')
+            response.headers.add("Server-Timing", ", ".join(timings))
+        return response
+
+    @app.teardown_request
+    def _stop_request_queries(exc):
+        queries = request.environ.pop(_ENVIRON_KEY, None)
+        counters = _active_counters()
+        if queries in counters:
+            counters.remove(queries)
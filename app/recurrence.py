@@ -0,0 +1,343 @@
+"""
+Recurring events: an RFC 5545 RRULE subset, expanded lazily per window.
+
+A series is one `events` row whose start_utc/end_utc are the first
+occurrence and whose `rrule` describes the rest:
+
+    FREQ=DAILY|WEEKLY|MONTHLY|YEARLY   required
+    INTERVAL=n                         every n-th period (default 1)
+    COUNT=n | UNTIL=<date or UTC time> optional end, not both
+    BYDAY=MO,WE,...                    WEEKLY only, plain weekdays
+
+Skipped occurrences are kept in `exdates` as an RFC 5545 EXDATE value
+(comma-separated UTC times, e.g. 20250105T170000Z).
+
+Occurrences repeat on the series' local wall-clock time in its `tzid`, so a
+weekly 9:00 chore stays at 9:00 across DST changes. Monthly/yearly rules
+skip months without that day (the 31st, Feb 29), as RFC 5545 does.
+
+Expansion is cached per rule: each series keeps the occurrence starts it has
+produced so far, and a window only extends that list as far as the window's
+end, so reading this week of a years-old daily series costs one bisect.
+Open-ended and UNTIL series don't expand from dtstart to a distant window:
+the expansion restarts at the window's period, computed arithmetically, and
+keeps at most MAX_EXPANSION_STARTS starts. COUNT series are short
+(MAX_COUNT) and always expand from dtstart, since COUNT is counted from it.
+"""
+import re
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import datetime, time, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+MAX_COUNT = 1000
+EXPANSION_CACHE_SIZE = 1024
+MAX_EXPANSION_STARTS = 2048
+# a window further past the materialized starts than this restarts the expansion
+EXPANSION_JUMP = timedelta(days=366)
+
+_UTC_STAMP = "%Y%m%dT%H%M%SZ"
+
+
+def as_utc(dt: datetime) -> datetime:
+    # SQLite hands back naive values; they are UTC
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+# --------------------------------------------------------------------------- #
+#  Rules
+# --------------------------------------------------------------------------- #
+class RecurrenceRule:
+    __slots__ = ("freq", "interval", "count", "until", "byday")
+
+    def __init__(self, freq, interval=1, count=None, until=None, byday=()):
+        self.freq = freq
+        self.interval = interval
+        self.count = count
+        self.until = until        # datetime (UTC) or date (all-day, local)
+        self.byday = byday        # sorted weekday numbers, Monday = 0
+
+    @classmethod
+    def parse(cls, text: str) -> "RecurrenceRule":
+        """Parse an RRULE value; raises ValueError with a client-facing message."""
+        text = text.strip()
+        if text.upper().startswith("RRULE:"):
+            text = text[6:]
+        parts = {}
+        for part in filter(None, text.upper().split(";")):
+            name, sep, value = part.partition("=")
+            if not sep or not value:
+                raise ValueError(f"Malformed rrule part {part!r}")
+            if name in parts:
+                raise ValueError(f"Duplicate rrule part {name}")
+            parts[name] = value
+
+        freq = parts.pop("FREQ", None)
+        if freq not in FREQUENCIES:
+            raise ValueError(f"rrule FREQ must be one of {', '.join(FREQUENCIES)}")
+
+        interval = cls._positive_int(parts.pop("INTERVAL", "1"), "INTERVAL")
+        count = parts.pop("COUNT", None)
+        until = parts.pop("UNTIL", None)
+        if count is not None and until is not None:
+            raise ValueError("rrule cannot have both COUNT and UNTIL")
+        if count is not None:
+            count = cls._positive_int(count, "COUNT")
+            if count > MAX_COUNT:
+                raise ValueError(f"rrule COUNT cannot exceed {MAX_COUNT}")
+        if until is not None:
+            until = cls._parse_until(until)
+
+        byday = ()
+        if "BYDAY" in parts:
+            if freq != "WEEKLY":
+                raise ValueError("rrule BYDAY is only supported with FREQ=WEEKLY")
+            days = parts.pop("BYDAY").split(",")
+            if any(d not in WEEKDAYS for d in days):
+                raise ValueError("rrule BYDAY takes plain weekdays like MO,WE,FR")
+            byday = tuple(sorted({WEEKDAYS.index(d) for d in days}))
+
+        if parts:
+            raise ValueError(f"Unsupported rrule parts: {', '.join(sorted(parts))}")
+        return cls(freq, interval, count, until, byday)
+
+    @staticmethod
+    def _positive_int(value, name):
+        if not value.isdigit() or int(value) < 1:
+            raise ValueError(f"rrule {name} must be a positive integer")
+        return int(value)
+
+    @staticmethod
+    def _parse_until(value):
+        try:
+            if re.fullmatch(r"\d{8}", value):
+                return datetime.strptime(value, "%Y%m%d").date()
+            if re.fullmatch(r"\d{8}T\d{6}Z", value):
+                return datetime.strptime(value, _UTC_STAMP).replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+        raise ValueError("rrule UNTIL must be YYYYMMDD or YYYYMMDDTHHMMSSZ")
+
+    def __str__(self):
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.byday:
+            parts.append("BYDAY=" + ",".join(WEEKDAYS[d] for d in self.byday))
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if isinstance(self.until, datetime):
+            parts.append(f"UNTIL={self.until.strftime(_UTC_STAMP)}")
+        elif self.until is not None:
+            parts.append(f"UNTIL={self.until.strftime('%Y%m%d')}")
+        return ";".join(parts)
+
+    # ----------------------------------------------------------------------- #
+    def local_starts(self, dtstart: datetime, after: datetime | None = None):
+        """
+        Candidate occurrence starts as naive local wall times, in order,
+        ignoring COUNT/UNTIL (the caller applies those after localizing).
+        With `after`, start from the period containing it instead of from
+        dtstart (a few earlier candidates may still come first).
+        """
+        step = self.interval
+        ahead = after is not None and after > dtstart
+        if self.freq == "DAILY":
+            n = (after - dtstart).days // step if ahead else 0
+            while True:
+                yield dtstart + timedelta(days=n * step)
+                n += 1
+        elif self.freq == "WEEKLY":
+            days = self.byday or (dtstart.weekday(),)
+            week = dtstart - timedelta(days=dtstart.weekday())
+            if ahead:
+                week += timedelta(weeks=(after - week).days // 7 // step * step)
+            while True:
+                for d in days:
+                    candidate = week + timedelta(days=d)
+                    if candidate >= dtstart:
+                        yield candidate
+                week += timedelta(weeks=step)
+        else:
+            months = step if self.freq == "MONTHLY" else 12 * step
+            n = 0
+            if ahead:
+                n = ((after.year - dtstart.year) * 12 + after.month - dtstart.month) // months
+            while True:
+                total = dtstart.month - 1 + n * months
+                try:
+                    yield dtstart.replace(year=dtstart.year + total // 12, month=total % 12 + 1)
+                except ValueError:
+                    pass  # no such day this month / year
+                n += 1
+
+
+@lru_cache(maxsize=EXPANSION_CACHE_SIZE)
+def parse_rrule(text: str) -> RecurrenceRule:
+    return RecurrenceRule.parse(text)
+
+
+# --------------------------------------------------------------------------- #
+#  Exceptions (EXDATE)
+# --------------------------------------------------------------------------- #
+def format_exdates(values) -> str | None:
+    stamps = sorted({as_utc(v).strftime(_UTC_STAMP) for v in values})
+    return ",".join(stamps) or None
+
+
+@lru_cache(maxsize=EXPANSION_CACHE_SIZE)
+def parse_exdates(text: str | None) -> frozenset:
+    if not text:
+        return frozenset()
+    return frozenset(
+        datetime.strptime(stamp, _UTC_STAMP).replace(tzinfo=timezone.utc)
+        for stamp in text.split(",")
+    )
+
+
+# --------------------------------------------------------------------------- #
+#  Expansion
+# --------------------------------------------------------------------------- #
+class _Expansion:
+    """The occurrence starts (UTC) of one rule + dtstart, materialized on demand."""
+
+    def __init__(self, rule: RecurrenceRule, dtstart_utc: datetime, tzid: str):
+        self.tz = ZoneInfo(tzid)
+        self.rule = rule
+        self.dtstart = dtstart_utc
+        self._restart(None)
+        self.lock = threading.Lock()
+
+    def _restart(self, from_utc: datetime | None):
+        """Expand again from the period containing `from_utc` (None: from dtstart)."""
+        local = self.dtstart.astimezone(self.tz).replace(tzinfo=None)
+        after = None
+        if from_utc is not None:
+            # a day early, so no DST offset can skip the first wanted occurrence
+            after = (from_utc - timedelta(days=1)).astimezone(self.tz).replace(tzinfo=None)
+        self._candidates = self.rule.local_starts(local, after)
+        self.starts: list[datetime] = []
+        # every occurrence from here on is (or will be) in starts
+        self.covered_from = self.dtstart if from_utc is None else from_utc
+        self.exhausted = False
+
+    def _localize(self, wall: datetime) -> datetime:
+        return wall.replace(tzinfo=self.tz).astimezone(timezone.utc)
+
+    def seek(self, from_utc: datetime):
+        """
+        Make sure the starts cover `from_utc` without expanding the gap
+        before it. COUNT series always expand from dtstart.
+        """
+        if self.rule.count is not None:
+            return
+        if from_utc < self.covered_from and self.covered_from > self.dtstart:
+            # before what a restarted or trimmed expansion still holds
+            self._restart(None if from_utc <= self.dtstart else from_utc)
+        elif not self.exhausted:
+            reached = self.starts[-1] if self.starts else self.covered_from
+            if from_utc - reached > EXPANSION_JUMP:
+                self._restart(from_utc)
+
+    def trim(self, keep_from: int):
+        """Drop starts before index `keep_from` once the list is over MAX_EXPANSION_STARTS."""
+        if self.rule.count is None and len(self.starts) > MAX_EXPANSION_STARTS and keep_from:
+            del self.starts[:keep_from]
+            self.covered_from = self.starts[0]
+
+    def extend_to(self, limit_utc: datetime):
+        """Materialize every occurrence starting before `limit_utc`."""
+        count, until = self.rule.count, self.rule.until
+        while not self.exhausted and (not self.starts or self.starts[-1] < limit_utc):
+            wall = next(self._candidates)
+            start = self._localize(wall)
+            if until is None:
+                past_end = count is not None and len(self.starts) >= count
+            elif isinstance(until, datetime):
+                past_end = start > until
+            else:
+                past_end = wall.date() > until
+            if past_end:
+                self.exhausted = True
+            else:
+                self.starts.append(start)
+
+
+_expansions: OrderedDict = OrderedDict()
+_expansions_lock = threading.Lock()
+
+
+def _expansion_for(rrule: str, dtstart_utc: datetime, tzid: str) -> _Expansion:
+    key = (rrule, dtstart_utc, tzid)
+    with _expansions_lock:
+        expansion = _expansions.get(key)
+        if expansion is not None:
+            _expansions.move_to_end(key)
+            return expansion
+    expansion = _Expansion(parse_rrule(rrule), dtstart_utc, tzid)
+    with _expansions_lock:
+        expansion = _expansions.setdefault(key, expansion)
+        if len(_expansions) > EXPANSION_CACHE_SIZE:
+            _expansions.popitem(last=False)
+    return expansion
+
+
+def occurrences(series, start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+    """
+    (start_utc, end_utc) of each occurrence of `series` (anything with
+    start_utc/end_utc/tzid/rrule/exdates) overlapping [start, end).
+    """
+    first_start, first_end = as_utc(series.start_utc), as_utc(series.end_utc)
+    expansion = _expansion_for(series.rrule, first_start, series.tzid)
+    tz = expansion.tz
+    # Durations are wall-clock too, so all-day occurrences end at local midnight
+    local_first = first_start.astimezone(tz).replace(tzinfo=None)
+    duration = first_end.astimezone(tz).replace(tzinfo=None) - local_first
+    longest = first_end - first_start + timedelta(hours=3)  # allow for a DST shift
+    skipped = parse_exdates(series.exdates)
+
+    with expansion.lock:
+        expansion.seek(start - longest)
+        expansion.extend_to(end)
+        starts = expansion.starts
+        lo = bisect_right(starts, start - longest)
+        hi = bisect_right(starts, end)
+        window = starts[lo:hi]
+        expansion.trim(lo)
+
+    out = []
+    for occ_start in window:
+        if occ_start in skipped or occ_start >= end:
+            continue
+        wall = occ_start.astimezone(tz).replace(tzinfo=None)
+        occ_end = (wall + duration).replace(tzinfo=tz).astimezone(timezone.utc)
+        if occ_end > start:
+            out.append((occ_start, occ_end))
+    return out
+
+
+def series_end(start_utc: datetime, end_utc: datetime, tzid: str, rrule: str) -> datetime | None:
+    """
+    When the last occurrence ends (None for open-ended series). Used to
+    keep finished series out of window queries.
+    """
+    rule = parse_rrule(rrule)
+    duration = as_utc(end_utc) - as_utc(start_utc) + timedelta(hours=3)
+    if rule.count is None and rule.until is None:
+        return None
+    if isinstance(rule.until, datetime):
+        return rule.until + duration
+    if rule.until is not None:
+        # all-day UNTIL: through the end of that local day
+        local_end = datetime.combine(rule.until + timedelta(days=1), time(), tzinfo=ZoneInfo(tzid))
+        return local_end.astimezone(timezone.utc) + duration
+    expansion = _expansion_for(rrule, as_utc(start_utc), tzid)
+    with expansion.lock:
+        expansion.extend_to(datetime.max.replace(tzinfo=timezone.utc))
+        return expansion.starts[-1] + duration
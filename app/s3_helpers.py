@@ -1,26 +1,55 @@
 import os
 import uuid
+import base64
+import hashlib
 import mimetypes
-import boto3
-from botocore.exceptions import BotoCoreError, ClientError
+from functools import lru_cache
 
 # ---- Config ----
 BUCKET_NAME = os.environ.get("S3_BUCKET")
 S3_KEY = os.environ.get("S3_KEY")
 S3_SECRET = os.environ.get("S3_SECRET")
+# S3-compatible stand-in for local development (MinIO, LocalStack, moto), e.g. http://localhost:9000
+S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL")
 
-# Public URL base (virtual-hosted–style)
-S3_LOCATION = f"https://{BUCKET_NAME}.s3.amazonaws.com/"
+# Public URL base (virtual-hosted–style; path-style on a custom endpoint)
+S3_LOCATION = (
+    f"{S3_ENDPOINT_URL.rstrip('/')}/{BUCKET_NAME}/" if S3_ENDPOINT_URL
+    else f"https://{BUCKET_NAME}.s3.amazonaws.com/"
+)
 
 ALLOWED_EXTENSIONS = {"pdf", "png", "jpg", "jpeg", "gif"}
 
+# Direct-to-S3 image uploads: accepted types (-> key extension), size cap, how long a presigned POST is valid
+IMAGE_CONTENT_TYPES = {"image/png": "png", "image/jpeg": "jpg", "image/gif": "gif"}
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+PRESIGN_EXPIRES_SECONDS = 10 * 60
+
 # ---- Client ----
 _s3_client_kwargs = {
     "aws_access_key_id": S3_KEY,
     "aws_secret_access_key": S3_SECRET,
 }
+if S3_ENDPOINT_URL:
+    _s3_client_kwargs["endpoint_url"] = S3_ENDPOINT_URL
+
+
+@lru_cache(maxsize=None)
+def get_s3():
+    """
+    The shared S3 client, built on first use: importing boto3 and building
+    a client takes a few hundred ms, which every app start (CLI commands,
+    migrations, workers) used to pay at import time.
+    """
+    import boto3
+    from botocore.config import Config
 
-s3 = boto3.client("s3", **_s3_client_kwargs)
+    # stand-ins serve buckets by path, not by subdomain
+    addressing = "path" if S3_ENDPOINT_URL else "auto"
+    return boto3.client(
+        "s3", config=Config(signature_version="s3v4", s3={"addressing_style": addressing}),
+        **_s3_client_kwargs,
+    )
 
 
 # ---- Helpers ----
@@ -36,6 +65,20 @@ def get_unique_filename(filename: str) -> str:
     return f"{unique}.{ext}" if ext else unique
 
 
+def content_hash(fileobj, chunk_size: int = 64 * 1024) -> tuple[str, int]:
+    """
+    SHA-256 (hex) and size of a file-like object, read in chunks so large
+    uploads are never held in memory. Rewinds it for the upload.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := fileobj.read(chunk_size):
+        digest.update(chunk)
+        size += len(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest(), size
+
+
 def _safe_content_type(filename: str, provided: str | None) -> str | None:
     """
     Choose a safe ContentType:
@@ -63,13 +106,128 @@ def upload_file_to_s3(file, acl: str = "public-read") -> dict:
         extra_args["ContentType"] = ctype  # only include when it's a real string
 
     try:
-        s3.upload_fileobj(
+        get_s3().upload_fileobj(
             Fileobj=file,
             Bucket=BUCKET_NAME,
             Key=file.filename,  # ensure you've already set a unique name before calling this
             ExtraArgs=extra_args,
         )
-    except (BotoCoreError, ClientError, Exception) as e:
+    except Exception as e:  # BotoCoreError, ClientError, ...
         return {"errors": str(e)}
 
     return {"url": f"{S3_LOCATION}{file.filename}"}
+
+
+def public_url(key: str) -> str:
+    return f"{S3_LOCATION}{key}"
+
+
+def presign_upload(key: str, content_type: str, max_size: int, acl: str = "public-read",
+                   expires: int = PRESIGN_EXPIRES_SECONDS, sha256: str | None = None) -> dict:
+    """
+    Presigned POST for uploading `key` straight to S3: the client posts
+    `fields` plus the file (last) as multipart/form-data to `url`. S3
+    rejects any other key, content type or ACL, bodies outside
+    1..max_size bytes and, given `sha256` (hex), any other content.
+    Returns {"url": "...", "fields": {...}} or {"errors": "..."}.
+    """
+    if not BUCKET_NAME:
+        return {"errors": "S3_BUCKET is not configured"}
+    fields = {"acl": acl, "Content-Type": content_type}
+    if sha256:
+        fields["x-amz-checksum-algorithm"] = "SHA256"
+        fields["x-amz-checksum-sha256"] = base64.b64encode(bytes.fromhex(sha256)).decode()
+    try:
+        return get_s3().generate_presigned_post(
+            Bucket=BUCKET_NAME,
+            Key=key,
+            Fields=fields,
+            Conditions=[
+                *({name: value} for name, value in fields.items()),
+                ["content-length-range", 1, max_size],
+            ],
+            ExpiresIn=expires,
+        )
+    except Exception as e:  # BotoCoreError, ...
+        return {"errors": str(e)}
+
+
+def stat_object(key: str) -> dict:
+    """
+    Size and content type of an uploaded object (one HEAD request).
+    Returns {"size": n, "contentType": "..."} or {"errors": "..."}.
+    """
+    if not BUCKET_NAME:
+        return {"errors": "S3_BUCKET is not configured"}
+    try:
+        head = get_s3().head_object(Bucket=BUCKET_NAME, Key=key)
+    except Exception as e:  # ClientError (404 when nothing was uploaded), BotoCoreError, ...
+        return {"errors": str(e)}
+    return {"size": head["ContentLength"], "contentType": head.get("ContentType")}
+
+
+def download_bytes(key: str) -> dict:
+    """
+    Read a whole object into memory.
+    Returns {"data": b"..."} or {"errors": "..."}.
+    """
+    if not BUCKET_NAME:
+        return {"errors": "S3_BUCKET is not configured"}
+    try:
+        obj = get_s3().get_object(Bucket=BUCKET_NAME, Key=key)
+        return {"data": obj["Body"].read()}
+    except Exception as e:  # ClientError, BotoCoreError, ...
+        return {"errors": str(e)}
+
+
+def upload_bytes(key: str, data: bytes, content_type: str, acl: str = "public-read",
+                 cache_control: str | None = None) -> dict:
+    """
+    Store `data` at `key`.
+    Returns {"url": "..."} on success or {"errors": "..."} on failure.
+    """
+    if not BUCKET_NAME:
+        return {"errors": "S3_BUCKET is not configured"}
+    extra = {"CacheControl": cache_control} if cache_control else {}
+    try:
+        get_s3().put_object(
+            Bucket=BUCKET_NAME, Key=key, Body=data, ContentType=content_type, ACL=acl, **extra
+        )
+    except Exception as e:  # ClientError, BotoCoreError, ...
+        return {"errors": str(e)}
+    return {"url": public_url(key)}
+
+
+def list_keys(prefix: str) -> list[str]:
+    """Every key under `prefix` (empty on errors)."""
+    if not BUCKET_NAME:
+        return []
+    keys = []
+    try:
+        for page in get_s3().get_paginator("list_objects_v2").paginate(Bucket=BUCKET_NAME, Prefix=prefix):
+            keys.extend(obj["Key"] for obj in page.get("Contents", ()))
+    except Exception:  # ClientError, BotoCoreError, ...
+        return keys
+    return keys
+
+
+def delete_objects(keys: list[str]) -> dict:
+    """
+    Delete `keys` (up to 1000 per request).
+    Returns {"deleted": n} or {"errors": "..."}.
+    """
+    if not BUCKET_NAME:
+        return {"errors": "S3_BUCKET is not configured"}
+    deleted = 0
+    try:
+        for start in range(0, len(keys), 1000):
+            batch = keys[start:start + 1000]
+            result = get_s3().delete_objects(
+                Bucket=BUCKET_NAME, Delete={"Objects": [{"Key": k} for k in batch], "Quiet": True}
+            )
+            if result.get("Errors"):
+                return {"errors": result["Errors"][0].get("Message", "delete failed")}
+            deleted += len(batch)
+    except Exception as e:  # ClientError, BotoCoreError, ...
+        return {"errors": str(e)}
+    return {"deleted": deleted}
@@ -0,0 +1,331 @@
+"""
+Compiled JSON encoders for the models' `to_dict` shapes.
+
+Each encoder is generated once at import from an explicit allowlist of the
+columns its model's `to_dict` publishes (a new column stays private until it
+is added here), using the column metadata: the camelCase key, the column it
+reads and the converter it applies are
+baked into a plain function, so encoding a row is one dict literal with no
+per-field dispatch. Encoders only use attribute access, so they accept ORM
+instances and Core `Row`s alike; read endpoints can `select(*Model.__table__.c)`
+and skip building ORM objects entirely.
+
+Values come out exactly as the hand-written `to_dict` + Flask's JSON provider
+produce them today (raw datetimes as HTTP dates, ISO where `to_dict` used ISO),
+so the encoded payload is already JSON-native.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timezone
+
+from sqlalchemy import select, DateTime, Date
+
+from app.extensions import db
+from app.recurrence import parse_exdates
+from app.models import (
+    User, Household, TodoList, TodoListMember, Todo, ShoppingList,
+    ShoppingCategory, ShoppingItem, Event, Announcement, Mood, Checkin,
+)
+
+
+# --------------------------------------------------------------------------- #
+#  Converters
+# --------------------------------------------------------------------------- #
+def _iso(value):
+    return value.isoformat()
+
+
+def _utc_z(dt):
+    # Event.to_dict: naive values are UTC, always rendered with a Z suffix
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _utc_z_seconds(dt):
+    # Checkin.to_dict: same, without microseconds
+    return dt.astimezone(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+_DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def http_date(value) -> str:
+    """
+    Same string as werkzeug.http.http_date (what Flask's JSON provider emits
+    for dates), without the email.utils round trip.
+    """
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time(), tzinfo=timezone.utc)
+    elif value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    else:
+        value = value.astimezone(timezone.utc)
+    return (
+        f"{_DAYS[value.weekday()]}, {value.day:02d} {_MONTHS[value.month - 1]} "
+        f"{value.year:04d} {value.hour:02d}:{value.minute:02d}:{value.second:02d} GMT"
+    )
+
+
+def _exdates(text):
+    # Event.to_dict: EXDATE value -> sorted list of UTC ISO strings
+    return [_utc_z(d) for d in sorted(parse_exdates(text))]
+
+
+def _default_converter(column):
+    """What Flask's JSON provider would have done with the raw column value."""
+    if isinstance(column.type, (DateTime, Date)):
+        return http_date
+    return None
+
+
+# --------------------------------------------------------------------------- #
+#  Encoder compiler
+# --------------------------------------------------------------------------- #
+def camel_case(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+def compile_encoder(model, fields, *, converters=None, keys=None):
+    """
+    Build `encode(row) -> dict` for `model` from the columns named in
+    `fields`, the column keys of its `to_dict`. Keys `to_dict` builds from
+    relationships (members, items, ...) are left to the payload helpers below.
+
+    converters  column name -> callable, overriding the type-based default
+    keys        column name -> JSON key, overriding camelCase
+    """
+    converters = converters or {}
+    keys = keys or {}
+    env = {}
+    items = []
+    columns = [model.__table__.c[name] for name in fields]
+    for column in columns:
+        name = column.name
+        key = keys.get(name, camel_case(name))
+        convert = converters.get(name, _default_converter(column))
+        if convert is None:
+            items.append(f"{key!r}: row.{name}")
+        else:
+            env[f"_c_{name}"] = convert
+            items.append(f"{key!r}: (None if (v := row.{name}) is None else _c_{name}(v))")
+
+    source = "def encode(row):\n    return {\n        " + ",\n        ".join(items) + ",\n    }\n"
+    exec(compile(source, f"<encoder {model.__name__}>", "exec"), env)
+    encode = env["encode"]
+    encode.__qualname__ = f"encode_{model.__tablename__}"
+    encode.columns = tuple(columns)
+    return encode
+
+
+encode_user = compile_encoder(User, (
+    "id", "name", "email", "created_at", "display_name", "tagline", "profile_img", "banner_img",
+    "profile_img_variants", "banner_img_variants", "points", "daily_checkin", "last_checkin",
+    "household_id",
+))
+encode_household = compile_encoder(Household, ("id", "name", "creator_id", "invite_code", "created_at"))
+encode_todo_list = compile_encoder(
+    TodoList,
+    ("id", "title", "icon", "user_id", "household_id", "all_members", "created_at", "updated_at"),
+    converters={"created_at": _iso, "updated_at": _iso},
+)
+encode_todo = compile_encoder(Todo, (
+    "id", "list_id", "title", "description", "status", "priority", "due_date", "assigned_to_id",
+    "sort_index", "notes", "created_at", "updated_at",
+), converters={"due_date": _iso})
+encode_shopping_list = compile_encoder(ShoppingList, ("id", "title", "household_id", "created_at", "updated_at"))
+encode_shopping_category = compile_encoder(
+    ShoppingCategory, ("id", "name", "list_id", "created_at", "updated_at")
+)
+encode_shopping_item = compile_encoder(ShoppingItem, (
+    "id", "list_id", "category_id", "name", "quantity", "purchased", "created_at", "updated_at",
+))
+encode_event = compile_encoder(
+    Event,
+    ("id", "household_id", "title", "start_utc", "end_utc", "has_time", "created_at", "tzid", "rrule", "exdates"),
+    converters={
+        "start_utc": _utc_z, "end_utc": _utc_z, "created_at": _utc_z, "has_time": bool,
+        "exdates": _exdates,
+    },
+)
+encode_announcement = compile_encoder(Announcement, (
+    "id", "user_id", "household_id", "text", "is_pinned", "created_at", "updated_at", "published_at",
+    "expires_at",
+))
+encode_mood = compile_encoder(Mood, ("id", "user_id", "mood"), converters={"mood": str})
+encode_checkin = compile_encoder(
+    Checkin, ("id", "user_id", "local_date", "created_at_utc"),
+    converters={"local_date": _iso, "created_at_utc": _utc_z_seconds},
+)
+
+
+def encode_occurrence(row, start, end) -> dict:
+    """
+    One occurrence of a recurring series: the series payload with the
+    occurrence's own times, plus `recurrenceId` (its start), which is what
+    a client sends back to skip just that occurrence.
+    """
+    payload = encode_event(row)
+    payload["startUtc"] = payload["recurrenceId"] = _utc_z(start)
+    payload["endUtc"] = _utc_z(end)
+    return payload
+
+
+# --------------------------------------------------------------------------- #
+#  Core-row readers
+# --------------------------------------------------------------------------- #
+def fetch_rows(encoder, *criteria, order_by=None):
+    """Select only the encoder's columns, returning Core rows (no ORM identity map)."""
+    stmt = select(*encoder.columns).where(*criteria)
+    if order_by is not None:
+        stmt = stmt.order_by(order_by)
+    return db.session.execute(stmt).all()
+
+
+def users_payload(*criteria) -> list[dict]:
+    return [encode_user(r) for r in fetch_rows(encode_user, *criteria, order_by=User.id)]
+
+
+def household_payload(household_row) -> dict:
+    payload = encode_household(household_row)
+    payload["members"] = users_payload(User.household_id == household_row.id)
+    return payload
+
+
+def todo_lists_payload(list_rows, include_todos: bool = True) -> list[dict]:
+    """Same shape as TodoList.to_dict() for each row, in at most three extra queries."""
+    if not list_rows:
+        return []
+    list_ids = [r.id for r in list_rows]
+
+    todos_by_list = defaultdict(list)
+    if include_todos:
+        for t in fetch_rows(encode_todo, Todo.list_id.in_(list_ids), order_by=Todo.id):
+            todos_by_list[t.list_id].append(encode_todo(t))
+
+    # memberIds: personal -> owner, allMembers -> household, otherwise explicit links
+    household_ids = {r.household_id for r in list_rows if r.user_id is None and r.all_members}
+    members_by_household = defaultdict(list)
+    if household_ids:
+        rows = db.session.execute(
+            select(User.id, User.household_id)
+            .where(User.household_id.in_(household_ids))
+            .order_by(User.id)
+        )
+        for user_id, household_id in rows:
+            members_by_household[household_id].append(user_id)
+
+    linked_ids = [r.id for r in list_rows if r.user_id is None and not r.all_members]
+    links_by_list = defaultdict(list)
+    if linked_ids:
+        rows = db.session.execute(
+            select(TodoListMember.todo_list_id, TodoListMember.user_id)
+            .where(TodoListMember.todo_list_id.in_(linked_ids))
+        )
+        for list_id, user_id in rows:
+            links_by_list[list_id].append(user_id)
+
+    out = []
+    for r in list_rows:
+        payload = encode_todo_list(r)
+        if r.user_id is not None:
+            payload["scope"] = "user"
+            payload["memberIds"] = [r.user_id]
+        else:
+            payload["scope"] = "household"
+            payload["memberIds"] = (
+                members_by_household[r.household_id] if r.all_members else links_by_list[r.id]
+            )
+        payload["todos"] = todos_by_list[r.id]
+        out.append(payload)
+    return out
+
+
+def shopping_items_payload(items) -> list[dict]:
+    """Same shape as ShoppingItem.to_dict() for each item row; one query for the category names."""
+    category_ids = {i.category_id for i in items if i.category_id is not None}
+    category_names = dict(db.session.execute(
+        select(ShoppingCategory.id, ShoppingCategory.name).where(ShoppingCategory.id.in_(category_ids))
+    ).all()) if category_ids else {}
+
+    out = []
+    for i in items:
+        payload = encode_shopping_item(i)
+        payload["category"] = category_names.get(i.category_id) if i.category_id is not None else None
+        out.append(payload)
+    return out
+
+
+def shopping_lists_payload(list_rows) -> list[dict]:
+    """Same shape as ShoppingList.to_dict() for each row, in two or three extra queries."""
+    if not list_rows:
+        return []
+    list_ids = [r.id for r in list_rows]
+
+    categories = fetch_rows(
+        encode_shopping_category, ShoppingCategory.list_id.in_(list_ids), order_by=ShoppingCategory.id
+    )
+    items = fetch_rows(encode_shopping_item, ShoppingItem.list_id.in_(list_ids), order_by=ShoppingItem.id)
+
+    category_names = {c.id: c.name for c in categories}
+    missing = {i.category_id for i in items if i.category_id is not None} - category_names.keys()
+    if missing:
+        # Items pointing at another list's category (shouldn't happen, but to_dict handled it)
+        category_names.update(db.session.execute(
+            select(ShoppingCategory.id, ShoppingCategory.name).where(ShoppingCategory.id.in_(missing))
+        ).all())
+
+    items_by_list = defaultdict(list)
+    items_by_category = defaultdict(list)
+    for i in items:
+        payload = encode_shopping_item(i)
+        payload["category"] = category_names.get(i.category_id) if i.category_id is not None else None
+        items_by_list[i.list_id].append(payload)
+        if i.category_id is not None:
+            items_by_category[i.category_id].append(payload)
+
+    categories_by_list = defaultdict(list)
+    for c in categories:
+        payload = encode_shopping_category(c)
+        payload["items"] = items_by_category[c.id]
+        categories_by_list[c.list_id].append(payload)
+
+    out = []
+    for r in list_rows:
+        payload = encode_shopping_list(r)
+        payload["categories"] = categories_by_list[r.id]
+        payload["items"] = items_by_list[r.id]
+        out.append(payload)
+    return out
+
+
+def shopping_lists_normalized(list_rows) -> dict:
+    """
+    `?shape=normalized` form of shopping lists: lists, categories and items
+    as flat maps keyed by id, cross-referenced by id, so every item is sent
+    exactly once. Two queries on top of the list rows.
+    """
+    list_ids = [r.id for r in list_rows]
+    lists, categories, items = {}, {}, {}
+    for r in list_rows:
+        payload = encode_shopping_list(r)
+        payload["categoryIds"] = []
+        payload["itemIds"] = []
+        lists[str(r.id)] = payload
+
+    if list_ids:
+        for c in fetch_rows(encode_shopping_category, ShoppingCategory.list_id.in_(list_ids), order_by=ShoppingCategory.id):
+            payload = encode_shopping_category(c)
+            payload["itemIds"] = []
+            categories[str(c.id)] = payload
+            lists[str(c.list_id)]["categoryIds"].append(c.id)
+
+        for i in fetch_rows(encode_shopping_item, ShoppingItem.list_id.in_(list_ids), order_by=ShoppingItem.id):
+            items[str(i.id)] = encode_shopping_item(i)
+            lists[str(i.list_id)]["itemIds"].append(i.id)
+            category = categories.get(str(i.category_id))
+            if category is not None:
+                category["itemIds"].append(i.id)
+
+    return {"listIds": list_ids, "lists": lists, "categories": categories, "items": items}
@@ -0,0 +1,151 @@
+"""
+The SPA's static files, indexed once at startup.
+
+build_manifest() walks frontend/build when the app is created and records
+every file: mimetype, size, ETag, whether its name carries a content hash,
+and its compressed variants. Serving a request is then a dict lookup. There
+is no per-request exists()/stat(), and unknown paths get index.html from
+memory.
+
+    hashed assets (static/js/main.3f2a1b9c.js, assets/index-BZ3kqH6d.js)
+        Cache-Control: public, max-age=31536000, immutable
+    everything else (index.html, manifest.json, favicon.ico, ...)
+        Cache-Control: no-cache   (revalidated by ETag)
+
+Compressed variants come from .br/.gz files the frontend build emitted
+next to the original. Failing that, small compressible files are
+compressed here at startup: gzip always, brotli when the `brotli` package
+is installed. The variant is picked from Accept-Encoding.
+
+Rebuilding the frontend needs an app restart to be picked up.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from flask import Response, abort, request, send_file
+
+from app.compression import COMPRESSIBLE
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only without it
+    brotli = None
+
+# Files up to this size are kept in memory (with their variants)
+IN_MEMORY_LIMIT = 512 * 1024
+# Smaller files are not worth compressing
+COMPRESS_MIN_SIZE = 1024
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Content hash in the name, under the build tools' asset folders
+# (CRA: static/js/main.3f2a1b9c.js, Vite: assets/index-BZ3kqH6d.js)
+_HASHED = re.compile(r"^(static|assets)/.*[.-]([0-9a-f]{8,}|[A-Za-z0-9_]{8})(\.chunk)?\.\w+$")
+_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+@dataclass
+class Asset:
+    path: Path
+    mimetype: str
+    size: int
+    etag: str
+    immutable: bool
+    body: bytes | None = None                       # None: served from disk
+    variants: dict = field(default_factory=dict)    # encoding -> bytes or Path
+
+
+def _compress(encoding, data):
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=11)
+    return None
+
+
+def _load(file: Path, rel: str) -> Asset:
+    mimetype = mimetypes.guess_type(file.name)[0] or "application/octet-stream"
+    st = file.stat()
+    asset = Asset(
+        path=file,
+        mimetype=mimetype,
+        size=st.st_size,
+        etag=f"{st.st_size:x}-{int(st.st_mtime):x}",
+        immutable=bool(_HASHED.match(rel)),
+    )
+    for encoding, suffix in _ENCODINGS:
+        precompressed = file.with_name(file.name + suffix)
+        if precompressed.is_file():
+            asset.variants[encoding] = precompressed
+
+    if st.st_size <= IN_MEMORY_LIMIT:
+        asset.body = file.read_bytes()
+        asset.etag = hashlib.sha1(asset.body).hexdigest()[:20]
+        asset.variants = {
+            encoding: variant.read_bytes() for encoding, variant in asset.variants.items()
+        }
+        if st.st_size >= COMPRESS_MIN_SIZE and COMPRESSIBLE.match(mimetype):
+            for encoding, _ in _ENCODINGS:
+                if encoding not in asset.variants:
+                    data = _compress(encoding, asset.body)
+                    if data is not None and len(data) < st.st_size:
+                        asset.variants[encoding] = data
+    return asset
+
+
+class StaticManifest:
+    def __init__(self, assets: dict[str, Asset]):
+        self.assets = assets
+        self.index = assets.get("index.html")
+
+    def serve(self, path: str) -> Response:
+        asset = self.assets.get(path) if path else None
+        if asset is None:
+            asset = self.index
+        if asset is None:
+            abort(404)
+        return _respond(asset)
+
+
+def build_manifest(static_folder) -> StaticManifest:
+    """Index every file under `static_folder` (an empty manifest if it is missing)."""
+    root = Path(static_folder)
+    assets = {}
+    if root.is_dir():
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                file = Path(dirpath) / name
+                if file.suffix in (".br", ".gz") and file.with_suffix("").is_file():
+                    continue  # a variant, picked up with its original
+                rel = file.relative_to(root).as_posix()
+                assets[rel] = _load(file, rel)
+    return StaticManifest(assets)
+
+
+def _respond(asset: Asset) -> Response:
+    accepted = request.accept_encodings
+    encoding = next((e for e, _ in _ENCODINGS if e in asset.variants and accepted[e]), None)
+    etag = f"{asset.etag}-{encoding}" if encoding else asset.etag
+
+    if encoding is None and asset.body is None:
+        response = send_file(asset.path, mimetype=asset.mimetype, etag=etag, conditional=True)
+    else:
+        data = asset.variants[encoding] if encoding else asset.body
+        if isinstance(data, Path):
+            response = send_file(data, mimetype=asset.mimetype, etag=etag, conditional=False)
+        else:
+            response = Response(data, mimetype=asset.mimetype)
+            response.set_etag(etag)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.make_conditional(request)
+
+    if asset.variants:
+        response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = IMMUTABLE if asset.immutable else REVALIDATE
+    return response
@@ -0,0 +1,133 @@
+"""
+Calendar window latency as a household's event history grows: the naive
+overlap filter (household_id, start_utc < end, end_utc > start) against the
+span-bucketed lookup in app.calendar_index.
+
+    python benchmarks/bench_calendar.py [sizes]    # e.g. 100,10000,100000,1000000
+
+History grows backwards from HISTORY_END at a steady EVENTS_PER_DAY, the
+way a real household accumulates it, so the week being viewed holds the
+same events at every size and only the amount of older history changes.
+Each size tops up the previous one. Runs against a throwaway SQLite file.
+"""
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+_db_file = Path(tempfile.mkdtemp()) / "bench_calendar.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_file}"
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.calendar_index import window_select  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import User, Household, Event  # noqa: E402
+from app.models.event import span_bucket_for  # noqa: E402
+from app.serializers import encode_event  # noqa: E402
+
+# Mostly short events, like a real calendar, with a tail of long ones
+DURATIONS = (
+    [timedelta(minutes=30)] * 40
+    + [timedelta(hours=2)] * 30
+    + [timedelta(days=1)] * 15
+    + [timedelta(days=4)] * 10
+    + [timedelta(days=30)] * 4
+    + [timedelta(days=300)] * 1
+)
+HISTORY_END = datetime(2030, 1, 1, tzinfo=timezone.utc)
+EVENTS_PER_DAY = 10
+BATCH = 50_000
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_ECHO = False
+
+
+def seed_household():
+    user = User(name="bench", email="bench@example.com", password="x")
+    db.session.add(user)
+    db.session.flush()
+    household = Household(name="Bench", creator_id=user.id)
+    db.session.add(household)
+    db.session.commit()
+    return household.id
+
+
+def add_events(hid, have, count, rng):
+    """Add events number have..have+count, going back in time from HISTORY_END."""
+    spacing = 86400 / EVENTS_PER_DAY
+    while count:
+        rows = []
+        for i in range(have, have + min(count, BATCH)):
+            start = HISTORY_END - timedelta(seconds=(i + rng.random()) * spacing)
+            end = start + rng.choice(DURATIONS)
+            rows.append({
+                "household_id": hid, "title": "Event", "tzid": "UTC", "has_time": True,
+                "start_utc": start, "end_utc": end, "span_bucket": span_bucket_for(start, end),
+                "created_at": start,
+            })
+        db.session.execute(insert(Event), rows)
+        have += len(rows)
+        count -= len(rows)
+    db.session.commit()
+
+
+def naive_select(columns, hid, start, end):
+    return (
+        select(*columns)
+        .where(Event.household_id == hid, Event.start_utc < end, Event.end_utc > start)
+        .order_by(Event.start_utc, Event.id)
+    )
+
+
+def timed(build, windows, repeat=3):
+    """Best-of-`repeat` mean latency per window, and the total rows returned."""
+    best, returned = float("inf"), 0
+    for _ in range(repeat):
+        returned = 0
+        start = time.perf_counter()
+        for ws, we in windows:
+            returned += len(db.session.execute(build(ws, we)).all())
+        best = min(best, (time.perf_counter() - start) / len(windows))
+    return best, returned
+
+
+def main():
+    sizes = [int(s) for s in (sys.argv[1] if len(sys.argv) > 1 else "100,10000,100000,1000000").split(",")]
+    app = create_app(BenchConfig)
+    logging.disable(logging.INFO)
+    rng = random.Random(8)
+    with app.app_context():
+        db.create_all()
+        hid = seed_household()
+        # Week views over the most recent days, covered even by the smallest history
+        windows = [
+            (HISTORY_END - timedelta(days=9, hours=6 * i), HISTORY_END - timedelta(days=2, hours=6 * i))
+            for i in range(8)
+        ]
+        columns = encode_event.columns
+
+        print(f"week window, mean of {len(windows)} windows, {EVENTS_PER_DAY} events/day")
+        have = 0
+        for n in sizes:
+            add_events(hid, have, n - have, rng)
+            have = n
+            naive_t, naive_rows = timed(lambda s, e: naive_select(columns, hid, s, e), windows)
+            fast_t, fast_rows = timed(lambda s, e: window_select(columns, hid, s, e), windows)
+            assert naive_rows == fast_rows
+            print(
+                f"{n:>9} events   naive {naive_t * 1000:9.2f} ms   bucketed {fast_t * 1000:7.2f} ms"
+                f"   ({fast_rows // len(windows)} rows/window)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Compare the old read path (ORM objects -> to_dict -> Flask's stdlib JSON
+provider) with the compiled one (Core rows -> app.serializers -> orjson).
+
+    python benchmarks/bench_serializers.py [rows]
+
+Runs against a throwaway in-memory SQLite database.
+"""
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ["DATABASE_URL"] = "sqlite://"
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.json_provider import OrjsonProvider, orjson  # noqa: E402
+from app.models import (  # noqa: E402
+    User, Household, TodoList, Todo, ShoppingList, ShoppingCategory, ShoppingItem,
+)
+from app.serializers import (  # noqa: E402
+    fetch_rows, encode_todo_list, encode_shopping_list, todo_lists_payload, shopping_lists_payload,
+)
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_ECHO = False
+
+
+def seed(n):
+    user = User(name="bench", email="bench@example.com", password="x")
+    db.session.add(user)
+    db.session.flush()
+    household = Household(name="Bench", creator_id=user.id)
+    db.session.add(household)
+    db.session.flush()
+    user.household_id = household.id
+
+    todo_list = TodoList(title="Chores", household_id=household.id)
+    shopping_list = ShoppingList(title="Groceries", household_id=household.id)
+    db.session.add_all([todo_list, shopping_list])
+    db.session.flush()
+    categories = [ShoppingCategory(name=f"Aisle {i}", list_id=shopping_list.id) for i in range(20)]
+    db.session.add_all(categories)
+    db.session.flush()
+
+    db.session.add_all(Todo(title=f"Todo {i}", list_id=todo_list.id, sort_index=i) for i in range(n))
+    db.session.add_all(
+        ShoppingItem(name=f"Item {i}", list_id=shopping_list.id, category_id=categories[i % 20].id)
+        for i in range(n)
+    )
+    db.session.commit()
+    return household.id
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, len(body)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    app = create_app(BenchConfig)
+    logging.disable(logging.INFO)
+    with app.app_context():
+        db.create_all()
+        hid = seed(n)
+        stdlib = DefaultJSONProvider(app)
+        fast = OrjsonProvider(app) if orjson else stdlib
+
+        cases = {
+            "household todo lists": (
+                lambda: stdlib.response([t.to_dict() for t in TodoList.query.filter_by(household_id=hid)]).get_data(),
+                lambda: fast.response(todo_lists_payload(
+                    fetch_rows(encode_todo_list, TodoList.household_id == hid, order_by=TodoList.id)
+                )).get_data(),
+            ),
+            "household shopping lists": (
+                lambda: stdlib.response([s.to_dict() for s in ShoppingList.query.filter_by(household_id=hid)]).get_data(),
+                lambda: fast.response(shopping_lists_payload(
+                    fetch_rows(encode_shopping_list, ShoppingList.household_id == hid, order_by=ShoppingList.id)
+                )).get_data(),
+            ),
+        }
+
+        print(f"{n} rows per list, orjson={'yes' if orjson else 'no'}")
+        for name, (old, new) in cases.items():
+            old_t, old_bytes = timed(old)
+            new_t, new_bytes = timed(new)
+            print(
+                f"{name:<26} to_dict {old_t * 1000:8.1f} ms   compiled {new_t * 1000:8.1f} ms"
+                f"   x{old_t / new_t:4.1f}   ({old_bytes} / {new_bytes} bytes)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Time app startup the way CLI commands, migrations and workers pay for it.
+
+    python benchmarks/bench_startup.py [runs]
+
+Each scenario runs in a fresh interpreter (module caches are per process)
+and reports the median wall time of:
+
+    import      `import app`: the package with its models and extensions
+    create      create_app(), with blueprints eager (LAZY_BLUEPRINTS=0) or lazy
+    1st req     the first request, which is where lazy mode imports the routes
+
+plus whether boto3 got imported along the way (it should only be on the
+first S3 upload).
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+application = app.create_app()
+t2 = time.perf_counter()
+application.test_client().get("/api/announcements/?householdId=0")
+t3 = time.perf_counter()
+print(json.dumps({
+    "import": t1 - t0, "create": t2 - t1, "first": t3 - t2,
+    "boto3": "boto3" in sys.modules,
+}))
+"""
+
+
+def probe(lazy: bool) -> dict:
+    env = {
+        **os.environ,
+        "DATABASE_URL": "sqlite://",
+        "AWS_EC2_METADATA_DISABLED": "true",
+        "LAZY_BLUEPRINTS": "1" if lazy else "0",
+    }
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(runs: int):
+    print(f"{'mode':>6} | {'import':>9} | {'create':>9} | {'1st req':>9} | boto3 loaded")
+    for lazy in (False, True):
+        samples = [probe(lazy) for _ in range(runs)]
+        med = {k: statistics.median(s[k] for s in samples) * 1000 for k in ("import", "create", "first")}
+        print(
+            f"{'lazy' if lazy else 'eager':>6} | {med['import']:7.1f}ms | {med['create']:7.1f}ms | "
+            f"{med['first']:7.1f}ms | {any(s['boto3'] for s in samples)}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -4,8 +4,9 @@ import { useGetUserCheckinsQuery } from "@/store/checkinSlice";
 import "../styles/HouseholdCheckins.css"
 import { Avatar, Tooltip } from "@mantine/core";
 import { useNavigate } from "react-router-dom";
+import { avatarSrc, type ImageVariants } from "@/lib/utils";
 
-type Member = { id: number; name: string; profileImg?: string };
+type Member = { id: number; name: string; profileImg?: string; profileImgVariants?: ImageVariants | null };
 
 function toISO(d: Date) {
     return d.toISOString().slice(0, 10); // YYYY-MM-DD
@@ -66,7 +67,7 @@ function MemberRow({
                 </div> */}
                 <Tooltip key={member.id} label={member.name} withArrow>
                     <Avatar
-                        src={member.profileImg || undefined}
+                        src={avatarSrc(member)}
                         radius="xl"
                         size="xs"
                         onClick={() => navigate(`/users/${member.id}`)}
@@ -2,6 +2,7 @@ import { useGetHouseholdQuery } from "@/store/householdSlice";
 import { useGetTodoListQuery } from "@/store/todoSlice";
 import { Combobox, Input, InputBase, useCombobox } from "@mantine/core"
 import { useState } from "react";
+import { avatarSrc } from "@/lib/utils";
 
 type Props = {
     householdId: number | undefined;
@@ -13,7 +14,7 @@ export const AssignedToDropdown = ({ householdId, listId }: Props) => {
     const { data: household } = useGetHouseholdQuery(householdId)
     const { data: todoList } = useGetTodoListQuery(listId)
 
-    const membersList = household?.members.filter(member => todoList?.memberIds?.includes(member.id)).map((member) => { return { id: member.id, profileImg: member.profileImg, name: member.name } })
+    const membersList = household?.members.filter(member => todoList?.memberIds?.includes(member.id)).map((member) => { return { id: member.id, profileImg: avatarSrc(member), name: member.name } })
     const memberOptions = membersList?.map((m) => ({ value: String(m.id), label: <><img src={m.profileImg} />{m.name}</> })) ?? [];
 
     const combobox = useCombobox({
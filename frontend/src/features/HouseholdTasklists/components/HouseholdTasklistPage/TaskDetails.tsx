@@ -7,6 +7,7 @@ import PersonAddAltRoundedIcon from '@mui/icons-material/PersonAddAltRounded';
 import { DatePickerInput } from '@mantine/dates';
 import { useGetHouseholdQuery } from "@/store/householdSlice";
 import dayjs from 'dayjs';
+import { avatarSrc } from "@/lib/utils";
 
 type Props = {
     opened: boolean;
@@ -88,7 +89,7 @@ export const TaskDetails = ({ opened, close, taskId, listId, householdId }: Prop
     const membersList =
         household?.members
             ?.filter((m) => todoList?.memberIds?.includes(m.id))
-            .map((m) => ({ id: m.id, name: m.name, profileImg: m.profileImg }))
+            .map((m) => ({ id: m.id, name: m.name, profileImg: avatarSrc(m) }))
         ?? [];
 
     const data = membersList.map((m) => ({
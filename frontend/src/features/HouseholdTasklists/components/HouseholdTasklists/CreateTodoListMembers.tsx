@@ -1,6 +1,7 @@
 // CreateTodoListMembers.tsx
 import { Avatar, Checkbox, Collapse, Fieldset, Stack } from "@mantine/core";
 import type { UserLite } from "@/hooks/useMemberSelection";
+import { avatarSrc } from "@/lib/utils";
 
 type Props = {
     members?: UserLite[];
@@ -41,7 +42,7 @@ export function CreateTodoListMembers({
                                     size="xs"
                                     label={
                                         <div className="list-members">
-                                            <Avatar src={m.profileImg} size="xs" />
+                                            <Avatar src={avatarSrc(m)} size="xs" />
                                             <span>{m.displayName}</span>
                                         </div>
                                     }
@@ -6,6 +6,7 @@ import { skipToken } from "@reduxjs/toolkit/query";
 import { HouseholdTasklistTask } from "./HouseholdTasklistTask";
 import { useMemo } from "react";
 import { useNavigate } from "react-router-dom";
+import { avatarSrc } from "@/lib/utils";
 
 type HouseholdTasklistProps = {
     list: TodoListType;
@@ -85,7 +86,7 @@ export function HouseholdTasklist({ list }: HouseholdTasklistProps) {
                         {visible.map((person: any) => (
                             <Tooltip key={person.id} label={nameOf(person)} withArrow>
                                 <Avatar
-                                    src={person.profileImg || undefined}
+                                    src={avatarSrc(person)}
                                     radius="xl"
                                     size="sm"
                                 >
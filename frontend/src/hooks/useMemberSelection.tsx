@@ -1,7 +1,8 @@
 // hooks/useMemberSelection.ts
 import { useEffect, useMemo, useState } from "react";
+import type { ImageVariants } from "@/lib/utils";
 
-export type UserLite = { id: number; displayName: string; profileImg: string; };
+export type UserLite = { id: number; displayName: string; profileImg: string; profileImgVariants?: ImageVariants | null };
 
 export function useMemberSelection(members?: UserLite[]) {
     const [selected, setSelected] = useState<Set<number>>(new Set());
@@ -3,4 +3,21 @@ import { twMerge } from "tailwind-merge";
 
 export function cn(...inputs: ClassValue[]) {
     return twMerge(clsx(inputs))
-}
\ No newline at end of file
+}
+
+export type ImageVariants = Record<string, Record<string, string>>;
+
+// Smallest resized profile image (WebP) at least `size` px square, else the original upload
+export function avatarSrc(
+    user: { profileImg?: string | null; profileImgVariants?: ImageVariants | null } | null | undefined,
+    size = 64,
+): string | undefined {
+    const variants = user?.profileImgVariants;
+    if (variants) {
+        const sizes = Object.keys(variants).map(Number).sort((a, b) => a - b);
+        const fit = sizes.find((s) => s >= size) ?? sizes[sizes.length - 1];
+        const url = fit === undefined ? undefined : variants[String(fit)]?.webp;
+        if (url) return url;
+    }
+    return user?.profileImg || undefined;
+}
@@ -1,10 +1,59 @@
-import { createApi, fetchBaseQuery } from '@reduxjs/toolkit/query/react';
+import {
+  createApi,
+  fetchBaseQuery,
+  type BaseQueryFn,
+  type FetchArgs,
+  type FetchBaseQueryError,
+} from '@reduxjs/toolkit/query/react';
+
+const rawBaseQuery = fetchBaseQuery({
+  baseUrl: `${import.meta.env.VITE_BACKEND_URL}`,
+  credentials: "include",
+});
+
+// Collection endpoints are paged: the cursor of the next page comes back in
+// X-Next-Cursor. GETs follow it, so every query still receives the whole
+// collection. Object payloads page one array field ({"Users": [...]}, a todo
+// list's "todos"); array payloads are concatenated.
+const NEXT_CURSOR_HEADER = "X-Next-Cursor";
+const PAGED_FIELDS = ["Users", "todos"];
+
+function withCursor(args: string | FetchArgs, cursor: string): FetchArgs {
+  const request = typeof args === "string" ? { url: args } : args;
+  return { ...request, params: { ...request.params, cursor } };
+}
+
+function mergePages(page: unknown, next: unknown): unknown {
+  if (Array.isArray(page) && Array.isArray(next)) return [...page, ...next];
+  if (page && next && typeof page === "object" && typeof next === "object") {
+    const merged: Record<string, unknown> = { ...page };
+    for (const field of PAGED_FIELDS) {
+      const head = merged[field];
+      const tail = (next as Record<string, unknown>)[field];
+      if (Array.isArray(head) && Array.isArray(tail)) merged[field] = [...head, ...tail];
+    }
+    return merged;
+  }
+  return next;
+}
+
+const baseQuery: BaseQueryFn<string | FetchArgs, unknown, FetchBaseQueryError> = async (args, api, extraOptions) => {
+  let result = await rawBaseQuery(args, api, extraOptions);
+  const method = typeof args === "string" ? "GET" : (args.method ?? "GET").toUpperCase();
+  if (method !== "GET") return result;
+
+  let cursor = result.meta?.response?.headers.get(NEXT_CURSOR_HEADER);
+  while (cursor && !result.error) {
+    const next = await rawBaseQuery(withCursor(args, cursor), api, extraOptions);
+    if (next.error) return next;
+    result = { ...next, data: mergePages(result.data, next.data) };
+    cursor = next.meta?.response?.headers.get(NEXT_CURSOR_HEADER);
+  }
+  return result;
+};
 
 export const apiSlice = createApi({
   reducerPath: "api",
-  baseQuery: fetchBaseQuery({
-    baseUrl: `${import.meta.env.VITE_BACKEND_URL}`,
-    credentials: "include",
-  }),
+  baseQuery,
   endpoints: () => ({}),
-});
\ No newline at end of file
+});
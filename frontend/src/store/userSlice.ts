@@ -8,6 +8,12 @@ type UploadImgArgs = {
 };
 
 type UploadImgResponse = { url: string };
+type PresignResponse = {
+    key: string;
+    url: string;
+    exists: boolean;            // already stored: skip the upload, just confirm
+    upload?: { url: string; fields: Record<string, string> };
+};
 type UserMoodResponse = {
     userId: number;
     mood: MoodKey | null;
@@ -88,16 +94,35 @@ export const userSlice = apiSlice.enhanceEndpoints({ addTagTypes: ["User"] }).in
         }),
 
         uploadImg: builder.mutation<UploadImgResponse, UploadImgArgs>({
-            query: ({ userId, imgType, file }) => {
-                const form = new FormData();
-                form.append("image", file);        // <-- key must be "image" for your route
+            // the file goes straight to S3; the API only signs the upload and records the URL
+            async queryFn({ userId, imgType, file }, _api, _extra, baseQuery) {
+                // uploads are keyed by content: a file the server already has is not sent again
+                const digest = await crypto.subtle.digest("SHA-256", await file.arrayBuffer());
+                const sha256 = Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, "0")).join("");
 
-                return {
-                    url: `/users/${userId}/img/${imgType}`,
+                const presign = await baseQuery({
+                    url: `/users/${userId}/img/${imgType}/presign`,
                     method: "POST",
-                    body: form,                      // <-- let the browser set Content-Type
-                    // do NOT set headers: { "Content-Type": "multipart/form-data" }
-                };
+                    body: { contentType: file.type, size: file.size, sha256 },
+                });
+                if (presign.error) return { error: presign.error };
+                const { key, exists, upload } = presign.data as PresignResponse;
+
+                if (!exists && upload) {
+                    const form = new FormData();
+                    Object.entries(upload.fields).forEach(([name, value]) => form.append(name, value));
+                    form.append("file", file);         // <-- must come after the policy fields
+                    const stored = await fetch(upload.url, { method: "POST", body: form });
+                    if (!stored.ok) return { error: { status: stored.status, data: await stored.text() } };
+                }
+
+                const confirm = await baseQuery({
+                    url: `/users/${userId}/img/${imgType}`,
+                    method: "PUT",
+                    body: { key },
+                });
+                if (confirm.error) return { error: confirm.error };
+                return { data: confirm.data as UploadImgResponse };
             },
             invalidatesTags: (_result, _error, { userId }) => [
                 { type: "User", id: userId },      // if you tag users by id
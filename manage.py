@@ -1,12 +1,5 @@
 # manage.py
-from app import create_app, db
-from flask_migrate import Migrate
-
-# create the app instance
-app = create_app()
-
-# initialize Flask-Migrate
-migrate = Migrate(app, db)
+from app import app  # the shared instance; create_app() already sets up Flask-Migrate
 
 if __name__ == "__main__":
     app.run()
@@ -0,0 +1,29 @@
+"""empty message
+
+Revision ID: d13dc860a849
+Revises: a7520b9dc5c4
+Create Date: 2026-10-18 19:42:27.993544
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd13dc860a849'
+down_revision = 'a7520b9dc5c4'
+branch_labels = None
+depends_on = None
+
+
+# Todos are ordered by gap-based keys (app.ordering.SORT_GAP apart); spread
+# the existing 0, 1, 2, ... indexes out so moves have room between them.
+SORT_GAP = 1024
+
+
+def upgrade():
+    op.execute(f"UPDATE todos SET sort_index = sort_index * {SORT_GAP}")
+
+
+def downgrade():
+    op.execute(f"UPDATE todos SET sort_index = sort_index / {SORT_GAP}")
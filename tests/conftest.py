@@ -0,0 +1,24 @@
+import logging
+
+import pytest
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    SQLALCHEMY_ECHO = False
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestConfig)
+    logging.disable(logging.INFO)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+    logging.disable(logging.NOTSET)
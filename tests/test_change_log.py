@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db
+from app.models import Household, HouseholdChange, Todo, TodoList, TodoListMember, User
+
+LAST_EDIT = datetime(2025, 1, 5, 9, 30)
+
+
+@pytest.fixture
+def todo_list(app):
+    user = User(name="sara", email="s@example.com", password="secret")
+    db.session.add(user)
+    db.session.flush()
+    household = Household(name="Home", creator_id=user.id)
+    db.session.add(household)
+    db.session.flush()
+    user.household_id = household.id
+    todo_list = TodoList(title="Chores", household_id=household.id, all_members=False, updated_at=LAST_EDIT)
+    db.session.add(todo_list)
+    db.session.commit()
+    return todo_list
+
+
+def versions(todo_list):
+    db.session.expire_all()
+    return todo_list.version, db.session.get(Household, todo_list.household_id).version
+
+
+def test_todo_changes_leave_list_updated_at_alone(todo_list):
+    list_version, _ = versions(todo_list)
+    db.session.add(Todo(title="Dishes", list_id=todo_list.id))
+    db.session.commit()
+
+    assert versions(todo_list)[0] == list_version + 1
+    assert todo_list.updated_at == LAST_EDIT
+
+
+def test_member_links_move_household_version(todo_list):
+    list_version, household_version = versions(todo_list)
+    user_id = db.session.scalars(db.select(User.id)).one()
+    db.session.add(TodoListMember(todo_list_id=todo_list.id, user_id=user_id))
+    db.session.commit()
+
+    assert versions(todo_list) == (list_version + 1, household_version + 1)
+    logged = db.session.execute(
+        db.select(HouseholdChange.entity, HouseholdChange.entity_id, HouseholdChange.deleted)
+        .where(HouseholdChange.seq == household_version + 1)
+    ).all()
+    assert [tuple(row) for row in logged] == [("todo_lists", todo_list.id, False)]
+    assert todo_list.updated_at == LAST_EDIT
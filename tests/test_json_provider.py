@@ -0,0 +1,23 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+from app.json_provider import OrjsonProvider, orjson
+
+pytestmark = pytest.mark.skipif(orjson is None, reason="orjson not installed")
+
+PAYLOADS = [
+    {"name": "Hélène", "tagline": "café — 日本 \U0001F600", "id": 1},
+    [{"title": "Buy milk ", "due": date(2025, 1, 5)}, {"title": "", "n": None}],
+    {"createdAt": datetime(2025, 1, 5, 9, 30, tzinfo=timezone.utc), "ok": True, "items": []},
+    {"control": "tab\there\nnew\x1f", "quote": 'say "hi" \\ /'},
+]
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+@pytest.mark.parametrize("debug", [False, True])
+def test_response_bytes_match_default_provider(app, payload, debug):
+    app.debug = debug
+    expected = DefaultJSONProvider(app).response(payload).get_data()
+    assert OrjsonProvider(app).response(payload).get_data() == expected
@@ -0,0 +1,36 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from werkzeug.exceptions import BadRequest
+
+from app.models import Event, User
+from app.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor, page_params
+
+
+def test_page_params_default_to_a_bounded_page(app):
+    with app.test_request_context("/api/users/"):
+        assert page_params() == (None, DEFAULT_PAGE_SIZE)
+
+
+def test_cursor_round_trip(app):
+    keys = [Event.start_utc, Event.id]
+    values = [datetime(2025, 1, 5, 9, 30), 7]
+    assert decode_cursor(encode_cursor(values), keys) == values
+
+
+@pytest.mark.parametrize("values, keys", [
+    (["abc"], [User.id]),
+    ([True], [User.id]),
+    ([1.5], [User.id]),
+    ([[1]], [User.id]),
+    ([{"x": 1}], [User.id]),
+    ([7, 1], [Event.start_utc, Event.id]),
+    ([{"d": "2025-01-05"}, 1], [Event.start_utc, Event.id]),
+    ([1], [Event.start_utc, Event.id]),
+])
+def test_forged_cursors_are_rejected(app, values, keys):
+    token = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+    with pytest.raises(BadRequest):
+        decode_cursor(token, keys)
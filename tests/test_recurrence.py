@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app import recurrence
+from app.recurrence import occurrences
+
+
+def _series(rrule, start=datetime(2025, 1, 1, 9, tzinfo=timezone.utc), tzid="Europe/Berlin"):
+    return SimpleNamespace(
+        rrule=rrule, tzid=tzid, exdates=None, start_utc=start, end_utc=start + timedelta(hours=1),
+    )
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    recurrence._expansions.clear()
+    yield
+    recurrence._expansions.clear()
+
+
+@pytest.mark.parametrize("rrule", ["FREQ=DAILY", "FREQ=DAILY;UNTIL=20400101", "FREQ=WEEKLY;BYDAY=MO,TH"])
+def test_window_near_dtstart_after_far_window(rrule):
+    series = _series(rrule)
+    first_week = (_utc(2025, 1, 1), _utc(2025, 1, 8))
+    expected = occurrences(series, *first_week)
+    recurrence._expansions.clear()
+
+    assert occurrences(series, _utc(2030, 6, 1), _utc(2030, 6, 8))
+    assert occurrences(series, *first_week) == expected
+    assert occurrences(series, _utc(2024, 12, 25), _utc(2025, 1, 8)) == expected
+
+
+def test_jumped_expansion_matches_full_expansion(monkeypatch):
+    series = _series("FREQ=MONTHLY", start=_utc(2025, 1, 31, 23, 30))
+    window = (_utc(2060, 1, 1), _utc(2060, 12, 31))
+    jumped = occurrences(series, *window)
+
+    recurrence._expansions.clear()
+    monkeypatch.setattr(recurrence, "EXPANSION_JUMP", timedelta(days=10**6))
+    assert occurrences(series, *window) == jumped